@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, jsonify, render_template, stream_with_context
 from flask_cors import CORS
-import requests
 import json
 import re
 from datetime import datetime
@@ -12,10 +11,18 @@ import tempfile
 
 # Adicionar o diretório pai ao path para importar utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.cache import SimpleCache
+from utils.cache import cache, chave_cache
+from utils.base_ddd import base_ddd
+from utils.registro_bancos import registro_bancos
+from utils.plano_numeracao import plano_numeracao
+from utils.portabilidade import base_portabilidade
+from utils.sessao_abr import sessoes_abr
+from utils.extracao_abr import extrair_operadora
+from utils.banco_dados import (pool_sqlite, gravar_pessoas, criterios_busca, buscar_pessoas,
+                                criar_indice_nomes, buscar_por_nome)
+from utils.circuit_breaker import circuitos
+from utils import transporte
 
-# Inicializar cache
-cache = SimpleCache()
 
 def validar_cep(cep):
     """Valida formato de CEP"""
@@ -29,7 +36,7 @@ def consultar_cep_viacep(cep):
     try:
         cep_limpo = re.sub(r'\D', '', cep)
         url = f"https://viacep.com.br/ws/{cep_limpo}/json/"
-        response = requests.get(url, timeout=10)
+        response = transporte.get(url)
         if response.status_code == 200:
             data = response.json()
             if 'erro' not in data:
@@ -66,7 +73,7 @@ def consultar_cnpj_brasilapi(cnpj):
     try:
         cnpj_limpo = re.sub(r'\D', '', cnpj)
         url = f"https://brasilapi.com.br/api/cnpj/v1/{cnpj_limpo}"
-        response = requests.get(url, timeout=10)
+        response = transporte.get(url)
         if response.status_code == 200:
             return response.json()
     except Exception:
@@ -74,17 +81,38 @@ def consultar_cnpj_brasilapi(cnpj):
     return None
 
 def consultar_ddd_brasilapi(ddd):
-    """Consulta DDD via BrasilAPI"""
+    """Consulta DDD na base local (dados/ddd_brasil.json), com a BrasilAPI como fallback"""
+    ddd_limpo = re.sub(r'\D', '', ddd)
+    info = base_ddd.obter(ddd_limpo)
+    if info:
+        return {"state": info["uf"], "cities": info["cidades"]}
+    
     try:
-        ddd_limpo = re.sub(r'\D', '', ddd)
         url = f"https://brasilapi.com.br/api/ddd/v1/{ddd_limpo}"
-        response = requests.get(url, timeout=10)
+        response = transporte.get(url)
         if response.status_code == 200:
             return response.json()
     except Exception:
         pass
     return None
 
+def consultar_lista_bancos():
+    """Lista de bancos da BrasilAPI, do cache compartilhado quando disponível"""
+    cache_key = chave_cache("bancos", "brasileiros")
+    em_cache = cache.get(cache_key)
+    if em_cache and "erro" not in em_cache:
+        return em_cache["bancos"]
+    
+    try:
+        response = transporte.get("https://brasilapi.com.br/api/banks/v1")
+        if response.status_code == 200:
+            bancos = response.json()
+            cache.set(cache_key, {"bancos": bancos, "total": len(bancos)})
+            return bancos
+    except Exception:
+        pass
+    return None
+
 def consultar_operadora_abr_telecom(telefone_limpo):
     """
     Consulta a operadora atual do telefone usando o serviço da ABR Telecom.
@@ -100,88 +128,39 @@ def consultar_operadora_abr_telecom(telefone_limpo):
         # Validação básica do número
         if not telefone_limpo or len(telefone_limpo) not in [10, 11]:
             return None
-            
-        # URL do serviço de consulta da ABR Telecom
-        base_url = "https://consultanumero.abrtelecom.com.br"
-        consulta_url = f"{base_url}/consultanumero/consulta/consultaSituacaoAtual"
-        
-        # Headers para simular um navegador real
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0'
-        }
-        
-        session = requests.Session()
-        session.headers.update(headers)
-        
-        # Primeira requisição para obter cookies e tokens necessários
-        initial_response = session.get(base_url, timeout=15)
-        if initial_response.status_code != 200:
-            return None
         
-        # Tentar acessar a página de consulta
-        consulta_response = session.get(consulta_url, timeout=15)
-        if consulta_response.status_code != 200:
-            return None
+        # Números portados presentes na base local dispensam a consulta na ABR Telecom
+        portado = base_portabilidade.consultar(telefone_limpo)
+        if portado:
+            return {
+                'operadora': portado['operadora'].upper(),
+                'fonte': 'Base de Portabilidade',
+                'portabilidade': True,
+                'confiabilidade': 'Alta',
+                'data_portabilidade': portado['data_portabilidade'],
+                'referencia_base': portado['referencia'],
+                'timestamp': datetime.now().isoformat()
+            }
             
-        # Preparar dados para consulta
-        form_data = {
-            'codigoAcesso': telefone_limpo,
-            'numeroTelefone': telefone_limpo
-        }
-        
-        # Headers para POST
-        post_headers = headers.copy()
-        post_headers.update({
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'Origin': base_url,
-            'Referer': consulta_url
-        })
-        
-        # Fazer a consulta POST
-        result_response = session.post(consulta_url, data=form_data, headers=post_headers, timeout=15)
-        
-        if result_response.status_code != 200:
+        # Sessão reaproveitada (cookies e tokens em cache): a consulta é um único POST
+        html = sessoes_abr.consultar(telefone_limpo)
+        if not html:
             return None
         
-        # Analisar a resposta
-        response_text = result_response.text.upper()
-        
-        # Mapeamento de operadoras conhecidas
-        operadoras_map = {
-            'VIVO': ['VIVO', 'TELEFONICA'],
-            'CLARO': ['CLARO', 'CLARO S.A.', 'CLARO SA'],
-            'TIM': ['TIM', 'TIM S.A.', 'TIM SA', 'TELECOM ITALIA'],
-            'OI': ['OI', 'OI S.A.', 'OI SA', 'TELEMAR'],
-            'NEXTEL': ['NEXTEL', 'NEXTEL TELECOMUNICACOES'],
-            'ALGAR': ['ALGAR', 'ALGAR TELECOM'],
-            'SERCOMTEL': ['SERCOMTEL'],
-            'UNIFIQUE': ['UNIFIQUE']
-        }
-        
-        # Buscar pela operadora na resposta
-        for operadora_padrao, variantes in operadoras_map.items():
-            for variante in variantes:
-                if variante in response_text:
-                    return {
-                        'operadora': operadora_padrao,
-                        'fonte': 'ABR Telecom (Oficial)',
-                        'portabilidade': True,
-                        'confiabilidade': 'Alta',
-                        'timestamp': datetime.now().isoformat()
-                    }
+        # Analisar a resposta (regex primeiro, parse só das tabelas se preciso)
+        operadora = extrair_operadora(html)
+        if operadora:
+            return {
+                'operadora': operadora.upper(),
+                'fonte': 'ABR Telecom (Oficial)',
+                'portabilidade': True,
+                'confiabilidade': 'Alta',
+                'timestamp': datetime.now().isoformat()
+            }
         
         # Se chegou até aqui, não encontrou operadora conhecida
         # Mas pode ter encontrado alguma informação
-        if any(keyword in response_text for keyword in ['PRESTADORA', 'OPERADORA', 'EMPRESA']):
+        if any(keyword in html.upper() for keyword in ['PRESTADORA', 'OPERADORA', 'EMPRESA']):
             return {
                 'operadora': 'Não identificada',
                 'fonte': 'ABR Telecom (Oficial)',
@@ -193,18 +172,6 @@ def consultar_operadora_abr_telecom(telefone_limpo):
         
         return None
         
-    except requests.exceptions.Timeout:
-        return {
-            'erro': 'Timeout na consulta ABR Telecom',
-            'fonte': 'ABR Telecom (Oficial)',
-            'confiabilidade': 'Erro'
-        }
-    except requests.exceptions.RequestException as e:
-        return {
-            'erro': f'Erro de conexão: {str(e)}',
-            'fonte': 'ABR Telecom (Oficial)',
-            'confiabilidade': 'Erro'
-        }
     except Exception as e:
         return {
             'erro': f'Erro interno: {str(e)}',
@@ -215,7 +182,7 @@ def consultar_operadora_abr_telecom(telefone_limpo):
 def identificar_operadora_por_prefixo(telefone_limpo):
     """
     Identifica a operadora do telefone considerando portabilidade numérica.
-    Primeiro tenta consultar a ABR Telecom, depois usa fallback baseado em prefixos.
+    Primeiro tenta consultar a ABR Telecom, depois usa o plano de numeração local.
     
     Args:
         telefone_limpo (str): Número de telefone apenas com dígitos
@@ -237,82 +204,19 @@ def identificar_operadora_por_prefixo(telefone_limpo):
     if resultado_oficial and not resultado_oficial.get('erro'):
         return resultado_oficial
     
-    # Fallback: Identificação baseada em prefixos (pode não ser precisa devido à portabilidade)
+    # Fallback: operadora de origem pelo plano de numeração (pode não ser precisa devido à portabilidade)
     ddd = telefone_limpo[:2]
-    prefixo = telefone_limpo[2:6] if len(telefone_limpo) == 11 else telefone_limpo[2:5]
-    
-    # Mapeamento atualizado de prefixos por DDD (2024)
-    # ATENÇÃO: Estes dados podem estar desatualizados devido à portabilidade numérica
-    prefixos_operadoras = {
-        # Principais DDDs do Brasil
-        '11': {  # São Paulo
-            'vivo': ['99', '98', '97', '96', '95'],
-            'claro': ['94', '93', '92', '91', '89', '88', '87', '86', '85'],
-            'tim': ['84', '83', '82', '81', '79', '78', '77', '76', '75'],
-            'oi': ['74', '73', '72', '71', '69', '68', '67', '66', '65']
-        },
-        '21': {  # Rio de Janeiro
-            'vivo': ['99', '98', '97', '96', '95'],
-            'claro': ['94', '93', '92', '91', '89', '88', '87', '86', '85'],
-            'tim': ['84', '83', '82', '81', '79', '78', '77', '76', '75'],
-            'oi': ['74', '73', '72', '71', '69', '68', '67', '66', '65']
-        },
-        '61': {  # Brasília
-            'vivo': ['99', '98', '97', '96', '95'],
-            'claro': ['94', '93', '92', '91', '89', '88', '87', '86', '85'],
-            'tim': ['84', '83', '82', '81', '79', '78', '77', '76', '75'],
-            'oi': ['74', '73', '72', '71', '69', '68', '67', '66', '65']
-        },
-        '85': {  # Fortaleza
-            'vivo': ['99', '98', '97', '96', '95'],
-            'claro': ['94', '93', '92', '91', '89', '88', '87', '86', '85'],
-            'tim': ['84', '83', '82', '81', '79', '78', '77', '76', '75'],
-            'oi': ['74', '73', '72', '71', '69', '68', '67', '66', '65']
-        }
-    }
-    
-    # Verifica se temos mapeamento específico para o DDD
-    if ddd in prefixos_operadoras:
-        for operadora, prefixos in prefixos_operadoras[ddd].items():
-            if prefixo[:2] in prefixos:
-                return {
-                    'operadora': operadora.upper(),
-                    'fonte': 'Prefixo (Estimativa)',
-                    'portabilidade': False,
-                    'confiabilidade': 'Baixa',
-                    'observacao': 'Baseado em prefixo original - pode estar incorreto devido à portabilidade',
-                    'ddd': ddd,
-                    'prefixo': prefixo[:2],
-                    'timestamp': datetime.now().isoformat()
-                }
-    
-    # Identificação genérica baseada no primeiro dígito do número (ainda menos confiável)
-    primeiro_digito = telefone_limpo[2] if len(telefone_limpo) >= 3 else ''
-    
-    operadora_estimada = None
-    if primeiro_digito == '9':
-        if prefixo[:2] in ['96', '97', '98', '99']:
-            operadora_estimada = "VIVO"
-        elif prefixo[:2] in ['91', '92', '93', '94']:
-            operadora_estimada = "CLARO"
-        else:
-            operadora_estimada = "VIVO/CLARO"
-    elif primeiro_digito == '8':
-        operadora_estimada = "TIM"
-    elif primeiro_digito == '7':
-        operadora_estimada = "NEXTEL"
-    elif primeiro_digito == '6':
-        operadora_estimada = "OI"
-    
-    if operadora_estimada:
+    faixa = plano_numeracao.classificar(telefone_limpo)
+    if faixa:
         return {
-            'operadora': operadora_estimada,
-            'fonte': 'Dígito (Estimativa)',
+            'operadora': faixa['operadora'].upper(),
+            'fonte': 'Plano de Numeração (Estimativa)',
             'portabilidade': False,
-            'confiabilidade': 'Muito Baixa',
-            'observacao': 'Baseado apenas no primeiro dígito - muito impreciso devido à portabilidade',
+            'confiabilidade': 'Muito Baixa' if faixa['amostra'] else 'Baixa',
+            'observacao': 'Baseado na faixa de numeração original - pode estar incorreto devido à portabilidade',
             'ddd': ddd,
-            'primeiro_digito': primeiro_digito,
+            'prefixo': telefone_limpo[2:5] if len(telefone_limpo) == 11 else telefone_limpo[2:4],
+            'tipo': faixa['tipo'],
             'timestamp': datetime.now().isoformat()
         }
     
@@ -346,6 +250,27 @@ CORS(app, resources={
     }
 })
 
+# Aquecimento do cache: no Vercel não há "subida" do app, então roda em segundo
+# plano a partir da primeira requisição de cada instância
+_aquecimento_iniciado = False
+
+def _iniciar_aquecimento():
+    """Inicia o aquecimento do cache (bancos, municípios e DDDs) em segundo plano"""
+    try:
+        from aquecimento_cache import aquecer_em_segundo_plano
+        aquecer_em_segundo_plano()
+    except Exception as e:
+        print(f"Aviso: Erro ao iniciar o aquecimento do cache: {e}")
+
+@app.before_request
+def aquecer_cache_na_primeira_requisicao():
+    global _aquecimento_iniciado
+    if not _aquecimento_iniciado and not app.testing:
+        _aquecimento_iniciado = True
+        from config import CACHE_AQUECIMENTO_INICIAR
+        if CACHE_AQUECIMENTO_INICIAR:
+            _iniciar_aquecimento()
+
 # Configuração do banco de dados para ambiente serverless
 def get_db_path():
     """Retorna o caminho do banco de dados adequado para o ambiente"""
@@ -357,172 +282,125 @@ def get_db_path():
         return "osint_database.db"
 
 DB_PATH = get_db_path()
+banco = pool_sqlite(DB_PATH)
 
 def init_database():
     """Cria as tabelas necessárias se não existirem"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Tabela principal para dados pessoais
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS pessoas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                cpf TEXT UNIQUE NOT NULL,
-                nome TEXT,
-                rg TEXT,
-                cnh TEXT,
-                email TEXT,
-                telefone TEXT,
-                titulo_eleitor TEXT,
-                pis TEXT,
-                cns TEXT,
-                data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                data_atualizacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Tabela para logs de limpeza de cache
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS cache_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                acao TEXT NOT NULL,
-                items_removidos INTEGER DEFAULT 0,
-                usuario_ip TEXT,
-                user_agent TEXT,
-                data_execucao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                detalhes TEXT
-            )
-        ''')
-        
-        # Índices para otimizar buscas
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cpf ON pessoas(cpf)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_nome ON pessoas(nome)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_rg ON pessoas(rg)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cnh ON pessoas(cnh)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_email ON pessoas(email)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_telefone ON pessoas(telefone)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_titulo_eleitor ON pessoas(titulo_eleitor)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_pis ON pessoas(pis)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cns ON pessoas(cns)')
-        
-        # Índices para tabela de cache logs
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cache_logs_data ON cache_logs(data_execucao)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cache_logs_acao ON cache_logs(acao)')
-        
-        conn.commit()
-        conn.close()
+        with banco.conexao() as conn:
+            _criar_tabelas(conn.cursor())
         return True
     except Exception as e:
         print(f"Erro ao inicializar banco: {e}")
         return False
 
+def _criar_tabelas(cursor):
+    # Tabela principal para dados pessoais
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pessoas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            cpf TEXT UNIQUE NOT NULL,
+            nome TEXT,
+            rg TEXT,
+            cnh TEXT,
+            email TEXT,
+            telefone TEXT,
+            titulo_eleitor TEXT,
+            pis TEXT,
+            cns TEXT,
+            data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            data_atualizacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Tabela para logs de limpeza de cache
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS cache_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            acao TEXT NOT NULL,
+            items_removidos INTEGER DEFAULT 0,
+            usuario_ip TEXT,
+            user_agent TEXT,
+            data_execucao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            detalhes TEXT
+        )
+    ''')
+    
+    # Índices para otimizar buscas
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_cpf ON pessoas(cpf)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_nome ON pessoas(nome)')
+    # Busca por prefixo do nome sem diferenciar maiúsculas quando não há FTS5 (LIKE 'x%' com INDEXED BY)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_nome_nocase ON pessoas(nome COLLATE NOCASE)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_rg ON pessoas(rg)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_cnh ON pessoas(cnh)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_email ON pessoas(email)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_telefone ON pessoas(telefone)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_titulo_eleitor ON pessoas(titulo_eleitor)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_pis ON pessoas(pis)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_cns ON pessoas(cns)')
+    
+    # Busca de nomes por texto (FTS5), mantida pelos triggers
+    criar_indice_nomes(cursor)
+    
+    # Índices para tabela de cache logs
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_cache_logs_data ON cache_logs(data_execucao)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_cache_logs_acao ON cache_logs(acao)')
+
 def buscar_por_cpf(cpf):
     """Busca uma pessoa pelo CPF"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute('''
+        resultado = banco.conexao().execute('''
             SELECT cpf, nome, rg, cnh, email, telefone, titulo_eleitor, pis, cns, 
                    data_criacao, data_atualizacao
             FROM pessoas 
             WHERE cpf = ?
-        ''', (cpf,))
-        
-        resultado = cursor.fetchone()
+        ''', (cpf,)).fetchone()
         
         if resultado:
-            return {
-                "status": "success",
-                "dados": {
-                    "cpf": resultado[0],
-                    "nome": resultado[1],
-                    "rg": resultado[2],
-                    "cnh": resultado[3],
-                    "email": resultado[4],
-                    "telefone": resultado[5],
-                    "titulo_eleitor": resultado[6],
-                    "pis": resultado[7],
-                    "cns": resultado[8],
-                    "data_criacao": resultado[9],
-                    "data_atualizacao": resultado[10]
-                }
-            }
+            return {"status": "success", "dados": resultado}
         else:
             return {"status": "not_found", "message": "CPF não encontrado"}
     
     except Exception as e:
         return {"status": "error", "message": f"Erro na busca: {str(e)}"}
-    finally:
-        conn.close()
 
 def inserir_pessoa(cpf, nome=None, rg=None, cnh=None, email=None, telefone=None, titulo_eleitor=None, pis=None, cns=None):
     """Insere uma nova pessoa no banco de dados"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute('''
-            INSERT INTO pessoas (cpf, nome, rg, cnh, email, telefone, titulo_eleitor, pis, cns)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (cpf, nome, rg, cnh, email, telefone, titulo_eleitor, pis, cns))
-        
-        conn.commit()
+        with banco.conexao() as conn:
+            conn.execute('''
+                INSERT INTO pessoas (cpf, nome, rg, cnh, email, telefone, titulo_eleitor, pis, cns)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (cpf, nome, rg, cnh, email, telefone, titulo_eleitor, pis, cns))
         return {"status": "success", "message": "Pessoa inserida com sucesso"}
     
     except sqlite3.IntegrityError:
         return {"status": "error", "message": "CPF já existe no banco de dados"}
     except Exception as e:
         return {"status": "error", "message": f"Erro ao inserir pessoa: {str(e)}"}
-    finally:
-        conn.close()
 
 def registrar_limpeza_cache(items_removidos=0, usuario_ip=None, user_agent=None, detalhes=None):
     """Registra uma limpeza de cache no banco de dados"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute('''
-            INSERT INTO cache_logs (acao, items_removidos, usuario_ip, user_agent, detalhes)
-            VALUES (?, ?, ?, ?, ?)
-        ''', ('limpeza_cache', items_removidos, usuario_ip, user_agent, detalhes))
-        
-        conn.commit()
+        with banco.conexao() as conn:
+            conn.execute('''
+                INSERT INTO cache_logs (acao, items_removidos, usuario_ip, user_agent, detalhes)
+                VALUES (?, ?, ?, ?, ?)
+            ''', ('limpeza_cache', items_removidos, usuario_ip, user_agent, detalhes))
         return {"status": "success", "message": "Log de limpeza registrado com sucesso"}
     
     except Exception as e:
         return {"status": "error", "message": f"Erro ao registrar log: {str(e)}"}
-    finally:
-        conn.close()
 
 def obter_historico_cache(limite=50):
     """Obtém o histórico de limpezas de cache"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute('''
+        historico = banco.conexao().execute('''
             SELECT id, acao, items_removidos, usuario_ip, user_agent, data_execucao, detalhes
             FROM cache_logs 
             ORDER BY data_execucao DESC 
             LIMIT ?
-        ''', (limite,))
-        
-        resultados = cursor.fetchall()
-        
-        historico = []
-        for resultado in resultados:
-            historico.append({
-                "id": resultado[0],
-                "acao": resultado[1],
-                "items_removidos": resultado[2],
-                "usuario_ip": resultado[3],
-                "user_agent": resultado[4],
-                "data_execucao": resultado[5],
-                "detalhes": resultado[6]
-            })
+        ''', (limite,)).fetchall()
         
         return {
             "status": "success",
@@ -532,62 +410,24 @@ def obter_historico_cache(limite=50):
     
     except Exception as e:
         return {"status": "error", "message": f"Erro ao obter histórico: {str(e)}"}
-    finally:
-        conn.close()
 
-def buscar_cruzada(**kwargs):
-    """Busca cruzada por múltiplos campos"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
+def buscar_cruzada(limite=None, cursor=None, **kwargs):
+    """Busca cruzada por múltiplos campos, paginada por cursor (nome busca por prefixo)"""
     try:
-        # Construir query dinamicamente
-        condicoes = []
-        valores = []
-        
-        for campo, valor in kwargs.items():
-            if valor and valor.strip():
-                condicoes.append(f"{campo} = ?")
-                valores.append(valor.strip())
-        
-        if not condicoes:
+        # Somente colunas conhecidas entram na consulta
+        criterios = criterios_busca(kwargs)
+        if not criterios:
             return {"status": "error", "message": "Nenhum campo de busca fornecido"}
         
-        query = f'''
-            SELECT cpf, nome, rg, cnh, email, telefone, titulo_eleitor, pis, cns, 
-                   data_criacao, data_atualizacao
-            FROM pessoas 
-            WHERE {' OR '.join(condicoes)}
-        '''
-        
-        cursor.execute(query, valores)
-        resultados = cursor.fetchall()
-        
-        if resultados:
-            dados = []
-            for resultado in resultados:
-                dados.append({
-                    "cpf": resultado[0],
-                    "nome": resultado[1],
-                    "rg": resultado[2],
-                    "cnh": resultado[3],
-                    "email": resultado[4],
-                    "telefone": resultado[5],
-                    "titulo_eleitor": resultado[6],
-                    "pis": resultado[7],
-                    "cns": resultado[8],
-                    "data_criacao": resultado[9],
-                    "data_atualizacao": resultado[10]
-                })
-            
-            return {"status": "success", "dados": dados}
+        pagina = buscar_pessoas(banco, criterios, limite, cursor)
+        
+        if pagina["dados"]:
+            return {"status": "success", **pagina}
         else:
             return {"status": "not_found", "message": "Nenhum resultado encontrado"}
     
     except Exception as e:
         return {"status": "error", "message": f"Erro na busca: {str(e)}"}
-    finally:
-        conn.close()
 
 # Inicializar o banco de dados
 init_database()
@@ -614,7 +454,9 @@ def api_info():
             "/api/consultar/cnpj",
             "/api/cnpj/<cnpj>",
             "/api/inserir/pessoa",
+            "/api/inserir/pessoas",
             "/api/buscar/cruzada",
+            "/api/buscar/nome",
             "/api/status"
         ],
         "observacoes": {
@@ -928,6 +770,67 @@ def api_inserir_pessoa():
             "timestamp": datetime.now().isoformat()
         }), 500
 
+def _registros_ndjson(linhas):
+    """Decodifica um registro por linha; linhas inválidas viram None (reportadas como erro)"""
+    for linha in linhas:
+        linha = linha.strip()
+        if not linha:
+            continue
+        try:
+            yield json.loads(linha)
+        except ValueError:
+            yield None
+
+@app.route('/api/inserir/pessoas', methods=['POST'])
+def api_inserir_pessoas():
+    """
+    Gravação de pessoas em lote com resposta em streaming (NDJSON)
+    
+    Corpo: um JSON por linha (application/x-ndjson) ou uma lista JSON.
+    Parâmetros: modo=upsert (padrão) ou inserir, lote=<registros por transação>.
+    Resposta: uma linha por registro (indice, cpf, status) e uma linha final com os totais.
+    """
+    modo = request.args.get('modo', 'upsert')
+    if modo not in ('upsert', 'inserir'):
+        return jsonify({
+            "status": "error",
+            "erro": "Modo inválido (use upsert ou inserir)",
+            "timestamp": datetime.now().isoformat()
+        }), 400
+    tamanho_lote = request.args.get('lote', type=int)
+    
+    if request.mimetype == 'application/json':
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            return jsonify({
+                "status": "error",
+                "erro": "Envie uma lista JSON ou um registro por linha (NDJSON)",
+                "timestamp": datetime.now().isoformat()
+            }), 400
+        registros = data
+    else:
+        registros = _registros_ndjson(linha.decode('utf-8', errors='replace') for linha in request.stream)
+    
+    def gerar():
+        totais = {"inserido": 0, "atualizado": 0, "existente": 0, "erro": 0}
+        for resultado in gravar_pessoas(banco, registros, atualizar=(modo == 'upsert'), tamanho_lote=tamanho_lote):
+            totais[resultado["status"]] += 1
+            yield json.dumps(resultado, ensure_ascii=False) + "\n"
+        
+        yield json.dumps({
+            "status": "success",
+            "resumo": {
+                "total": sum(totais.values()),
+                "inseridos": totais["inserido"],
+                "atualizados": totais["atualizado"],
+                "existentes": totais["existente"],
+                "erros": totais["erro"]
+            },
+            "timestamp": datetime.now().isoformat()
+        }, ensure_ascii=False) + "\n"
+    
+    return Response(stream_with_context(gerar()), content_type='application/x-ndjson; charset=utf-8')
+
 @app.route('/api/buscar/cruzada', methods=['POST'])
 def api_buscar_cruzada():
     """Endpoint para busca cruzada por múltiplos campos"""
@@ -939,15 +842,28 @@ def api_buscar_cruzada():
         # Forçar decodificação JSON
         data = request.get_json(force=True)
         
-        if not data:
+        if not data or not isinstance(data, dict):
             return jsonify({
                 "status": "error",
                 "erro": "Dados JSON não fornecidos",
                 "timestamp": datetime.now().isoformat()
             }), 400
         
+        # Paginação: limit/cursor no corpo ou na query string
+        try:
+            limite = data.pop('limit', None) or request.args.get('limit')
+            cursor = data.pop('cursor', None) or request.args.get('cursor')
+            limite = int(limite) if limite is not None else None
+            cursor = int(cursor) if cursor is not None else None
+        except (TypeError, ValueError):
+            return jsonify({
+                "status": "error",
+                "erro": "limit e cursor devem ser números inteiros",
+                "timestamp": datetime.now().isoformat()
+            }), 400
+        
         # Buscar no banco de dados
-        resultado = buscar_cruzada(**data)
+        resultado = buscar_cruzada(limite=limite, cursor=cursor, **data)
         
         if resultado["status"] == "success":
             total_encontrados = len(resultado["dados"])
@@ -956,6 +872,8 @@ def api_buscar_cruzada():
                 "message": f"Encontrados {total_encontrados} registros",
                 "total_encontrados": total_encontrados,
                 "dados": resultado["dados"],
+                "limit": resultado["limite"],
+                "proximo_cursor": resultado["proximo_cursor"],
                 "timestamp": datetime.now().isoformat()
             })
             response.headers['Content-Type'] = 'application/json; charset=utf-8'
@@ -966,6 +884,7 @@ def api_buscar_cruzada():
                 "message": "Nenhum resultado encontrado",
                 "total_encontrados": 0,
                 "dados": [],
+                "proximo_cursor": None,
                 "timestamp": datetime.now().isoformat()
             })
         else:
@@ -988,6 +907,35 @@ def api_buscar_cruzada():
             "timestamp": datetime.now().isoformat()
         }), 500
 
+@app.route('/api/buscar/nome', methods=['GET'])
+def api_buscar_nome():
+    """Busca por nome (FTS5): palavras em qualquer ordem, como prefixo, sem diferenciar acentos"""
+    nome = request.args.get('q', '').strip()
+    if not nome:
+        return jsonify({
+            "status": "error",
+            "erro": "Parâmetro q é obrigatório",
+            "timestamp": datetime.now().isoformat()
+        }), 400
+    
+    limite = request.args.get('limit', type=int)
+    try:
+        resultado = buscar_por_nome(banco, nome, limite)
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "erro": f"Erro na busca: {str(e)}",
+            "timestamp": datetime.now().isoformat()
+        }), 500
+    
+    return jsonify({
+        "status": "success",
+        "total_encontrados": len(resultado["dados"]),
+        "dados": resultado["dados"],
+        "limit": resultado["limite"],
+        "timestamp": datetime.now().isoformat()
+    })
+
 @app.route('/api/consultar/cep', methods=['POST'])
 def api_consultar_cep():
     """Consulta informações de CEP"""
@@ -1162,6 +1110,19 @@ def api_consultar_ddd_get(ddd):
                 "error": "DDD inválido. Use apenas 2 dígitos (ex: 11, 21, 85)"
             }), 400
         
+        # Dados já carregados pelo investigador (ou pelo aquecimento do cache)
+        em_cache = cache.get(chave_cache("ddd", ddd))
+        if em_cache and "erro" not in em_cache:
+            return jsonify({
+                "success": True,
+                "data": {
+                    "ddd": ddd,
+                    "estado": em_cache.get('estado', 'N/A'),
+                    "cidades": em_cache.get('cidades', [])
+                },
+                "timestamp": datetime.now().isoformat()
+            })
+        
         resultado = consultar_ddd_brasilapi(ddd)
         
         if resultado:
@@ -1191,12 +1152,10 @@ def api_consultar_ddd_get(ddd):
 def api_consultar_bancos_get():
     """Lista todos os bancos brasileiros"""
     try:
-        # Consulta a API do Brasil API para listar bancos
-        url = "https://brasilapi.com.br/api/banks/v1"
-        response = requests.get(url, timeout=10)
+        # Cache compartilhado (investigador e aquecimento) ou BrasilAPI
+        bancos = consultar_lista_bancos()
         
-        if response.status_code == 200:
-            bancos = response.json()
+        if bancos is not None:
             return jsonify({
                 "bancos": bancos,
                 "total": len(bancos),
@@ -1234,6 +1193,9 @@ def api_limpar_cache():
             detalhes=detalhes
         )
         
+        # Recarrega os dados de referência para os próximos usuários
+        _iniciar_aquecimento()
+        
         return jsonify({
             "status": "success",
             "message": "Cache limpo com sucesso",
@@ -1268,6 +1230,16 @@ def api_stats_cache():
             "erro": f"Erro ao obter estatísticas: {str(e)}"
         }), 500
 
+@app.route('/api/circuitos', methods=['GET'])
+def api_circuitos():
+    """Retorna o estado dos circuit breakers por host externo"""
+    return jsonify({
+        "status": "success",
+        "circuitos": circuitos.resumo(),
+        "sessoes_abr": sessoes_abr.resumo(),
+        "timestamp": datetime.now().isoformat()
+    })
+
 # Endpoint para histórico de limpezas de cache
 @app.route('/api/cache/history', methods=['GET'])
 def api_historico_cache():
@@ -1294,22 +1266,23 @@ def api_consultar_banco_get(codigo):
                 "erro": "Código do banco deve conter 3 dígitos"
             }), 400
         
-        # Consulta a API do Brasil API para banco específico
-        url = f"https://brasilapi.com.br/api/banks/v1/{codigo}"
-        response = requests.get(url, timeout=10)
+        # Registro indexado (lista da BrasilAPI em cache + base local)
+        bancos = consultar_lista_bancos()
+        if bancos is not None:
+            registro_bancos.atualizar(bancos)
         
-        if response.status_code == 200:
-            banco = response.json()
+        banco = registro_bancos.por_codigo(codigo)
+        if banco:
             return jsonify({
                 "banco": {
-                    "codigo": banco.get('code'),
-                    "nome": banco.get('name'),
-                    "nome_completo": banco.get('fullName'),
-                    "ispb": banco.get('ispb')
+                    "codigo": banco['codigo'],
+                    "nome": banco['nome'],
+                    "nome_completo": banco['nome_completo'],
+                    "ispb": banco['ispb']
                 },
                 "timestamp": datetime.now().isoformat()
             })
-        elif response.status_code == 404:
+        elif bancos is not None:
             return jsonify({
                 "erro": "Banco não encontrado"
             }), 404
@@ -1397,12 +1370,15 @@ def api_catch_all(path):
             "/api/consultar/cnpj",
             "/api/cnpj/<cnpj>",
             "/api/inserir/pessoa",
+            "/api/inserir/pessoas",
             "/api/buscar/cruzada",
+            "/api/buscar/nome",
             "/api/ddd/<ddd>",
             "/api/consultar/bancos",
             "/api/consultar/banco/<codigo>",
             "/api/cache/clear",
             "/api/cache/stats",
+            "/api/circuitos",
             "/api/status"
         ],
         "observacoes": {
@@ -5,6 +5,7 @@ Documentação: https://apibrasil.com.br/docs
 """
 
 import requests
+from utils import transporte
 import json
 import os
 from typing import Dict, Any, Optional
@@ -51,7 +52,7 @@ class APIBrasilClient:
             # Endpoint para consulta de CPF
             url = f"{self.base_url}/cpf/{cpf_limpo}"
             
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = transporte.get(url, headers=self.headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -111,7 +112,7 @@ class APIBrasilClient:
             # Endpoint para consulta de CNPJ
             url = f"{self.base_url}/cnpj/{cnpj_limpo}"
             
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = transporte.get(url, headers=self.headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -164,7 +165,7 @@ class APIBrasilClient:
             # Endpoint para consulta de telefone
             url = f"{self.base_url}/telefone/{telefone_limpo}"
             
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = transporte.get(url, headers=self.headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -217,7 +218,7 @@ class APIBrasilClient:
             # Endpoint para consulta de veículo
             url = f"{self.base_url}/veiculo/{placa_limpa}"
             
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = transporte.get(url, headers=self.headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -271,7 +272,7 @@ class APIBrasilClient:
             # Testa com um CPF de exemplo (formato válido mas fictício)
             url = f"{self.base_url}/status"
             
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = transporte.get(url, headers=self.headers)
             
             if response.status_code == 200:
                 return {
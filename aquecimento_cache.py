@@ -0,0 +1,150 @@
+"""
+Aquecimento do cache com os dados de referência estáticos
+Carrega bancos, municípios das 27 UFs e os DDDs mais consultados antes dos
+primeiros usuários (após um deploy ou uma limpeza do cache). Os DDDs só passam
+pelo cache com DDD_ATUALIZACAO_ONLINE ligado; sem ela são respondidos pela base
+local e ficam de fora do aquecimento.
+
+Uso:
+    python aquecimento_cache.py [--prazo SEGUNDOS] [--sem-ddd]
+"""
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Optional
+
+from utils.cache import cache
+from utils.logger import logger
+from config import CACHE_AQUECIMENTO_PRAZO, CACHE_AQUECIMENTO_DDDS, CACHE_AQUECIMENTO_CONCORRENCIA
+
+UFS = [
+    'AC', 'AL', 'AP', 'AM', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA', 'MT', 'MS', 'MG', 'PA',
+    'PB', 'PR', 'PE', 'PI', 'RJ', 'RN', 'RS', 'RO', 'RR', 'SC', 'SP', 'SE', 'TO'
+]
+
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+ultimo_relatorio: Optional[Dict[str, Any]] = None
+
+
+def aquecer_cache(investigador=None, prazo: float = CACHE_AQUECIMENTO_PRAZO,
+                  ddds: Optional[List[str]] = None,
+                  concorrencia: int = CACHE_AQUECIMENTO_CONCORRENCIA) -> Dict[str, Any]:
+    """
+    Consulta os dados de referência em paralelo e deixa o resultado no cache
+    
+    As consultas passam pelo OSINTInvestigador, que grava no cache em memória e,
+    se habilitado, no cache persistente (L2). Rodam em um pool próprio com poucas
+    threads, para não ocupar o executor compartilhado com as consultas dos usuários.
+    Consultas que não terminam dentro do prazo são canceladas (ou seguem em
+    segundo plano, se já começaram).
+    
+    Args:
+        investigador: Instância de OSINTInvestigador (padrão: a global)
+        prazo (float): Tempo máximo em segundos para todo o aquecimento
+        ddds (List[str]): DDDs a carregar (padrão: CACHE_AQUECIMENTO_DDDS); ignorados
+            sem a atualização online de DDD, pois a base local não usa o cache
+        concorrencia (int): Consultas simultâneas (padrão: CACHE_AQUECIMENTO_CONCORRENCIA)
+        
+    Returns:
+        Dict[str, Any]: Relatório com o que foi carregado, falhas e pendências
+    """
+    global ultimo_relatorio
+    
+    if investigador is None:
+        from osint_investigador import investigador
+    ddd_local = not getattr(investigador, "ddd_online", False)
+    if ddd_local:
+        ddds = []
+    elif ddds is None:
+        ddds = CACHE_AQUECIMENTO_DDDS
+    
+    tarefas = [("bancos", "todos", investigador.consultar_bancos, ())]
+    tarefas += [("municipios", uf, investigador.consultar_municipios_uf, (uf,)) for uf in UFS]
+    tarefas += [("ddd", ddd, investigador.consultar_ddd, (ddd,)) for ddd in ddds]
+    
+    inicio = time.time()
+    pool = ThreadPoolExecutor(max_workers=max(1, concorrencia), thread_name_prefix="aquecimento-cache")
+    futuros = {pool.submit(funcao, *args): (tipo, valor) for tipo, valor, funcao, args in tarefas}
+    wait(futuros, timeout=prazo)
+    # Não espera as consultas já iniciadas; as que não começaram são canceladas abaixo
+    pool.shutdown(wait=False, cancel_futures=True)
+    
+    relatorio = {
+        "carregados": {"bancos": 0, "municipios": 0, "ddd": 0},
+        "falhas": [],
+        "pendentes": [],
+        "l2": cache.l2 is not None,
+        # DDDs respondidos pela base local, sem nada a aquecer
+        "ddd_base_local": ddd_local,
+    }
+    for futuro, (tipo, valor) in futuros.items():
+        if not futuro.done():
+            futuro.cancel()
+            relatorio["pendentes"].append(f"{tipo}:{valor}")
+            continue
+        
+        try:
+            resultado = futuro.result()
+        except Exception as e:
+            resultado = {"erro": str(e)}
+        
+        if isinstance(resultado, dict) and "erro" not in resultado:
+            relatorio["carregados"][tipo] += 1
+        else:
+            relatorio["falhas"].append(f"{tipo}:{valor}")
+    
+    relatorio["tempo_s"] = round(time.time() - inicio, 2)
+    relatorio["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    ultimo_relatorio = relatorio
+    
+    logger.info(
+        f"Aquecimento do cache: {relatorio['carregados']} em {relatorio['tempo_s']}s, "
+        f"{len(relatorio['falhas'])} falhas, {len(relatorio['pendentes'])} pendentes"
+    )
+    return relatorio
+
+
+def aquecer_em_segundo_plano(investigador=None) -> bool:
+    """
+    Inicia o aquecimento em uma thread daemon, se nenhum estiver em andamento
+    
+    Returns:
+        bool: True se um novo aquecimento foi iniciado
+    """
+    global _thread
+    
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return False
+        
+        def executar():
+            try:
+                aquecer_cache(investigador)
+            except Exception as e:
+                logger.warning(f"Erro no aquecimento do cache: {e}")
+        
+        _thread = threading.Thread(target=executar, name="aquecimento-cache", daemon=True)
+        _thread.start()
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aquece o cache com bancos, municípios e DDDs")
+    parser.add_argument("--prazo", type=float, default=CACHE_AQUECIMENTO_PRAZO,
+                        help="tempo máximo em segundos (padrão: %(default)s)")
+    parser.add_argument("--sem-ddd", action="store_true", help="não carrega os DDDs (só carregados com DDD_ATUALIZACAO_ONLINE ligado)")
+    args = parser.parse_args()
+    
+    relatorio = aquecer_cache(prazo=args.prazo, ddds=[] if args.sem_ddd else None)
+    print(json.dumps(relatorio, ensure_ascii=False, indent=2))
+    
+    # Sem o cache persistente o aquecimento só vale para este processo
+    if not relatorio["l2"]:
+        print("Aviso: CACHE_L2_ENABLED desligado; o cache aquecido não é compartilhado com o app")
+
+
+if __name__ == "__main__":
+    main()
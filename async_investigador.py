@@ -0,0 +1,474 @@
+"""
+OSINT Investigador BR - Motor Assíncrono
+Equivalentes awaitable das consultas do OSINTInvestigador para uso em event loop
+
+A normalização, a validação e o cache (utils.cache) são os mesmos da classe
+síncrona. As chamadas HTTP usam aiohttp quando disponível; sem aiohttp, cada
+requisição roda em uma thread via asyncio.to_thread.
+"""
+import asyncio
+import re
+import time
+import weakref
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    import aiohttp
+    AIOHTTP_DISPONIVEL = True
+except ImportError:
+    AIOHTTP_DISPONIVEL = False
+
+from osint_investigador import OSINTInvestigador, FONTES_CNPJ, RESPOSTA_404, cep_nao_encontrado, investigador
+from utils.validators import (
+    validar_cep, validar_ddd, validar_cnpj,
+    limpar_cep, limpar_ddd, limpar_cnpj
+)
+from utils.cache import cache, chave_cache
+from utils.provedores import placar
+from utils.circuit_breaker import circuitos
+from utils.logger import log_consulta, log_api_call, log_error, logger
+from config import (
+    BRASILAPI_DDD_URL, BRASILAPI_IBGE_URL, REQUEST_TIMEOUT,
+    CEP_MODO_CONSULTA, CEP_HEDGE_DELAY, ASYNC_LIMITE_CONEXOES
+)
+
+
+class AsyncOSINTInvestigador:
+    """Versão assíncrona das consultas OSINT brasileiras"""
+
+    def __init__(self, investigador: OSINTInvestigador = None):
+        # Instância síncrona usada para normalização e para as consultas sem versão nativa
+        self._sync = investigador or OSINTInvestigador()
+        # Uma sessão aiohttp por event loop; cada uma é fechada junto com o seu loop
+        self._sessoes: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+        # Consultas em andamento por chave de cache (agrupamento de chamadas idênticas)
+        self._em_andamento: Dict[str, asyncio.Future] = {}
+        # Atualizações em segundo plano de entradas vencidas (referência até terminarem)
+        self._revalidacoes = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.fechar()
+
+    async def fechar(self) -> None:
+        """Fecha a sessão aiohttp do event loop atual, se houver"""
+        sessao = self._sessoes.pop(asyncio.get_running_loop(), None)
+        if sessao is not None and not sessao.closed:
+            await sessao.close()
+
+    def _obter_sessao(self) -> "aiohttp.ClientSession":
+        """Sessão aiohttp do event loop atual (criada na primeira utilização)"""
+        loop = asyncio.get_running_loop()
+        sessao = self._sessoes.get(loop)
+        if sessao is None or sessao.closed:
+            sessao = self._sessoes[loop] = aiohttp.ClientSession(
+                headers=dict(self._sync.session.headers),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+                connector=aiohttp.TCPConnector(limit=ASYNC_LIMITE_CONEXOES)
+            )
+            # Sem fechar() explícito (ex.: um asyncio.run por consulta), a sessão é
+            # fechada quando o loop finaliza os geradores assíncronos, antes de encerrar
+            asyncio.ensure_future(self._fechar_com_o_loop(sessao).__anext__())
+        return sessao
+
+    @staticmethod
+    async def _fechar_com_o_loop(sessao: "aiohttp.ClientSession"):
+        """Gerador suspenso até o fim do loop; asyncio.run o finaliza com shutdown_asyncgens"""
+        try:
+            yield
+        finally:
+            if not sessao.closed:
+                await sessao.close()
+
+    async def _agrupar(self, chave: str, fabrica) -> Any:
+        """
+        Equivalente assíncrono do utils.concorrencia.single_flight: para cada chave,
+        apenas a primeira corrotina consulta a origem e as demais aguardam o resultado
+
+        Args:
+            chave (str): Chave da operação (a mesma usada no cache)
+            fabrica (callable): Cria a corrotina que busca o valor na origem
+        """
+        tarefa = self._em_andamento.get(chave)
+        if tarefa is None:
+            tarefa = self._em_andamento[chave] = asyncio.ensure_future(fabrica())
+            tarefa.add_done_callback(lambda _: self._em_andamento.pop(chave, None))
+
+        # shield: o cancelamento de um chamador não cancela a consulta dos demais
+        return await asyncio.shield(tarefa)
+
+    async def _consultar_com_cache(self, tipo: str, valor: str, cache_key: str, fabrica) -> Dict[str, Any]:
+        """
+        Stale-while-revalidate: responde do cache, mesmo vencido, e atualiza em segundo plano
+
+        Args:
+            tipo (str): Tipo da consulta para o log (CEP, DDD, CNPJ)
+            valor (str): Valor informado pelo usuário
+            cache_key (str): Chave do cache
+            fabrica (callable): Cria a corrotina que busca na origem e grava no cache
+        """
+        cached_result, atualizar = cache.get_stale(cache_key)
+        if cached_result is None:
+            return await self._agrupar(cache_key, fabrica)
+
+        if atualizar:
+            tarefa = asyncio.ensure_future(self._revalidar(cache_key, fabrica))
+            self._revalidacoes.add(tarefa)
+            tarefa.add_done_callback(self._revalidacoes.discard)
+            log_consulta(tipo, valor, "erro" not in cached_result, "Cache hit (vencido, atualizando)")
+        else:
+            log_consulta(tipo, valor, "erro" not in cached_result, "Cache hit")
+        return cached_result
+
+    async def _revalidar(self, cache_key: str, fabrica) -> None:
+        """Atualiza uma entrada vencida do cache em segundo plano"""
+        try:
+            await self._agrupar(cache_key, fabrica)
+        except Exception as e:
+            log_error(e, f"Erro ao atualizar {cache_key} em segundo plano")
+
+    async def _fazer_requisicao(self, url: str, api_name: str, aceitar_404: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Faz requisição HTTP assíncrona com tratamento de erros e logging
+
+        Args:
+            url (str): URL da requisição
+            api_name (str): Nome da API para logging
+            aceitar_404 (bool): Se True, HTTP 404 retorna RESPOSTA_404 em vez de None
+
+        Returns:
+            Optional[Dict[str, Any]]: Dados da resposta ou None em caso de erro
+        """
+        if not AIOHTTP_DISPONIVEL:
+            return await asyncio.to_thread(self._sync._fazer_requisicao, url, api_name, aceitar_404)
+
+        circuito = circuitos.obter(url)
+        if not circuito.permitir_requisicao():
+            logger.warning(f"Circuito aberto para {circuito.nome}, ignorando {api_name}")
+            return None
+
+        inicio = time.time()
+        try:
+            async with self._obter_sessao().get(url) as response:
+                tempo_resposta = time.time() - inicio
+                log_api_call(api_name, url, response.status, tempo_resposta)
+
+                # Respostas 4xx indicam que o host está no ar (ex.: CEP inexistente)
+                if response.status >= 500:
+                    circuito.registrar_falha()
+                else:
+                    circuito.registrar_sucesso()
+
+                if aceitar_404 and response.status == 404:
+                    placar.registrar(api_name, True, tempo_resposta)
+                    return dict(RESPOSTA_404)
+
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+
+            placar.registrar(api_name, True, tempo_resposta)
+            return data
+
+        except asyncio.TimeoutError:
+            circuito.registrar_falha()
+            placar.registrar(api_name, False, time.time() - inicio)
+            log_error(Exception(f"Timeout na requisição para {api_name}"), f"URL: {url}")
+            return None
+        except aiohttp.ClientConnectionError as e:
+            circuito.registrar_falha()
+            placar.registrar(api_name, False, time.time() - inicio)
+            log_error(e, f"Erro de conexão com {api_name}")
+            return None
+        except aiohttp.ClientError as e:
+            placar.registrar(api_name, False, time.time() - inicio)
+            log_error(e, f"Erro na requisição para {api_name}")
+            return None
+        except ValueError as e:
+            placar.registrar(api_name, False, time.time() - inicio)
+            log_error(e, f"Erro ao decodificar JSON de {api_name}")
+            return None
+
+    async def consultar_cep(self, cep: str) -> Dict[str, Any]:
+        """
+        Consulta informações de CEP com sistema de fallback
+
+        Args:
+            cep (str): CEP a ser consultado
+
+        Returns:
+            Dict[str, Any]: Dados do CEP ou erro
+        """
+        if not validar_cep(cep):
+            log_consulta("CEP", cep, False, "CEP inválido")
+            return {"erro": "CEP inválido", "cep": cep}
+
+        cep_limpo = limpar_cep(cep)
+        cache_key = chave_cache("cep", cep_limpo)
+
+        return await self._consultar_com_cache(
+            "CEP", cep, cache_key, lambda: self._buscar_cep(cep, cep_limpo, cache_key)
+        )
+
+    async def _buscar_cep(self, cep: str, cep_limpo: str, cache_key: str) -> Dict[str, Any]:
+        """Busca o CEP nos provedores externos e salva no cache"""
+        resultado, api_name = await self._consultar_provedores_cep(self._sync._apis_cep(cep_limpo), cep_limpo)
+
+        if resultado:
+            cache.set(cache_key, resultado)
+            log_consulta("CEP", cep, True, f"Consulta realizada com sucesso via {api_name}")
+            return resultado
+
+        # Cache negativo só quando todos os provedores disseram que o CEP não existe
+        if resultado is False:
+            resultado = {"erro": "CEP não encontrado em nenhuma fonte", "cep": cep}
+            self._sync._gravar_negativo(cache_key, resultado)
+            log_consulta("CEP", cep, False, "CEP não encontrado em todas as APIs")
+            return resultado
+
+        log_consulta("CEP", cep, False, "Provedores de CEP indisponíveis")
+        return {"erro": "Não foi possível consultar o CEP", "cep": cep}
+
+    async def _consultar_api_cep(self, api: Dict[str, str], cep_limpo: str) -> Optional[Dict[str, Any]]:
+        """Consulta um único provedor de CEP; False se o provedor informou que o CEP não existe"""
+        try:
+            data = await self._fazer_requisicao(api["url"], api["name"], aceitar_404=True)
+
+            if data and cep_nao_encontrado(data):
+                return False
+
+            if data and not data.get('erro') and not data.get('error'):
+                resultado = self._sync._normalizar_resultado_cep(data, api["format"], cep_limpo)
+                if resultado and resultado.get('sucesso'):
+                    return resultado
+
+        except Exception as e:
+            log_error(f"Erro na API {api['name']}: {e}")
+
+        return None
+
+    async def _consultar_provedores_cep(self, apis: List[Dict[str, str]], cep_limpo: str,
+                                        modo: str = None, hedge_delay: float = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Consulta a lista de provedores de CEP conforme a estratégia escolhida
+        ('sequencial', 'hedge' ou 'race', como em OSINTInvestigador._consultar_provedores_cep).
+        Ao contrário da versão com threads, as consultas que perderem a disputa são canceladas.
+
+        Returns:
+            Tuple: (resultado normalizado, nome do provedor); (False, None) se todos os
+            provedores informaram que o CEP não existe, senão (None, None)
+        """
+        modo = (modo or CEP_MODO_CONSULTA).lower()
+        hedge_delay = CEP_HEDGE_DELAY if hedge_delay is None else hedge_delay
+        nao_encontrado = 0
+
+        if modo == "sequencial":
+            for api in apis:
+                resultado = await self._consultar_api_cep(api, cep_limpo)
+                if resultado:
+                    return resultado, api["name"]
+                nao_encontrado += resultado is False
+            return (False if apis and nao_encontrado == len(apis) else None), None
+
+        tarefas = {}
+        proxima = 0
+
+        def disparar_proxima():
+            nonlocal proxima
+            api = apis[proxima]
+            tarefa = asyncio.ensure_future(self._consultar_api_cep(api, cep_limpo))
+            tarefas[tarefa] = api
+            proxima += 1
+            return tarefa
+
+        disparar_proxima()
+        if modo == "race":
+            while proxima < len(apis):
+                disparar_proxima()
+
+        pendentes = set(tarefas)
+        try:
+            while pendentes:
+                timeout = hedge_delay if proxima < len(apis) else None
+                concluidas, pendentes = await asyncio.wait(pendentes, timeout=timeout,
+                                                           return_when=asyncio.FIRST_COMPLETED)
+
+                for tarefa in concluidas:
+                    resultado = tarefa.result()
+                    if resultado:
+                        return resultado, tarefas[tarefa]["name"]
+                    nao_encontrado += resultado is False
+
+                # Sem resposta válida dentro do atraso (ou provedor falhou): aciona o próximo
+                if proxima < len(apis):
+                    pendentes.add(disparar_proxima())
+        finally:
+            for tarefa in pendentes:
+                tarefa.cancel()
+
+        return (False if nao_encontrado == len(apis) else None), None
+
+    async def consultar_ddd(self, ddd: str) -> Dict[str, Any]:
+        """
+        Consulta informações de DDD
+
+        Args:
+            ddd (str): DDD a ser consultado
+
+        Returns:
+            Dict[str, Any]: Dados do DDD ou erro
+        """
+        if not validar_ddd(ddd):
+            log_consulta("DDD", ddd, False, "DDD inválido")
+            return {"erro": "DDD inválido", "ddd": ddd}
+
+        ddd_limpo = limpar_ddd(ddd)
+
+        # Base local, sem rede; a BrasilAPI só com a atualização online ligada
+        resultado = self._sync._resultado_ddd_local(ddd, ddd_limpo)
+        if resultado:
+            return resultado
+
+        return await self._consultar_com_cache(
+            "DDD", ddd, chave_cache("ddd", ddd_limpo), lambda: self._buscar_ddd(ddd, ddd_limpo)
+        )
+
+    async def _buscar_ddd(self, ddd: str, ddd_limpo: str) -> Dict[str, Any]:
+        """Busca o DDD na BrasilAPI e salva no cache"""
+        data = await self._fazer_requisicao(BRASILAPI_DDD_URL.format(ddd_limpo), "BrasilAPI-DDD")
+        return self._sync._processar_resultado_ddd(data, ddd, ddd_limpo)
+
+    async def consultar_cnpj(self, cnpj: str, fonte: str = "cnpja") -> Dict[str, Any]:
+        """
+        Consulta informações de CNPJ
+
+        Args:
+            cnpj (str): CNPJ a ser consultado
+            fonte (str): Fonte da consulta ('cnpja', 'brasilapi', 'receitaws' ou 'auto')
+
+        Returns:
+            Dict[str, Any]: Dados do CNPJ ou erro
+        """
+        if not validar_cnpj(cnpj):
+            log_consulta("CNPJ", cnpj, False, "CNPJ inválido")
+            return {"erro": "CNPJ inválido", "cnpj": cnpj}
+
+        cnpj_limpo = limpar_cnpj(cnpj)
+        cache_key = chave_cache("cnpj", cnpj_limpo, fonte)
+
+        return await self._consultar_com_cache(
+            "CNPJ", cnpj, cache_key, lambda: self._buscar_cnpj(cnpj, cnpj_limpo, fonte, cache_key)
+        )
+
+    async def _buscar_cnpj(self, cnpj: str, cnpj_limpo: str, fonte: str, cache_key: str) -> Dict[str, Any]:
+        """Busca o CNPJ nas fontes externas e salva no cache"""
+        resultado = {"erro": "Erro na consulta", "cnpj": cnpj}
+        for fonte_atual in self._sync._fontes_cnpj(fonte):
+            url_template, api_name = FONTES_CNPJ[fonte_atual]
+            data = await self._fazer_requisicao(url_template.format(cnpj_limpo), api_name)
+
+            if not data:
+                log_consulta("CNPJ", cnpj, False, f"Erro na API - {fonte_atual}")
+                continue
+
+            if 'status' in data and data['status'] == 'ERROR':
+                resultado = {"erro": "CNPJ não encontrado", "cnpj": cnpj}
+                log_consulta("CNPJ", cnpj, False, f"CNPJ não encontrado - {fonte_atual}")
+                continue
+
+            resultado = self._sync._normalizar_resultado_cnpj(data, fonte_atual, cnpj_limpo)
+            cache.set(cache_key, resultado)
+            log_consulta("CNPJ", cnpj, True, f"Consulta realizada com sucesso - {fonte_atual}")
+            return resultado
+
+        if resultado["erro"] == "CNPJ não encontrado":
+            self._sync._gravar_negativo(cache_key, resultado)
+        return resultado
+
+    async def consultar_municipios_uf(self, uf: str) -> Dict[str, Any]:
+        """
+        Consulta municípios por UF
+
+        Args:
+            uf (str): Sigla do estado (UF)
+
+        Returns:
+            Dict[str, Any]: Lista de municípios ou erro
+        """
+        if not uf or len(uf) != 2:
+            log_consulta("MUNICIPIOS", uf, False, "UF inválida")
+            return {"erro": "UF inválida", "uf": uf}
+
+        uf_upper = uf.upper()
+
+        cached_result = cache.get(chave_cache("municipios", uf_upper))
+        if cached_result:
+            log_consulta("MUNICIPIOS", uf, True, "Cache hit")
+            return cached_result
+
+        data = await self._fazer_requisicao(BRASILAPI_IBGE_URL.format(uf_upper), "BrasilAPI-IBGE")
+        return self._sync._processar_resultado_municipios(data, uf, uf_upper)
+
+    async def consultar_telefone(self, telefone: str) -> Dict[str, Any]:
+        """
+        Consulta informações sobre um número de telefone brasileiro
+
+        O DDD é consultado no event loop; a identificação da operadora (scraping
+        da ABR Telecom e base local) roda em thread, em paralelo com o DDD.
+
+        Args:
+            telefone: Número de telefone (com ou sem DDD)
+
+        Returns:
+            Dict com informações do telefone
+        """
+        try:
+            telefone_limpo = re.sub(r'[^\d]', '', telefone)
+
+            if len(telefone_limpo) < 10 or len(telefone_limpo) > 11:
+                return {
+                    "sucesso": False,
+                    "erro": "Telefone deve ter 10 ou 11 dígitos (com DDD)"
+                }
+
+            ddd, numero, tipo = self._sync._classificar_telefone(telefone_limpo)
+
+            info_ddd, resolucao = await asyncio.gather(
+                self.consultar_ddd(ddd),
+                asyncio.to_thread(self._sync._resolver_operadora, telefone_limpo)
+            )
+
+            resultado = self._sync._montar_resultado_telefone(telefone_limpo, ddd, numero, tipo, info_ddd, resolucao)
+
+            logger.info(f"Consulta Telefone - Parâmetro: {telefone} - Status: SUCESSO - Detalhes: Consulta realizada com sucesso")
+            return resultado
+
+        except Exception as e:
+            log_error(e, f"Erro ao consultar telefone: {telefone}")
+            return {
+                "sucesso": False,
+                "erro": f"Erro ao consultar telefone: {str(e)}"
+            }
+
+    async def consultar_dados_pessoais_telefone(self, telefone: str) -> Dict[str, Any]:
+        """
+        Consulta dados pessoais usando número de telefone
+
+        Os clientes dos provedores de dados pessoais são síncronos; a consulta
+        roda em thread para não bloquear o event loop.
+        """
+        return await asyncio.to_thread(self._sync.consultar_dados_pessoais_telefone, telefone)
+
+    async def consultar_dados_pessoais_avancado(self, telefone: str = None, cpf: str = None,
+                                                nome: str = None, data_nascimento: str = None,
+                                                busca_avancada: bool = False) -> Dict[str, Any]:
+        """Consulta avançada de dados pessoais (em thread, ver consultar_dados_pessoais_telefone)"""
+        return await asyncio.to_thread(
+            self._sync.consultar_dados_pessoais_avancado,
+            telefone=telefone, cpf=cpf, nome=nome,
+            data_nascimento=data_nascimento, busca_avancada=busca_avancada
+        )
+
+
+async_investigador = AsyncOSINTInvestigador(investigador)
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark da extração da operadora nas respostas da ABR Telecom
+
+Compara o extrator em camadas (utils/extracao_abr.py) com a extração anterior,
+que montava a árvore BeautifulSoup completa de cada resposta e aplicava as
+buscas por classe, id, tabelas e texto geral. As páginas em paginas_abr/
+reproduzem a estrutura das respostas do Consulta Número (resultado em bloco,
+em tabela, após rótulo e número não encontrado).
+
+Uso:
+    python benchmarks/bench_extracao_abr.py [--repeticoes 200]
+"""
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from utils.extracao_abr import extrair_operadora  # noqa: E402
+
+PAGINAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "paginas_abr")
+
+_VARIANTES = {
+    'VIVO': ['VIVO', 'TELEFONICA'],
+    'CLARO': ['CLARO', 'CLARO S.A.', 'CLARO SA'],
+    'TIM': ['TIM', 'T.I.M.', 'TELECOM ITALIA'],
+    'OI': ['OI', 'OI S.A.', 'TELEMAR']
+}
+
+
+def _texto_anterior(texto):
+    for operadora, variantes in _VARIANTES.items():
+        for variante in variantes:
+            if variante in texto:
+                return operadora
+    return None
+
+
+def extrair_anterior(html):
+    """Extração anterior: árvore completa e quatro buscas em sequência"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for seletores in (['.resultado', '.operadora', '.prestadora'], ['#resultado', '#operadora', '#prestadora']):
+        for seletor in seletores:
+            for elemento in soup.select(seletor):
+                operadora = _texto_anterior(elemento.get_text().strip().upper())
+                if operadora:
+                    return operadora
+    for tabela in soup.find_all('table'):
+        for linha in tabela.find_all('tr'):
+            for celula in linha.find_all(['td', 'th']):
+                operadora = _texto_anterior(celula.get_text().strip().upper())
+                if operadora:
+                    return operadora
+    return _texto_anterior(soup.get_text().upper())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da extração de operadora (ABR Telecom)")
+    parser.add_argument("--repeticoes", type=int, default=200, help="execuções por página (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    print(f"{'página':<24}{'anterior':>14}{'camadas':>14}{'ganho':>8}   resultado (anterior / camadas)")
+    for caminho in sorted(glob.glob(os.path.join(PAGINAS, "*.html"))):
+        with open(caminho, encoding="utf-8") as arquivo:
+            html = arquivo.read()
+
+        anterior = timeit.timeit(lambda: extrair_anterior(html), number=args.repeticoes) / args.repeticoes
+        camadas = timeit.timeit(lambda: extrair_operadora(html), number=args.repeticoes) / args.repeticoes
+        print(f"{os.path.basename(caminho):<24}{anterior * 1e6:>11.1f} µs{camadas * 1e6:>11.1f} µs"
+              f"{anterior / camadas:>7.1f}x   {extrair_anterior(html)} / {extrair_operadora(html)}")
+
+
+if __name__ == "__main__":
+    main()
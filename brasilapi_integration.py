@@ -12,6 +12,7 @@ VANTAGENS:
 """
 
 import requests
+from utils import transporte
 import json
 from typing import Dict, Any, Optional
 import time
@@ -51,7 +52,7 @@ class BrasilAPIClient:
             # Endpoint para consulta de CEP
             url = f"{self.base_url}/cep/v1/{cep_limpo}"
             
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = transporte.get(url, headers=self.headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -121,7 +122,7 @@ class BrasilAPIClient:
             # Endpoint para consulta de CNPJ
             url = f"{self.base_url}/cnpj/v1/{cnpj_limpo}"
             
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = transporte.get(url, headers=self.headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -199,7 +200,7 @@ class BrasilAPIClient:
             # Endpoint para consulta de DDD
             url = f"{self.base_url}/ddd/v1/{ddd_limpo}"
             
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = transporte.get(url, headers=self.headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -262,7 +263,7 @@ class BrasilAPIClient:
             # Endpoint para consulta de banco
             url = f"{self.base_url}/banks/v1/{codigo_limpo}"
             
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = transporte.get(url, headers=self.headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -313,7 +314,7 @@ class BrasilAPIClient:
             # Endpoint para listar bancos
             url = f"{self.base_url}/banks/v1"
             
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = transporte.get(url, headers=self.headers)
             
             if response.status_code == 200:
                 data = response.json()
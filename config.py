@@ -39,6 +39,54 @@ ANTIFRAUDEBRASIL_TOKEN = os.getenv('ANTIFRAUDEBRASIL_TOKEN', '')  # Token da Ant
 # Configurações de Cache
 CACHE_ENABLED = True
 CACHE_TIMEOUT = 3600  # 1 hora em segundos
+CACHE_MAX_ITENS = int(os.getenv('CACHE_MAX_ITENS', '10000'))  # entradas no cache em memória
+CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', str(64 * 1024 * 1024)))  # orçamento aproximado em bytes
+CACHE_LOTE_EXPIRACAO = 64  # entradas expiradas recuperadas por vez (em set e cleanup_expired)
+
+# Stale-while-revalidate: por quanto tempo uma consulta vencida ainda é servida enquanto é atualizada
+CACHE_STALE_TTL = int(os.getenv('CACHE_STALE_TTL', '86400'))
+CACHE_INTERVALO_REVALIDACAO = 30  # segundos entre atualizações em segundo plano da mesma chave
+
+# Política por namespace (prefixo da chave antes de "_"): TTL, janela stale, TTL do cache
+# negativo ("não encontrado") e tamanho máximo de uma entrada em bytes (None = sem limite).
+# Namespaces fora da tabela usam CACHE_TIMEOUT, sem janela stale.
+CACHE_POLITICAS = {
+    'cep': {'ttl': 86400, 'stale_ttl': CACHE_STALE_TTL,
+            'ttl_negativo': int(os.getenv('CACHE_NEGATIVO_TTL_CEP', '300')), 'max_bytes': 16 * 1024},
+    'ddd': {'ttl': 7 * 86400, 'stale_ttl': CACHE_STALE_TTL,
+            'ttl_negativo': int(os.getenv('CACHE_NEGATIVO_TTL_DDD', '3600')), 'max_bytes': 64 * 1024},
+    'cnpj': {'ttl': 86400, 'stale_ttl': CACHE_STALE_TTL,
+             'ttl_negativo': int(os.getenv('CACHE_NEGATIVO_TTL_CNPJ', '900')), 'max_bytes': 64 * 1024},
+    # Dados estáticos (mudam poucas vezes por mês)
+    'bancos': {'ttl': 30 * 86400, 'max_bytes': 1024 * 1024},
+    'municipios': {'ttl': 30 * 86400, 'max_bytes': 1024 * 1024},
+    'abr_telecom': {'ttl': 86400, 'max_bytes': 4 * 1024},
+    # Resolução combinada de operadora; sem fonte confiável (só faixa de origem ou DDD) vale ttl_negativo
+    'operadora': {'ttl': 86400, 'ttl_negativo': 3600, 'max_bytes': 8 * 1024},
+    # Dados pessoais: TTL curto
+    'dados_pessoais': {'ttl': 3600, 'max_bytes': 256 * 1024},
+    'dados_avancados': {'ttl': 1800, 'max_bytes': 256 * 1024},
+    'directd': {'ttl': CACHE_TIMEOUT, 'max_bytes': 256 * 1024},
+}
+
+# Aquecimento do cache (aquecimento_cache.py): bancos, municípios das 27 UFs e DDDs mais consultados
+CACHE_AQUECIMENTO_INICIAR = os.getenv('CACHE_AQUECIMENTO_INICIAR', 'true').lower() == 'true'  # na subida do app
+CACHE_AQUECIMENTO_PRAZO = float(os.getenv('CACHE_AQUECIMENTO_PRAZO', '20'))  # segundos para todo o aquecimento
+CACHE_AQUECIMENTO_CONCORRENCIA = int(os.getenv('CACHE_AQUECIMENTO_CONCORRENCIA', '4'))  # threads próprias, fora do executor compartilhado
+CACHE_AQUECIMENTO_DDDS = ['11', '21', '31', '41', '51', '61', '71', '81', '85', '91', '19', '27', '47', '48', '62']
+
+# Cache persistente de segundo nível (SQLite em modo WAL), compartilhado entre workers e reinícios
+CACHE_L2_ENABLED = os.getenv('CACHE_L2_ENABLED', 'false').lower() == 'true'
+CACHE_L2_PATH = os.getenv('CACHE_L2_PATH', '/tmp/osint_cache_l2.db' if os.getenv('VERCEL') else os.path.join('cache', 'cache_l2.db'))
+
+# SQLite da base de pessoas e do histórico (utils/banco_dados.py): uma conexão por thread
+SQLITE_MMAP_BYTES = int(os.getenv('SQLITE_MMAP_BYTES', str(64 * 1024 * 1024)))  # leitura via mmap
+SQLITE_CACHE_KB = int(os.getenv('SQLITE_CACHE_KB', str(16 * 1024)))  # cache de páginas por conexão
+SQLITE_STATEMENTS = 256  # statements preparados mantidos por conexão
+SQLITE_TIMEOUT = 5  # segundos aguardando um lock de escrita
+SQLITE_BUSCA_LIMITE = 50  # registros por página na busca cruzada
+SQLITE_BUSCA_LIMITE_MAXIMO = 500
+SQLITE_TAMANHO_LOTE = int(os.getenv('SQLITE_TAMANHO_LOTE', '1000'))  # registros por transação nas gravações em lote
 
 # Configurações de Logging
 LOG_LEVEL = "INFO"
@@ -54,4 +102,80 @@ RATE_LIMIT_REQUESTS = 60  # requests por minuto
 RATE_LIMIT_WINDOW = 60    # janela em segundos
 
 # Timeouts
-REQUEST_TIMEOUT = 10  # segundos
\ No newline at end of file
+REQUEST_TIMEOUT = 10  # segundos
+# Transporte HTTP compartilhado (utils/transporte.py)
+HTTP_POOL_HOSTS = int(os.getenv('HTTP_POOL_HOSTS', '20'))        # hosts com pool de conexões mantido
+HTTP_POOL_CONEXOES = int(os.getenv('HTTP_POOL_CONEXOES', '32'))  # conexões keep-alive por host
+HTTP_TIMEOUT_CONEXAO = float(os.getenv('HTTP_TIMEOUT_CONEXAO', '3.05'))  # segundos
+
+# Timeouts (conexão, leitura) por host; hosts ausentes usam (HTTP_TIMEOUT_CONEXAO, REQUEST_TIMEOUT)
+HTTP_TIMEOUTS = {
+    "brasilapi.com.br": (HTTP_TIMEOUT_CONEXAO, 15),
+    "viacep.com.br": (HTTP_TIMEOUT_CONEXAO, 10),
+    "opencep.com": (HTTP_TIMEOUT_CONEXAO, 10),
+    "cdn.apicep.com": (HTTP_TIMEOUT_CONEXAO, 10),
+    "open.cnpja.com": (HTTP_TIMEOUT_CONEXAO, 15),
+    "www.receitaws.com.br": (HTTP_TIMEOUT_CONEXAO, 20),
+    "apibrasil.com.br": (HTTP_TIMEOUT_CONEXAO, 30),
+    "apiv3.directd.com.br": (5, 30),
+    "api.assertivasolucoes.com.br": (5, 20),
+    "api.deskdata.com.br": (5, 20),
+    "api.antifraudebrasil.com": (5, 20),
+    "api.api-ninjas.com": (HTTP_TIMEOUT_CONEXAO, 10),
+    "consultanumero.abrtelecom.com.br": (5, 15),
+    "api.infosimples.com": (5, 30),
+}
+
+# Consultas paralelas
+MAX_WORKERS_CONSULTAS = int(os.getenv('MAX_WORKERS_CONSULTAS', '32'))  # threads do executor compartilhado
+MAX_WORKERS_SEGUNDO_PLANO = int(os.getenv('MAX_WORKERS_SEGUNDO_PLANO', '4'))  # atualizações de cache em segundo plano
+
+# Estratégia de consulta de CEP: 'sequencial', 'hedge' (dispara o próximo provedor
+# após CEP_HEDGE_DELAY segundos sem resposta) ou 'race' (todos ao mesmo tempo)
+CEP_MODO_CONSULTA = os.getenv('CEP_MODO_CONSULTA', 'hedge')
+CEP_HEDGE_DELAY = float(os.getenv('CEP_HEDGE_DELAY', '0.5'))  # segundos
+CEP_PRAZO_CONSULTA = float(os.getenv('CEP_PRAZO_CONSULTA', '15'))  # segundos para todos os provedores de CEP
+
+# DDDs: a base local (dados/ddd_brasil.json) responde as consultas; com a atualização
+# online ligada a BrasilAPI é consultada (lista completa de cidades) e a base local vira fallback
+DDD_ATUALIZACAO_ONLINE = os.getenv('DDD_ATUALIZACAO_ONLINE', 'false').lower() == 'true'
+
+# Consulta de operadora na ABR Telecom; desligada, a análise de telefone não acessa a rede
+CONSULTA_OPERADORA_ONLINE = os.getenv('CONSULTA_OPERADORA_ONLINE', 'true').lower() == 'true'
+
+# Sessões da ABR Telecom (utils/sessao_abr.py): páginas com o formulário de consulta, em ordem
+ABR_URLS_CONSULTA = [
+    "https://consultanumero.abrtelecom.com.br/consultanumero/consulta/consultaSituacaoAtualCtg",
+    "https://consultanumero.abrtelecom.com.br/consultanumero/consulta/consultaSituacaoAtual",
+    "https://consultanumero.abrtelecom.com.br/"
+]
+ABR_MAX_CONCORRENTES = int(os.getenv('ABR_MAX_CONCORRENTES', '2'))  # consultas simultâneas ao host
+ABR_SESSAO_VALIDADE = int(os.getenv('ABR_SESSAO_VALIDADE', '600'))  # segundos até recarregar cookies e tokens
+ABR_ESPERA_VAGA = 5  # segundos aguardando uma vaga antes de desistir da consulta
+
+# Plano de numeração (faixas -> operadora de origem) usado quando a ABR Telecom não responde;
+# o arquivo é relido quando muda, verificado no máximo a cada PLANO_NUMERACAO_INTERVALO_RECARGA segundos
+PLANO_NUMERACAO_PATH = os.getenv('PLANO_NUMERACAO_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dados', 'plano_numeracao.csv'))
+PLANO_NUMERACAO_INTERVALO_RECARGA = 30
+
+# Base local de portabilidade (utils/portabilidade.py), importada com importar_portabilidade.py;
+# números portados são respondidos por ela antes da ABR Telecom
+PORTABILIDADE_PATH = os.getenv('PORTABILIDADE_PATH', '/tmp/portabilidade.bin' if os.getenv('VERCEL') else os.path.join('cache', 'portabilidade.bin'))
+PORTABILIDADE_INTERVALO_RECARGA = 30  # segundos entre verificações de um arquivo novo
+# Linhas do CSV ordenadas por vez na importação (limita a memória usada em snapshots grandes)
+PORTABILIDADE_LOTE_ORDENACAO = int(os.getenv('PORTABILIDADE_LOTE_ORDENACAO', '500000'))
+
+# Prazo único para as fontes de dados pessoais consultadas em paralelo
+OSINT_PRAZO_FONTES = float(os.getenv('OSINT_PRAZO_FONTES', '12'))  # segundos
+
+# Placar de provedores (reordenação automática das cadeias de fallback)
+PLACAR_JANELA = 100         # últimas chamadas consideradas por provedor
+PLACAR_MIN_AMOSTRAS = 5     # amostras mínimas antes de reordenar um provedor
+PLACAR_TAXA_MINIMA = 0.5    # abaixo desta taxa de sucesso o provedor vai para o fim da fila
+
+# Circuit breakers por host externo
+CIRCUIT_LIMITE_FALHAS = int(os.getenv('CIRCUIT_LIMITE_FALHAS', '5'))  # falhas consecutivas para abrir
+CIRCUIT_TEMPO_RECUPERACAO = float(os.getenv('CIRCUIT_TEMPO_RECUPERACAO', '30'))  # segundos até a sonda
+
+# Motor assíncrono (async_investigador.py)
+ASYNC_LIMITE_CONEXOES = int(os.getenv('ASYNC_LIMITE_CONEXOES', '200'))  # conexões simultâneas por event loop
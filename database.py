@@ -4,17 +4,22 @@ import os
 from datetime import datetime
 import hashlib
 
+from utils.banco_dados import (pool_sqlite, gravar_pessoas, criterios_busca, buscar_pessoas,
+                                criar_indice_nomes, buscar_por_nome)
+
 class DatabaseManager:
     def __init__(self, db_path="osint_database.db"):
         """Inicializa o gerenciador de banco de dados"""
         self.db_path = db_path
+        self.pool = pool_sqlite(db_path)
         self.init_database()
     
     def init_database(self):
         """Cria as tabelas necessárias se não existirem"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        with self.pool.conexao() as conn:
+            self._criar_tabelas(conn.cursor())
+    
+    def _criar_tabelas(self, cursor):
         # Tabela principal para dados pessoais
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS pessoas (
@@ -36,6 +41,8 @@ class DatabaseManager:
         # Índices para otimizar buscas
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_cpf ON pessoas(cpf)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_nome ON pessoas(nome)')
+        # Busca por prefixo do nome sem diferenciar maiúsculas quando não há FTS5 (LIKE 'x%' com INDEXED BY)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_nome_nocase ON pessoas(nome COLLATE NOCASE)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_rg ON pessoas(rg)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_cnh ON pessoas(cnh)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_email ON pessoas(email)')
@@ -44,35 +51,50 @@ class DatabaseManager:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_pis ON pessoas(pis)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_cns ON pessoas(cns)')
         
-        conn.commit()
-        conn.close()
+        # Busca de nomes por texto (FTS5), mantida pelos triggers
+        criar_indice_nomes(cursor)
     
     def inserir_pessoa(self, cpf, nome=None, rg=None, cnh=None, email=None, telefone=None, titulo_eleitor=None, pis=None, cns=None):
         """Insere uma nova pessoa no banco de dados"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute('''
-                INSERT INTO pessoas (cpf, nome, rg, cnh, email, telefone, titulo_eleitor, pis, cns)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (cpf, nome, rg, cnh, email, telefone, titulo_eleitor, pis, cns))
-            
-            conn.commit()
+            with self.pool.conexao() as conn:
+                conn.execute('''
+                    INSERT INTO pessoas (cpf, nome, rg, cnh, email, telefone, titulo_eleitor, pis, cns)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (cpf, nome, rg, cnh, email, telefone, titulo_eleitor, pis, cns))
             return {"status": "success", "message": "Pessoa inserida com sucesso"}
         
         except sqlite3.IntegrityError:
             return {"status": "error", "message": "CPF já existe no banco de dados"}
         except Exception as e:
             return {"status": "error", "message": f"Erro ao inserir pessoa: {str(e)}"}
-        finally:
-            conn.close()
+    
+    def inserir_pessoas_lote(self, registros, tamanho_lote=None):
+        """Insere pessoas em lote; CPFs já cadastrados são mantidos e informados como existentes"""
+        return self._gravar_lote(registros, False, tamanho_lote)
+    
+    def upsert_pessoas(self, registros, tamanho_lote=None):
+        """Insere ou atualiza pessoas em lote (ON CONFLICT(cpf) DO UPDATE); campos ausentes são mantidos"""
+        return self._gravar_lote(registros, True, tamanho_lote)
+    
+    def _gravar_lote(self, registros, atualizar, tamanho_lote):
+        resultados = list(gravar_pessoas(self.pool, registros, atualizar, tamanho_lote))
+        totais = {"inserido": 0, "atualizado": 0, "existente": 0, "erro": 0}
+        for resultado in resultados:
+            totais[resultado["status"]] += 1
+        
+        return {
+            "status": "success",
+            "total": len(resultados),
+            "inseridos": totais["inserido"],
+            "atualizados": totais["atualizado"],
+            "existentes": totais["existente"],
+            "erros": totais["erro"],
+            "resultados": resultados
+        }
     
     def atualizar_pessoa(self, cpf, nome=None, rg=None, cnh=None, email=None, telefone=None, titulo_eleitor=None, pis=None, cns=None):
         """Atualiza dados de uma pessoa existente"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
             # Construir query dinamicamente baseado nos campos fornecidos
             campos_update = []
@@ -110,107 +132,63 @@ class DatabaseManager:
             valores.append(cpf)
             
             query = f"UPDATE pessoas SET {', '.join(campos_update)} WHERE cpf = ?"
-            cursor.execute(query, valores)
+            with self.pool.conexao() as conn:
+                cursor = conn.execute(query, valores)
             
             if cursor.rowcount > 0:
-                conn.commit()
                 return {"status": "success", "message": "Pessoa atualizada com sucesso"}
             else:
                 return {"status": "error", "message": "CPF não encontrado"}
         
         except Exception as e:
             return {"status": "error", "message": f"Erro ao atualizar pessoa: {str(e)}"}
-        finally:
-            conn.close()
     
     def buscar_por_cpf(self, cpf):
         """Busca uma pessoa pelo CPF"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute('SELECT * FROM pessoas WHERE cpf = ?', (cpf,))
-            resultado = cursor.fetchone()
+            resultado = self.pool.conexao().execute('SELECT * FROM pessoas WHERE cpf = ?', (cpf,)).fetchone()
             
             if resultado:
-                return {
-                    "status": "success",
-                    "dados": {
-                        "id": resultado[0],
-                        "cpf": resultado[1],
-                        "nome": resultado[2],
-                        "rg": resultado[3],
-                        "cnh": resultado[4],
-                        "email": resultado[5],
-                        "telefone": resultado[6],
-                        "titulo_eleitor": resultado[7],
-                        "pis": resultado[8],
-                        "cns": resultado[9],
-                        "data_criacao": resultado[10],
-                        "data_atualizacao": resultado[11]
-                    }
-                }
+                return {"status": "success", "dados": resultado}
             else:
                 return {"status": "not_found", "message": "CPF não encontrado"}
         
         except Exception as e:
             return {"status": "error", "message": f"Erro ao buscar CPF: {str(e)}"}
-        finally:
-            conn.close()
     
-    def buscar_cruzada(self, **kwargs):
-        """Busca cruzada por múltiplos campos"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+    def buscar_cruzada(self, limite=None, cursor=None, **kwargs):
+        """Busca cruzada por múltiplos campos, paginada por cursor (nome busca por prefixo)"""
         try:
-            # Construir query dinamicamente
-            condicoes = []
-            valores = []
-            
-            for campo, valor in kwargs.items():
-                if valor and campo in ['cpf', 'nome', 'rg', 'cnh', 'email', 'telefone', 'titulo_eleitor', 'pis', 'cns']:
-                    if campo == 'nome':
-                        condicoes.append(f"{campo} LIKE ?")
-                        valores.append(f"%{valor}%")
-                    else:
-                        condicoes.append(f"{campo} = ?")
-                        valores.append(valor)
-            
-            if not condicoes:
+            criterios = criterios_busca(kwargs)
+            if not criterios:
                 return {"status": "error", "message": "Nenhum critério de busca fornecido"}
             
-            query = f"SELECT * FROM pessoas WHERE {' OR '.join(condicoes)}"
-            cursor.execute(query, valores)
-            resultados = cursor.fetchall()
-            
-            pessoas_encontradas = []
-            for resultado in resultados:
-                pessoas_encontradas.append({
-                    "id": resultado[0],
-                    "cpf": resultado[1],
-                    "nome": resultado[2],
-                    "rg": resultado[3],
-                    "cnh": resultado[4],
-                    "email": resultado[5],
-                    "telefone": resultado[6],
-                    "titulo_eleitor": resultado[7],
-                    "pis": resultado[8],
-                    "cns": resultado[9],
-                    "data_criacao": resultado[10],
-                    "data_atualizacao": resultado[11]
-                })
+            pagina = buscar_pessoas(self.pool, criterios, limite, cursor)
             
             return {
                 "status": "success",
-                "total_encontrados": len(pessoas_encontradas),
-                "dados": pessoas_encontradas
+                "total_encontrados": len(pagina["dados"]),
+                "dados": pagina["dados"],
+                "limite": pagina["limite"],
+                "proximo_cursor": pagina["proximo_cursor"]
             }
         
         except Exception as e:
             return {"status": "error", "message": f"Erro na busca cruzada: {str(e)}"}
-        finally:
-            conn.close()
+    
+    def buscar_por_nome(self, nome, limite=None):
+        """Busca por nome sem diferenciar acentos e ordem das palavras, com os mais relevantes primeiro"""
+        try:
+            resultado = buscar_por_nome(self.pool, nome, limite)
+            
+            return {
+                "status": "success",
+                "total_encontrados": len(resultado["dados"]),
+                "dados": resultado["dados"]
+            }
+        
+        except Exception as e:
+            return {"status": "error", "message": f"Erro na busca por nome: {str(e)}"}
     
     def inserir_dados_exemplo(self):
         """Insere dados de exemplo para teste"""
@@ -250,9 +228,4 @@ class DatabaseManager:
             }
         ]
         
-        resultados = []
-        for pessoa in dados_exemplo:
-            resultado = self.inserir_pessoa(**pessoa)
-            resultados.append(resultado)
-        
-        return resultados
\ No newline at end of file
+        return self.inserir_pessoas_lote(dados_exemplo)
\ No newline at end of file
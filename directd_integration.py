@@ -14,7 +14,9 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from utils.logger import log_consulta
-from utils.cache import cache
+from utils.cache import cache, chave_cache
+from utils.concorrencia import single_flight
+from utils import transporte
 
 class DirectDataClient:
     """Cliente para integração com Direct Data API - Versão Paga"""
@@ -22,7 +24,6 @@ class DirectDataClient:
     def __init__(self):
         self.base_url = "https://apiv3.directd.com.br/api"
         self.token = os.getenv('DIRECTD_TOKEN', 'B8A26730-37E3-4C74-B92E-26EABC7D1324')
-        self.timeout = 30
         
     def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Faz requisição para a API Direct Data - Versão Paga"""
@@ -36,7 +37,7 @@ class DirectDataClient:
             log_consulta(f"Direct Data Paga - {endpoint}", str(params), "INICIANDO")
             
             # Para API paga, usar GET com parâmetros na URL
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = transporte.get(url, params=params)
             response.raise_for_status()
             
             # Definir encoding explicitamente para evitar problemas de UTF-8
@@ -109,19 +110,13 @@ class DirectDataClient:
             return {'success': False, 'error': 'CPF deve ter 11 dígitos'}
         
         # Verificar cache
-        cache_key = f"directd_paga_cpf_{cpf_limpo}"
+        cache_key = chave_cache("directd", "cpf", cpf_limpo)
         cached_data = cache.get(cache_key)
         if cached_data:
             return cached_data
         
         params = {'CPF': cpf_limpo}
-        result = self._make_request('RegistrationDataBrazil', params)
-        
-        # Salvar no cache se sucesso
-        if result.get("success"):
-            cache.set(cache_key, result)
-        
-        return result
+        return self._consultar_com_cache(cache_key, 'RegistrationDataBrazil', params)
     
     def consultar_por_nome(self, nome: str, sobrenome: str, data_nascimento: str = None) -> Dict[str, Any]:
         """
@@ -150,18 +145,30 @@ class DirectDataClient:
         }
         
         # Verificar cache
-        cache_key = f"directd_paga_nome_{nome}_{sobrenome}_{data_nascimento}"
+        cache_key = chave_cache("directd", "nome", nome, sobrenome, data_nascimento)
         cached_data = cache.get(cache_key)
         if cached_data:
             return cached_data
         
-        result = self._make_request('RegistrationDataBrazil', params)
+        return self._consultar_com_cache(cache_key, 'RegistrationDataBrazil', params)
+    
+    def _consultar_com_cache(self, cache_key: str, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Faz a requisição paga uma única vez por chave em andamento e salva no cache se sucesso
         
-        # Salvar no cache se sucesso
-        if result.get("success"):
-            cache.set(cache_key, result)
+        Consultas simultâneas da mesma chave aguardam o resultado da primeira,
+        evitando chamadas cobradas em duplicidade.
+        """
+        def consultar():
+            result = self._make_request(endpoint, params)
+            
+            # Salvar no cache se sucesso
+            if result.get("success"):
+                cache.set(cache_key, result)
+            
+            return result
         
-        return result
+        return single_flight.executar(cache_key, consultar)
     
     def formatar_resultado(self, resultado: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -7,7 +7,6 @@ Integração com APIs gratuitas para consulta de documentos brasileiros
 - RG e CNH: Validação local robusta usando validate-docbr
 """
 
-import requests
 import json
 import os
 import re
@@ -15,6 +14,8 @@ from datetime import datetime
 import logging
 from typing import Dict, Any, Optional
 
+from utils import transporte
+
 # Importar biblioteca de validação de documentos brasileiros
 try:
     from validate_docbr import CNH, CPF, CNPJ, PIS
@@ -31,8 +32,7 @@ class DocumentosAPI:
     """Classe para integração com APIs de documentos brasileiros"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = transporte.nova_sessao({
             'User-Agent': 'OSINT-Investigador-BR/1.0',
             'Accept': 'application/json',
             'Content-Type': 'application/json'
@@ -271,7 +271,7 @@ class DocumentosAPI:
                 'Content-Type': 'application/json'
             }
             
-            response = self.session.post(url, json=payload, headers=headers, timeout=30)
+            response = self.session.post(url, json=payload, headers=headers, timeout=transporte.timeout_para(url))
             
             if response.status_code == 200:
                 data = response.json()
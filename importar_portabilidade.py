@@ -0,0 +1,35 @@
+"""
+Importação da base local de portabilidade numérica
+Converte um snapshot (ou um arquivo delta) de portabilidade em CSV para o
+arquivo binário consultado por utils/portabilidade.py
+
+Uso:
+    python importar_portabilidade.py snapshot.csv [--delta] [--destino CAMINHO]
+
+O CSV precisa das colunas numero, operadora e data (separador , ou ;). Em um
+delta, operadora vazia indica que o número voltou à operadora de origem.
+"""
+import argparse
+import json
+import time
+
+from utils.portabilidade import BasePortabilidade
+from config import PORTABILIDADE_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa um snapshot de portabilidade numérica")
+    parser.add_argument("arquivo", help="CSV com as colunas numero, operadora e data")
+    parser.add_argument("--delta", action="store_true", help="mescla com a base atual em vez de substituí-la")
+    parser.add_argument("--destino", default=PORTABILIDADE_PATH, help="arquivo da base (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    inicio = time.monotonic()
+    relatorio = BasePortabilidade(args.destino, intervalo_recarga=None).importar(args.arquivo, delta=args.delta)
+    relatorio["tempo_s"] = round(time.monotonic() - inicio, 2)
+    relatorio["destino"] = args.destino
+    print(json.dumps(relatorio, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
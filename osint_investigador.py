@@ -5,63 +5,124 @@ Sistema completo para investigações OSINT no Brasil
 import requests
 import time
 import re
+from concurrent.futures import wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from utils.validators import (
     validar_cep, validar_ddd, validar_cnpj,
     limpar_cep, limpar_ddd, limpar_cnpj,
     formatar_cep, formatar_cnpj
 )
-from utils.cache import cache
+from utils.cache import cache, chave_cache
+from utils.base_ddd import base_ddd
+from utils.registro_bancos import registro_bancos
+from utils.plano_numeracao import plano_numeracao
+from utils.portabilidade import base_portabilidade
+from utils.sessao_abr import sessoes_abr
+from utils.extracao_abr import extrair_operadora
+from utils.concorrencia import executor, executor_segundo_plano, single_flight
+from utils.provedores import placar
+from utils.circuit_breaker import circuitos
+from utils import transporte
 from utils.logger import log_consulta, log_api_call, log_error, logger
 from config import (
     VIACEP_URL, BRASILAPI_CEP_V1_URL, BRASILAPI_CEP_V2_URL, 
     OPENCEP_URL, APICEP_URL, BRASILAPI_DDD_URL, BRASILAPI_CNPJ_URL,
     BRASILAPI_BANKS_URL, BRASILAPI_IBGE_URL, RECEITAWS_CNPJ_URL,
-    CNPJA_URL, API_NINJAS_SWIFT_URL, API_NINJAS_KEY, REQUEST_TIMEOUT,
+    CNPJA_URL, API_NINJAS_SWIFT_URL, API_NINJAS_KEY,
     DIRECT_DATA_API_URL, DIRECT_DATA_TOKEN, ASSERTIVA_LOCALIZE_API_URL,
     ASSERTIVA_LOCALIZE_TOKEN, DESK_DATA_API_URL, DESK_DATA_TOKEN,
-    ANTIFRAUDEBRASIL_API_URL, ANTIFRAUDEBRASIL_TOKEN
+    ANTIFRAUDEBRASIL_API_URL, ANTIFRAUDEBRASIL_TOKEN, CEP_MODO_CONSULTA,
+    CEP_HEDGE_DELAY, CEP_PRAZO_CONSULTA, OSINT_PRAZO_FONTES, DDD_ATUALIZACAO_ONLINE, CONSULTA_OPERADORA_ONLINE
 )
 
 
+# Fontes de CNPJ: URL e nome da API (usado no log e no placar de provedores)
+FONTES_CNPJ = {
+    "cnpja": (CNPJA_URL, "CNPJá"),
+    "brasilapi": (BRASILAPI_CNPJ_URL, "BrasilAPI-CNPJ"),
+    "receitaws": (RECEITAWS_CNPJ_URL, "ReceitaWS")
+}
+
+# Resposta de _fazer_requisicao(aceitar_404=True) para HTTP 404 (recurso inexistente)
+RESPOSTA_404 = {"erro": True, "status_http": 404}
+
+
+def cep_nao_encontrado(data: Dict[str, Any]) -> bool:
+    """Resposta de provedor que afirma que o CEP não existe (ViaCEP {"erro": true}, HTTP 404)"""
+    return data.get("erro") in (True, "true") or data.get("status_http") == 404 or data.get("status") == 404
+
+
+# Última etapa da resolução de operadora: operadoras com maior presença no DDD
+OPERADORAS_PRINCIPAIS = ["Vivo", "Claro", "TIM"]
+DDDS_OPERADORAS_PRINCIPAIS = {"11", "21", "31", "41", "51", "61", "71", "81", "85"}
+
+
 class OSINTInvestigador:
     """Classe principal para consultas OSINT brasileiras"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = transporte.nova_sessao({
             'User-Agent': 'OSINT-Investigador-BR/1.0'
         })
+        self.ddd_online = DDD_ATUALIZACAO_ONLINE
+        self.operadora_online = CONSULTA_OPERADORA_ONLINE
     
-    def _fazer_requisicao(self, url: str, api_name: str) -> Optional[Dict[str, Any]]:
+    def _fazer_requisicao(self, url: str, api_name: str, aceitar_404: bool = False) -> Optional[Dict[str, Any]]:
         """
         Faz requisição HTTP com tratamento de erros e logging
         
         Args:
             url (str): URL da requisição
             api_name (str): Nome da API para logging
+            aceitar_404 (bool): Se True, HTTP 404 retorna RESPOSTA_404 em vez de None
             
         Returns:
             Optional[Dict[str, Any]]: Dados da resposta ou None em caso de erro
         """
+        circuito = circuitos.obter(url)
+        if not circuito.permitir_requisicao():
+            logger.warning(f"Circuito aberto para {circuito.nome}, ignorando {api_name}")
+            return None
+        
+        inicio = time.time()
         try:
-            inicio = time.time()
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+            response = self.session.get(url, timeout=transporte.timeout_para(url))
             tempo_resposta = time.time() - inicio
             
             log_api_call(api_name, url, response.status_code, tempo_resposta)
             
+            # Respostas 4xx indicam que o host está no ar (ex.: CEP inexistente)
+            if response.status_code >= 500:
+                circuito.registrar_falha()
+            else:
+                circuito.registrar_sucesso()
+            
+            if aceitar_404 and response.status_code == 404:
+                placar.registrar(api_name, True, tempo_resposta)
+                return dict(RESPOSTA_404)
+            
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            placar.registrar(api_name, True, tempo_resposta)
+            return data
             
         except requests.exceptions.Timeout:
+            circuito.registrar_falha()
+            placar.registrar(api_name, False, time.time() - inicio)
             log_error(Exception(f"Timeout na requisição para {api_name}"), f"URL: {url}")
             return None
+        except requests.exceptions.ConnectionError as e:
+            circuito.registrar_falha()
+            placar.registrar(api_name, False, time.time() - inicio)
+            log_error(e, f"Erro de conexão com {api_name}")
+            return None
         except requests.exceptions.RequestException as e:
+            placar.registrar(api_name, False, time.time() - inicio)
             log_error(e, f"Erro na requisição para {api_name}")
             return None
         except ValueError as e:
+            placar.registrar(api_name, False, time.time() - inicio)
             log_error(e, f"Erro ao decodificar JSON de {api_name}")
             return None
     
@@ -82,15 +143,98 @@ class OSINTInvestigador:
             return resultado
         
         cep_limpo = limpar_cep(cep)
-        cache_key = f"cep_{cep_limpo}"
+        cache_key = chave_cache("cep", cep_limpo)
         
-        # Verifica cache
-        cached_result = cache.get(cache_key)
-        if cached_result:
-            log_consulta("CEP", cep, True, "Cache hit")
-            return cached_result
+        # Cache (vencido é servido enquanto é atualizado); consultas simultâneas do
+        # mesmo CEP aguardam uma única busca na origem
+        return self._consultar_com_cache("CEP", cep, cache_key, self._buscar_cep, cep, cep_limpo, cache_key)
+    
+    def _consultar_com_cache(self, tipo: str, valor: str, cache_key: str, buscar, *args) -> Dict[str, Any]:
+        """
+        Stale-while-revalidate: responde do cache, mesmo vencido, e atualiza em segundo plano
+        
+        Args:
+            tipo: Tipo da consulta para o log (CEP, DDD, CNPJ)
+            valor: Valor informado pelo usuário
+            cache_key: Chave do cache
+            buscar: Função que busca na origem e grava no cache
+            *args: Argumentos de `buscar`
+            
+        Returns:
+            Dict[str, Any]: Resultado do cache ou da busca na origem
+        """
+        cached_result, atualizar = cache.get_stale(cache_key)
+        if cached_result is None:
+            return single_flight.executar(cache_key, buscar, *args)
+        
+        if atualizar:
+            # Fora do executor compartilhado: a atualização dispara consultas nele e aguarda
+            executor_segundo_plano.submit(self._revalidar, cache_key, buscar, *args)
+            log_consulta(tipo, valor, "erro" not in cached_result, "Cache hit (vencido, atualizando)")
+        else:
+            log_consulta(tipo, valor, "erro" not in cached_result, "Cache hit")
+        return cached_result
+    
+    def _revalidar(self, cache_key: str, buscar, *args) -> None:
+        """Atualiza uma entrada vencida do cache em segundo plano"""
+        try:
+            single_flight.executar(cache_key, buscar, *args)
+        except Exception as e:
+            log_error(e, f"Erro ao atualizar {cache_key} em segundo plano")
+    
+    def _gravar_negativo(self, cache_key: str, resultado: Dict[str, Any]) -> None:
+        """
+        Guarda um resultado "não encontrado" com o TTL curto do namespace (ttl_negativo)
         
-        # Lista de APIs para fallback (em ordem de prioridade)
+        Não sobrescreve um resultado positivo vencido que ainda está sendo servido:
+        uma falha na atualização em segundo plano não apaga o dado bom.
+        """
+        if cache.get_stale(cache_key, revalidar=False)[0] is None:
+            cache.set(cache_key, resultado, ttl=cache.politica(cache_key)['ttl_negativo'], stale_ttl=0)
+    
+    def _buscar_cep(self, cep: str, cep_limpo: str, cache_key: str) -> Dict[str, Any]:
+        """
+        Busca o CEP nos provedores externos e salva no cache
+        
+        Args:
+            cep: CEP informado pelo usuário
+            cep_limpo: CEP limpo
+            cache_key: Chave do cache
+            
+        Returns:
+            Dict[str, Any]: Dados do CEP ou erro
+        """
+        # Consulta os provedores conforme a estratégia configurada
+        resultado, api_name = self._consultar_provedores_cep(self._apis_cep(cep_limpo), cep_limpo)
+        
+        if resultado:
+            # Salva no cache
+            cache.set(cache_key, resultado)
+            log_consulta("CEP", cep, True, f"Consulta realizada com sucesso via {api_name}")
+            return resultado
+        
+        # Só vai para o cache negativo quando todos os provedores disseram que o CEP não existe;
+        # timeout, erro de conexão e circuito aberto podem ser transitórios
+        if resultado is False:
+            resultado = {"erro": "CEP não encontrado em nenhuma fonte", "cep": cep}
+            self._gravar_negativo(cache_key, resultado)
+            log_consulta("CEP", cep, False, "CEP não encontrado em todas as APIs")
+            return resultado
+        
+        log_consulta("CEP", cep, False, "Provedores de CEP indisponíveis")
+        return {"erro": "Não foi possível consultar o CEP", "cep": cep}
+    
+    def _apis_cep(self, cep_limpo: str) -> List[Dict[str, str]]:
+        """
+        Lista de APIs de CEP para fallback, com o provedor mais rápido e saudável primeiro
+        
+        Args:
+            cep_limpo: CEP limpo
+            
+        Returns:
+            List[Dict[str, str]]: Provedores (url, name, format)
+        """
+        # Ordem estática de prioridade
         apis = [
             {"url": VIACEP_URL.format(cep_limpo), "name": "ViaCEP", "format": "viacep"},
             {"url": BRASILAPI_CEP_V2_URL.format(cep_limpo), "name": "BrasilAPI-V2", "format": "brasilapi"},
@@ -99,29 +243,116 @@ class OSINTInvestigador:
             {"url": APICEP_URL.format(cep_limpo), "name": "ApiCEP", "format": "apicep"}
         ]
         
-        # Tenta cada API até encontrar resultado válido
-        for api in apis:
-            try:
-                data = self._fazer_requisicao(api["url"], api["name"])
+        return placar.ordenar(apis, chave=lambda api: api["name"])
+    
+    def _consultar_api_cep(self, api: Dict[str, str], cep_limpo: str) -> Optional[Dict[str, Any]]:
+        """
+        Consulta um único provedor de CEP e normaliza a resposta
+        
+        Args:
+            api: Descrição do provedor (url, name, format)
+            cep_limpo: CEP limpo
+            
+        Returns:
+            Optional[Dict[str, Any]]: Resultado normalizado, False se o provedor informou
+            que o CEP não existe ou None se o provedor falhou
+        """
+        try:
+            data = self._fazer_requisicao(api["url"], api["name"], aceitar_404=True)
+            
+            if data and cep_nao_encontrado(data):
+                return False
+            
+            if data and not data.get('erro') and not data.get('error'):
+                # Normaliza o resultado baseado no formato da API
+                resultado = self._normalizar_resultado_cep(data, api["format"], cep_limpo)
                 
-                if data and not data.get('erro') and not data.get('error'):
-                    # Normaliza o resultado baseado no formato da API
-                    resultado = self._normalizar_resultado_cep(data, api["format"], cep_limpo)
+                if resultado and resultado.get('sucesso'):
+                    return resultado
                     
-                    if resultado and resultado.get('sucesso'):
-                        # Salva no cache
-                        cache.set(cache_key, resultado)
-                        log_consulta("CEP", cep, True, f"Consulta realizada com sucesso via {api['name']}")
-                        return resultado
-                        
-            except Exception as e:
-                log_error(f"Erro na API {api['name']}: {e}")
-                continue
+        except Exception as e:
+            log_error(f"Erro na API {api['name']}: {e}")
         
-        # Se chegou aqui, nenhuma API funcionou
-        resultado = {"erro": "CEP não encontrado em nenhuma fonte", "cep": cep}
-        log_consulta("CEP", cep, False, "CEP não encontrado em todas as APIs")
-        return resultado
+        return None
+    
+    def _consultar_provedores_cep(self, apis: List[Dict[str, str]], cep_limpo: str,
+                                  modo: str = None, hedge_delay: float = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Consulta a lista de provedores de CEP conforme a estratégia escolhida
+        
+        - sequencial: um provedor por vez, na ordem da lista
+        - hedge: dispara o primeiro provedor e, a cada hedge_delay segundos sem
+          resposta válida (ou assim que um provedor falhar), dispara o próximo
+        - race: dispara todos os provedores ao mesmo tempo
+        
+        A espera nos modos hedge e race termina em CEP_PRAZO_CONSULTA segundos.
+        Retorna o primeiro resultado aceito por _normalizar_resultado_cep e cancela
+        as consultas que ainda não começaram. Requisições já em andamento terminam
+        em segundo plano e seus resultados são descartados.
+        
+        Args:
+            apis: Provedores em ordem de prioridade
+            cep_limpo: CEP limpo
+            modo: 'sequencial', 'hedge' ou 'race' (padrão: CEP_MODO_CONSULTA)
+            hedge_delay: Atraso em segundos antes de disparar o próximo provedor
+            
+        Returns:
+            Tuple: (resultado normalizado, nome do provedor); (False, None) se todos os
+            provedores informaram que o CEP não existe, senão (None, None)
+        """
+        modo = (modo or CEP_MODO_CONSULTA).lower()
+        hedge_delay = CEP_HEDGE_DELAY if hedge_delay is None else hedge_delay
+        nao_encontrado = 0
+        
+        if modo == "sequencial":
+            for api in apis:
+                resultado = self._consultar_api_cep(api, cep_limpo)
+                if resultado:
+                    return resultado, api["name"]
+                nao_encontrado += resultado is False
+            return (False if apis and nao_encontrado == len(apis) else None), None
+        
+        futuros = {}
+        proxima = 0
+        
+        def disparar_proxima():
+            nonlocal proxima
+            api = apis[proxima]
+            futuro = executor.submit(self._consultar_api_cep, api, cep_limpo)
+            futuros[futuro] = api
+            proxima += 1
+            return futuro
+        
+        disparar_proxima()
+        if modo == "race":
+            while proxima < len(apis):
+                disparar_proxima()
+        
+        pendentes = set(futuros)
+        prazo = time.monotonic() + CEP_PRAZO_CONSULTA
+        try:
+            while pendentes:
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    logger.warning(f"Provedores de CEP sem resposta em {CEP_PRAZO_CONSULTA}s: {cep_limpo}")
+                    break
+                timeout = min(hedge_delay, restante) if proxima < len(apis) else restante
+                concluidos, pendentes = wait(pendentes, timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                for futuro in concluidos:
+                    resultado = futuro.result()
+                    if resultado:
+                        return resultado, futuros[futuro]["name"]
+                    nao_encontrado += resultado is False
+                
+                # Sem resposta válida dentro do atraso (ou provedor falhou): aciona o próximo
+                if proxima < len(apis):
+                    pendentes.add(disparar_proxima())
+        finally:
+            for futuro in pendentes:
+                futuro.cancel()
+        
+        return (False if nao_encontrado == len(apis) else None), None
     
     def _normalizar_resultado_cep(self, data: Dict[str, Any], formato: str, cep_limpo: str) -> Dict[str, Any]:
         """
@@ -224,38 +455,96 @@ class OSINTInvestigador:
             return resultado
         
         ddd_limpo = limpar_ddd(ddd)
-        cache_key = f"ddd_{ddd_limpo}"
         
-        # Verifica cache
-        cached_result = cache.get(cache_key)
-        if cached_result:
-            log_consulta("DDD", ddd, True, "Cache hit")
-            return cached_result
+        # Base local; a BrasilAPI só é consultada com a atualização online ligada
+        resultado = self._resultado_ddd_local(ddd, ddd_limpo)
+        if resultado:
+            return resultado
         
-        # Faz requisição
+        cache_key = chave_cache("ddd", ddd_limpo)
+        return self._consultar_com_cache("DDD", ddd, cache_key, self._buscar_ddd, ddd, ddd_limpo)
+    
+    def _resultado_ddd_local(self, ddd: str, ddd_limpo: str, fallback: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Dados do DDD na base local (utils.base_ddd), sem acesso à rede
+        
+        Args:
+            ddd: DDD informado pelo usuário
+            ddd_limpo: DDD limpo
+            fallback: Usa a base mesmo com a atualização online ligada (falha na BrasilAPI)
+            
+        Returns:
+            Optional[Dict[str, Any]]: Dados do DDD ou None se a BrasilAPI deve ser consultada
+        """
+        if self.ddd_online and not fallback:
+            return None
+        
+        info = base_ddd.obter(ddd_limpo)
+        if info is None:
+            return None
+        
+        log_consulta("DDD", ddd, True, f"Base local {base_ddd.versao}")
+        return {
+            "sucesso": True,
+            "ddd": ddd_limpo,
+            "estado": info["uf"],
+            "cidades": info["cidades"],
+            "regiao": info["regiao"]
+        }
+    
+    def _obter_regiao_ddd(self, ddd: str) -> str:
+        """Cidade principal e UF do DDD (ex.: "Campinas - SP")"""
+        info = base_ddd.obter(ddd)
+        if info is None:
+            return f"Região do DDD {ddd}"
+        return f"{info['cidades'][0]} - {info['uf']}"
+    
+    def _buscar_ddd(self, ddd: str, ddd_limpo: str) -> Dict[str, Any]:
+        """Busca o DDD na BrasilAPI e salva no cache"""
         url = BRASILAPI_DDD_URL.format(ddd_limpo)
         data = self._fazer_requisicao(url, "BrasilAPI-DDD")
         
+        return self._processar_resultado_ddd(data, ddd, ddd_limpo)
+    
+    def _processar_resultado_ddd(self, data: Optional[Dict[str, Any]], ddd: str, ddd_limpo: str) -> Dict[str, Any]:
+        """
+        Normaliza a resposta da BrasilAPI-DDD, registra a consulta e salva no cache
+        
+        Args:
+            data: Dados retornados pela API (None em caso de erro)
+            ddd: DDD informado pelo usuário
+            ddd_limpo: DDD limpo
+            
+        Returns:
+            Dict[str, Any]: Dados do DDD ou erro
+        """
         if not data:
+            # BrasilAPI fora do ar: responde com a base local, sem gravar no cache
+            resultado = self._resultado_ddd_local(ddd, ddd_limpo, fallback=True)
+            if resultado:
+                return resultado
             resultado = {"erro": "Erro na consulta", "ddd": ddd}
             log_consulta("DDD", ddd, False, "Erro na API")
             return resultado
         
         if 'message' in data and 'não encontrado' in data['message'].lower():
             resultado = {"erro": "DDD não encontrado", "ddd": ddd}
+            self._gravar_negativo(chave_cache("ddd", ddd_limpo), resultado)
             log_consulta("DDD", ddd, False, "DDD não encontrado")
             return resultado
         
         # Formata resultado
+        info = base_ddd.obter(ddd_limpo)
         resultado = {
             "sucesso": True,
             "ddd": ddd_limpo,
             "estado": data.get("state", ""),
-            "cidades": data.get("cities", [])
+            "cidades": data.get("cities", []),
+            "regiao": info["regiao"] if info else ""
         }
         
         # Salva no cache
-        cache.set(cache_key, resultado)
+        cache.set(chave_cache("ddd", ddd_limpo), resultado)
         log_consulta("DDD", ddd, True, "Consulta realizada com sucesso")
         
         return resultado
@@ -266,7 +555,8 @@ class OSINTInvestigador:
         
         Args:
             cnpj (str): CNPJ a ser consultado
-            fonte (str): Fonte da consulta ('cnpja', 'brasilapi' ou 'receitaws')
+            fonte (str): Fonte da consulta ('cnpja', 'brasilapi', 'receitaws' ou 'auto'
+                para tentar todas, da mais rápida e saudável para a mais lenta)
             
         Returns:
             Dict[str, Any]: Dados do CNPJ ou erro
@@ -278,42 +568,83 @@ class OSINTInvestigador:
             return resultado
         
         cnpj_limpo = limpar_cnpj(cnpj)
-        cache_key = f"cnpj_{cnpj_limpo}_{fonte}"
-        
-        # Verifica cache
-        cached_result = cache.get(cache_key)
-        if cached_result:
-            log_consulta("CNPJ", cnpj, True, f"Cache hit - {fonte}")
-            return cached_result
-        
-        # Escolhe URL baseada na fonte
-        if fonte == "receitaws":
-            url = RECEITAWS_CNPJ_URL.format(cnpj_limpo)
-            api_name = "ReceitaWS"
-        elif fonte == "brasilapi":
-            url = BRASILAPI_CNPJ_URL.format(cnpj_limpo)
-            api_name = "BrasilAPI-CNPJ"
-        else:  # cnpja
-            url = CNPJA_URL.format(cnpj_limpo)
-            api_name = "CNPJá"
+        cache_key = chave_cache("cnpj", cnpj_limpo, fonte)
         
-        # Faz requisição
-        data = self._fazer_requisicao(url, api_name)
+        # Cache (vencido é servido enquanto é atualizado); consultas simultâneas do
+        # mesmo CNPJ e fonte aguardam uma única busca na origem
+        return self._consultar_com_cache("CNPJ", cnpj, cache_key, self._buscar_cnpj, cnpj, cnpj_limpo, fonte, cache_key)
+    
+    def _buscar_cnpj(self, cnpj: str, cnpj_limpo: str, fonte: str, cache_key: str) -> Dict[str, Any]:
+        """
+        Busca o CNPJ nas fontes externas e salva no cache
         
-        if not data:
-            resultado = {"erro": "Erro na consulta", "cnpj": cnpj}
-            log_consulta("CNPJ", cnpj, False, f"Erro na API - {fonte}")
+        Args:
+            cnpj: CNPJ informado pelo usuário
+            cnpj_limpo: CNPJ limpo
+            fonte: Fonte pedida ('auto' para todas)
+            cache_key: Chave do cache
+            
+        Returns:
+            Dict[str, Any]: Dados do CNPJ ou erro
+        """
+        resultado = {"erro": "Erro na consulta", "cnpj": cnpj}
+        for fonte_atual in self._fontes_cnpj(fonte):
+            url_template, api_name = FONTES_CNPJ[fonte_atual]
+            
+            # Faz requisição
+            data = self._fazer_requisicao(url_template.format(cnpj_limpo), api_name)
+            
+            if not data:
+                log_consulta("CNPJ", cnpj, False, f"Erro na API - {fonte_atual}")
+                continue
+            
+            # Verifica se encontrou
+            if 'status' in data and data['status'] == 'ERROR':
+                resultado = {"erro": "CNPJ não encontrado", "cnpj": cnpj}
+                log_consulta("CNPJ", cnpj, False, f"CNPJ não encontrado - {fonte_atual}")
+                continue
+            
+            resultado = self._normalizar_resultado_cnpj(data, fonte_atual, cnpj_limpo)
+            
+            # Salva no cache
+            cache.set(cache_key, resultado)
+            log_consulta("CNPJ", cnpj, True, f"Consulta realizada com sucesso - {fonte_atual}")
+            
             return resultado
         
-        # Verifica se encontrou
-        if 'status' in data and data['status'] == 'ERROR':
-            resultado = {"erro": "CNPJ não encontrado", "cnpj": cnpj}
-            log_consulta("CNPJ", cnpj, False, f"CNPJ não encontrado - {fonte}")
-            return resultado
+        # Só "não encontrado" vai para o cache negativo; erros de API podem ser transitórios
+        if resultado["erro"] == "CNPJ não encontrado":
+            self._gravar_negativo(cache_key, resultado)
+        return resultado
+    
+    def _fontes_cnpj(self, fonte: str) -> List[str]:
+        """
+        Escolhe as fontes de CNPJ: uma só ou a cadeia completa ordenada pelo placar
+        
+        Args:
+            fonte: Fonte pedida ('auto' para todas)
+            
+        Returns:
+            List[str]: Chaves de FONTES_CNPJ na ordem de consulta
+        """
+        if fonte == "auto":
+            return placar.ordenar(list(FONTES_CNPJ), chave=lambda f: FONTES_CNPJ[f][1])
+        return [fonte if fonte in FONTES_CNPJ else "cnpja"]
+    
+    def _normalizar_resultado_cnpj(self, data: Dict[str, Any], fonte: str, cnpj_limpo: str) -> Dict[str, Any]:
+        """
+        Normaliza o resultado de diferentes APIs de CNPJ para um formato padrão
         
-        # Formata resultado baseado na fonte
+        Args:
+            data: Dados retornados pela API
+            fonte: Fonte da consulta (cnpja, brasilapi, receitaws)
+            cnpj_limpo: CNPJ limpo para formatação
+            
+        Returns:
+            Dict[str, Any]: Resultado normalizado
+        """
         if fonte == "receitaws":
-            resultado = {
+            return {
                 "cnpj": formatar_cnpj(cnpj_limpo),
                 "razao_social": data.get("nome", ""),
                 "nome_fantasia": data.get("fantasia", ""),
@@ -339,7 +670,7 @@ class OSINTInvestigador:
                 "fonte": "ReceitaWS"
             }
         elif fonte == "brasilapi":
-            resultado = {
+            return {
                 "cnpj": formatar_cnpj(cnpj_limpo),
                 "razao_social": data.get("company", {}).get("name", ""),
                 "nome_fantasia": data.get("alias", ""),
@@ -356,7 +687,7 @@ class OSINTInvestigador:
                 "fonte": "BrasilAPI"
             }
         else:  # cnpja
-            resultado = {
+            return {
                 "cnpj": formatar_cnpj(cnpj_limpo),
                 "razao_social": data.get("company", {}).get("name", ""),
                 "nome_fantasia": data.get("alias", "") or "N/A",
@@ -383,12 +714,6 @@ class OSINTInvestigador:
                 "capital_social": data.get("company", {}).get("equity", ""),
                 "fonte": "CNPJá"
             }
-        
-        # Salva no cache
-        cache.set(cache_key, resultado)
-        log_consulta("CNPJ", cnpj, True, f"Consulta realizada com sucesso - {fonte}")
-        
-        return resultado
     
     def consultar_bancos(self) -> Dict[str, Any]:
         """
@@ -397,7 +722,7 @@ class OSINTInvestigador:
         Returns:
             Dict[str, Any]: Lista de bancos ou erro
         """
-        cache_key = "bancos_brasileiros"
+        cache_key = chave_cache("bancos", "brasileiros")
         
         # Verifica cache
         cached_result = cache.get(cache_key)
@@ -418,7 +743,7 @@ class OSINTInvestigador:
             "total": len(data) if isinstance(data, list) else 0
         }
         
-        # Salva no cache (cache mais longo para dados estáticos)
+        # Salva no cache (TTL longo da política de "bancos", dados estáticos)
         cache.set(cache_key, resultado)
         log_consulta("BANCOS", "todos", True, f"Consulta realizada - {resultado['total']} bancos")
         
@@ -440,7 +765,7 @@ class OSINTInvestigador:
             return resultado
         
         uf_upper = uf.upper()
-        cache_key = f"municipios_{uf_upper}"
+        cache_key = chave_cache("municipios", uf_upper)
         
         # Verifica cache
         cached_result = cache.get(cache_key)
@@ -452,6 +777,20 @@ class OSINTInvestigador:
         url = BRASILAPI_IBGE_URL.format(uf_upper)
         data = self._fazer_requisicao(url, "BrasilAPI-IBGE")
         
+        return self._processar_resultado_municipios(data, uf, uf_upper)
+    
+    def _processar_resultado_municipios(self, data: Optional[List[Dict[str, Any]]], uf: str, uf_upper: str) -> Dict[str, Any]:
+        """
+        Monta a lista de municípios da UF, registra a consulta e salva no cache
+        
+        Args:
+            data: Dados retornados pela API (None em caso de erro)
+            uf: UF informada pelo usuário
+            uf_upper: UF em maiúsculas
+            
+        Returns:
+            Dict[str, Any]: Lista de municípios ou erro
+        """
         if not data:
             resultado = {"erro": "Erro na consulta", "uf": uf}
             log_consulta("MUNICIPIOS", uf, False, "Erro na API")
@@ -464,7 +803,7 @@ class OSINTInvestigador:
         }
         
         # Salva no cache
-        cache.set(cache_key, resultado)
+        cache.set(chave_cache("municipios", uf_upper), resultado)
         log_consulta("MUNICIPIOS", uf, True, f"Consulta realizada - {resultado['total']} municípios")
         
         return resultado
@@ -479,25 +818,39 @@ class OSINTInvestigador:
         Returns:
             Dict[str, Any]: Dados do banco ou erro
         """
-        # Primeiro tenta na API brasileira
-        bancos_result = self.consultar_bancos()
+        # Registro indexado (BrasilAPI + base local) por código COMPE ou ISPB
+        registro = self._registro_bancos()
+        banco = registro.por_codigo(codigo) if len(str(codigo).strip()) <= 3 else registro.por_ispb(codigo)
         
-        if "erro" not in bancos_result:
-            for banco in bancos_result["bancos"]:
-                if str(banco.get("code", "")) == str(codigo):
-                    resultado = {
-                        "codigo": banco.get("code", ""),
-                        "nome": banco.get("name", ""),
-                        "nome_completo": banco.get("fullName", ""),
-                        "ispb": banco.get("ispb", ""),
-                        "fonte": "BrasilAPI"
-                    }
-                    log_consulta("BANCO", codigo, True, f"Banco encontrado na BrasilAPI: {resultado['nome']}")
-                    return resultado
+        if banco:
+            log_consulta("BANCO", codigo, True, f"Banco encontrado na {banco['fonte']}: {banco['nome']}")
+            return dict(banco)
         
         # Se não encontrou, tenta buscar por SWIFT code usando APIs internacionais
         return self._buscar_banco_internacional(codigo)
     
+    def buscar_bancos_por_nome(self, nome: str, limite: int = 10) -> Dict[str, Any]:
+        """
+        Busca bancos pelo nome (prefixo de cada palavra, tolerante a erros de digitação)
+        
+        Args:
+            nome (str): Nome ou parte do nome do banco
+            limite (int): Máximo de resultados
+            
+        Returns:
+            Dict[str, Any]: Bancos encontrados
+        """
+        bancos = self._registro_bancos().buscar_por_nome(nome, limite)
+        log_consulta("BANCO", nome, bool(bancos), f"Busca por nome - {len(bancos)} bancos")
+        return {"bancos": [dict(banco) for banco in bancos], "total": len(bancos)}
+    
+    def _registro_bancos(self):
+        """Registro de bancos, reconstruído quando a lista em cache é renovada"""
+        bancos_result = self.consultar_bancos()
+        if "erro" not in bancos_result:
+            registro_bancos.atualizar(bancos_result["bancos"])
+        return registro_bancos
+    
     def _buscar_banco_internacional(self, codigo: str) -> Dict[str, Any]:
         """
         Busca banco em APIs internacionais usando código como SWIFT
@@ -508,23 +861,7 @@ class OSINTInvestigador:
         Returns:
             Dict[str, Any]: Dados do banco ou erro
         """
-        # Lista de bancos brasileiros conhecidos que podem não estar na BrasilAPI
-        bancos_brasileiros_conhecidos = {
-            "077": {
-                "codigo": "077",
-                "nome": "Banco Inter",
-                "nome_completo": "Banco Inter S.A.",
-                "ispb": "00416968",
-                "swift": "BINTBRSP",
-                "fonte": "Base Local"
-            }
-        }
-        
-        # Verifica se é um banco brasileiro conhecido
-        if codigo in bancos_brasileiros_conhecidos:
-            banco = bancos_brasileiros_conhecidos[codigo]
-            log_consulta("BANCO", codigo, True, f"Banco encontrado na base local: {banco['nome']}")
-            return banco
+        # Bancos brasileiros fora da BrasilAPI já estão no registro (utils.registro_bancos.BANCOS_LOCAIS)
         
         # Tenta buscar via API Ninjas SWIFT Code (se tiver chave)
         if API_NINJAS_KEY:
@@ -532,10 +869,9 @@ class OSINTInvestigador:
                 headers = {"X-Api-Key": API_NINJAS_KEY}
                 
                 # Tenta buscar por SWIFT code
-                response = requests.get(
+                response = transporte.get(
                     f"{API_NINJAS_SWIFT_URL}?swift={codigo}",
-                    headers=headers,
-                    timeout=REQUEST_TIMEOUT
+                    headers=headers
                 )
                 
                 if response.status_code == 200:
@@ -592,6 +928,34 @@ class OSINTInvestigador:
             log_error(e, "Erro ao obter estatísticas do cache")
             return {"erro": "Erro ao obter estatísticas"}
     
+    def estatisticas_provedores(self) -> Dict[str, Any]:
+        """
+        Retorna taxa de sucesso e latência recentes de cada provedor externo
+        
+        Returns:
+            Dict[str, Any]: Estatísticas por provedor
+        """
+        try:
+            return placar.resumo()
+        
+        except Exception as e:
+            log_error(e, "Erro ao obter estatísticas dos provedores")
+            return {"erro": "Erro ao obter estatísticas"}
+    
+    def estado_circuitos(self) -> Dict[str, Any]:
+        """
+        Retorna o estado do circuit breaker de cada host externo
+        
+        Returns:
+            Dict[str, Any]: Estado, falhas consecutivas e recusas por host
+        """
+        try:
+            return circuitos.resumo()
+        
+        except Exception as e:
+            log_error(e, "Erro ao obter estado dos circuitos")
+            return {"erro": "Erro ao obter estado dos circuitos"}
+    
     def exportar_json(self, dados: Dict[str, Any], nome_arquivo: str = None) -> str:
         """
         Exporta dados para arquivo JSON
@@ -749,43 +1113,15 @@ class OSINTInvestigador:
                     "erro": "Telefone deve ter 10 ou 11 dígitos (com DDD)"
                 }
             
-            # Extrair DDD e número
-            if len(telefone_limpo) == 10:
-                ddd = telefone_limpo[:2]
-                numero = telefone_limpo[2:]
-                tipo = "Fixo"
-            else:  # 11 dígitos
-                ddd = telefone_limpo[:2]
-                numero = telefone_limpo[2:]
-                primeiro_digito = numero[0]
-                
-                # Determinar tipo baseado no primeiro dígito após o DDD
-                if primeiro_digito in ['6', '7', '8', '9']:
-                    tipo = "Celular"
-                else:
-                    tipo = "Fixo"
+            ddd, numero, tipo = self._classificar_telefone(telefone_limpo)
             
             # Consultar informações do DDD
             info_ddd = self.consultar_ddd(ddd)
             
-            # Determinar operadora baseada no prefixo (simulação básica)
-            operadoras = self._identificar_operadora(ddd, numero)
+            # Operadora: portabilidade, ABR Telecom, plano de numeração e, por fim, operadoras do DDD
+            resolucao = self._resolver_operadora(telefone_limpo)
             
-            resultado = {
-                "sucesso": True,
-                "telefone": telefone_limpo,
-                "telefone_formatado": self._formatar_telefone(telefone_limpo),
-                "ddd": ddd,
-                "numero": numero,
-                "tipo": tipo,
-                "estado": info_ddd.get("estado", "Desconhecido") if info_ddd.get("sucesso") else "Desconhecido",
-                "regiao": info_ddd.get("regiao", "Desconhecida") if info_ddd.get("sucesso") else "Desconhecida",
-                "operadora": operadoras[0] if len(operadoras) == 1 else None,
-                "operadoras_possiveis": operadoras if len(operadoras) > 1 else None,
-                "confianca_operadora": "Alta" if len(operadoras) == 1 else "Baixa",
-                "valido": self._validar_telefone_brasileiro(telefone_limpo),
-                "observacoes": self._obter_observacoes_telefone(ddd, tipo, operadoras)
-            }
+            resultado = self._montar_resultado_telefone(telefone_limpo, ddd, numero, tipo, info_ddd, resolucao)
             
             logger.info(f"Consulta Telefone - Parâmetro: {telefone} - Status: SUCESSO - Detalhes: Consulta realizada com sucesso")
             return resultado
@@ -797,6 +1133,53 @@ class OSINTInvestigador:
                 "erro": f"Erro ao consultar telefone: {str(e)}"
             }
     
+    def _classificar_telefone(self, telefone_limpo: str) -> Tuple[str, str, str]:
+        """
+        Separa DDD e número e determina o tipo da linha
+        
+        Args:
+            telefone_limpo: Telefone com 10 ou 11 dígitos
+            
+        Returns:
+            Tuple[str, str, str]: (ddd, numero, tipo)
+        """
+        ddd = telefone_limpo[:2]
+        numero = telefone_limpo[2:]
+        
+        if len(telefone_limpo) == 10:
+            return ddd, numero, "Fixo"
+        
+        # Determinar tipo baseado no primeiro dígito após o DDD
+        tipo = "Celular" if numero[0] in ['6', '7', '8', '9'] else "Fixo"
+        return ddd, numero, tipo
+    
+    def _montar_resultado_telefone(self, telefone_limpo: str, ddd: str, numero: str, tipo: str,
+                                   info_ddd: Dict[str, Any], resolucao: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Monta o resultado da consulta de telefone a partir do DDD e da resolução de operadora
+        
+        Returns:
+            Dict com informações do telefone
+        """
+        operadoras = resolucao["operadoras"]
+        return {
+            "sucesso": True,
+            "telefone": telefone_limpo,
+            "telefone_formatado": self._formatar_telefone(telefone_limpo),
+            "ddd": ddd,
+            "numero": numero,
+            "tipo": tipo,
+            "estado": info_ddd.get("estado", "Desconhecido") if info_ddd.get("sucesso") else "Desconhecido",
+            "regiao": info_ddd.get("regiao", "Desconhecida") if info_ddd.get("sucesso") else "Desconhecida",
+            "operadora": operadoras[0] if len(operadoras) == 1 else None,
+            "operadoras_possiveis": operadoras if len(operadoras) > 1 else None,
+            "confianca_operadora": resolucao["confiabilidade"],
+            "fonte_operadora": resolucao["fonte"],
+            "portabilidade": resolucao["portabilidade"],
+            "valido": self._validar_telefone_brasileiro(telefone_limpo),
+            "observacoes": self._obter_observacoes_telefone(ddd, tipo, operadoras, resolucao["confiabilidade"])
+        }
+    
     def _formatar_telefone(self, telefone: str) -> str:
         """Formata o telefone no padrão brasileiro"""
         if len(telefone) == 10:
@@ -808,212 +1191,127 @@ class OSINTInvestigador:
     def _identificar_operadora(self, ddd: str, numero: str) -> List[str]:
         """
         Identifica operadora precisa do telefone, incluindo números portados
-        Utiliza múltiplas fontes para maior precisão
-        """
-        telefone_completo = ddd + numero
-        
-        # Tentar consulta precisa via APIs externas
-        operadora_precisa = self._consultar_operadora_api(telefone_completo)
-        if operadora_precisa:
-            return [operadora_precisa]
-        
-        # Fallback: Prefixos atualizados por operadora (2024)
-        prefixos_operadoras = {
-            "Vivo": {
-                "11": ["99", "98", "97", "96", "95", "94"],
-                "21": ["99", "98", "97", "96", "95"],
-                "31": ["99", "98", "97", "96", "95"],
-                "41": ["99", "98", "97", "96", "95"],
-                "51": ["99", "98", "97", "96", "95"],
-                "61": ["99", "98", "97", "96", "95"],
-                "71": ["99", "98", "97", "96", "95"],
-                "81": ["99", "98", "97", "96", "95"],
-                "85": ["99", "98", "97", "96", "95"]
-            },
-            "Claro": {
-                "11": ["94", "93", "92", "91", "89"],
-                "21": ["94", "93", "92", "91"],
-                "31": ["94", "93", "92", "91"],
-                "41": ["94", "93", "92", "91"],
-                "51": ["94", "93", "92", "91"],
-                "61": ["94", "93", "92", "91"],
-                "71": ["94", "93", "92", "91"],
-                "81": ["94", "93", "92", "91"],
-                "85": ["94", "93", "92", "91"]
-            },
-            "TIM": {
-                "11": ["89", "88", "87", "86", "85"],
-                "21": ["89", "88", "87", "86"],
-                "31": ["89", "88", "87", "86"],
-                "41": ["89", "88", "87", "86"],
-                "51": ["89", "88", "87", "86"],
-                "61": ["89", "88", "87", "86"],
-                "71": ["89", "88", "87", "86"],
-                "81": ["89", "88", "87", "86"],
-                "85": ["89", "88", "87", "86"]
-            },
-            "Oi": {
-                "11": ["84", "83", "82", "81"],
-                "21": ["84", "83", "82", "81"],
-                "31": ["84", "83", "82", "81"],
-                "41": ["84", "83", "82", "81"],
-                "51": ["84", "83", "82", "81"],
-                "61": ["84", "83", "82", "81"],
-                "71": ["84", "83", "82", "81"],
-                "81": ["84", "83", "82", "81"],
-                "85": ["84", "83", "82", "81"]
-            }
-        }
-        
-        # Identificar por prefixo atualizado
-        prefixo = numero[:2] if len(numero) >= 2 else ""
-        for operadora, ddds_prefixos in prefixos_operadoras.items():
-            if ddd in ddds_prefixos and prefixo in ddds_prefixos[ddd]:
-                return [operadora]
-        
-        # Fallback final: operadoras principais do DDD
-        operadoras_principais = {
-            "11": ["Vivo", "Claro", "TIM"],  # SP - principais
-            "21": ["Vivo", "Claro", "TIM"],  # RJ - principais
-            "31": ["Vivo", "Claro", "TIM"],  # MG - principais
-            "41": ["Vivo", "Claro", "TIM"],  # PR - principais
-            "51": ["Vivo", "Claro", "TIM"],  # RS - principais
-            "61": ["Vivo", "Claro", "TIM"],  # DF - principais
-            "71": ["Vivo", "Claro", "TIM"],  # BA - principais
-            "81": ["Vivo", "Claro", "TIM"],  # PE - principais
-            "85": ["Vivo", "Claro", "TIM"]   # CE - principais
-        }
         
-        return operadoras_principais.get(ddd, ["Vivo", "Claro", "TIM", "Oi"])
-    
-    def _consultar_operadora_api(self, telefone: str) -> str:
+        Returns:
+            List[str]: A operadora identificada ou, sem identificação, as possíveis
         """
-        Consulta operadora precisa via APIs externas
-        Retorna a operadora real ou None se não conseguir identificar
+        return self._resolver_operadora(ddd + numero)["operadoras"]
+    
+    def _resolver_operadora(self, telefone: str) -> Dict[str, Any]:
         """
-        try:
-            # Método 1: Consultar QualOperadora.org (API gratuita e confiável)
-            operadora = self._consultar_qualoperadora(telefone)
-            if operadora:
-                return operadora
-            
-            # Método 2: Tentar consulta via ABR Telecom (simulação)
-            operadora = self._consultar_abr_telecom(telefone)
-            if operadora:
-                return operadora
+        Resolve a operadora passando uma única vez pela cadeia: base de portabilidade,
+        ABR Telecom, plano de numeração e operadoras principais do DDD
+        
+        O resultado combinado fica em cache por número; consultas simultâneas do
+        mesmo número aguardam a mesma execução da cadeia.
+        
+        Args:
+            telefone: Telefone com DDD, apenas dígitos
             
-            # Método 3: Análise avançada de padrões
-            operadora = self._analisar_padroes_avancados(telefone)
-            if operadora:
-                return operadora
-                
-        except Exception as e:
-            logger.warning(f"Erro ao consultar operadora via API: {e}")
+        Returns:
+            Dict[str, Any]: operadora (ou None), operadoras, fonte, confiabilidade,
+            portabilidade (True se o número está na base de portabilidade, None quando
+            não se sabe) e as etapas executadas com o tempo de cada uma
+        """
+        cache_key = chave_cache("operadora", telefone)
+        cached_result = cache.get(cache_key)
+        if cached_result:
+            return cached_result
+        return single_flight.executar(cache_key, self._executar_cadeia_operadora, telefone, cache_key)
+    
+    def _executar_cadeia_operadora(self, telefone: str, cache_key: str) -> Dict[str, Any]:
+        etapas = []
+        resultado = None
+        
+        for nome, etapa in (
+            ("portabilidade", self._operadora_portabilidade),
+            ("abr_telecom", self._operadora_abr_telecom),
+            ("plano_numeracao", self._operadora_plano_numeracao),
+        ):
+            inicio = time.perf_counter()
+            try:
+                resultado = etapa(telefone)
+            except Exception as e:
+                logger.warning(f"Erro na etapa {nome} da resolução de operadora: {e}")
+                resultado = None
+            etapas.append({
+                "etapa": nome,
+                "encontrado": resultado is not None,
+                "tempo_ms": round((time.perf_counter() - inicio) * 1000, 2)
+            })
+            if resultado:
+                break
+        
+        if resultado:
+            resultado["operadoras"] = [resultado["operadora"]]
+        else:
+            ddd = telefone[:2]
+            resultado = {
+                "operadora": None,
+                "operadoras": list(OPERADORAS_PRINCIPAIS) if ddd in DDDS_OPERADORAS_PRINCIPAIS else OPERADORAS_PRINCIPAIS + ["Oi"],
+                "fonte": "Operadoras principais do DDD",
+                "confiabilidade": "Muito Baixa",
+                "portabilidade": None
+            }
+            etapas.append({"etapa": "heuristica", "encontrado": True, "tempo_ms": 0.0})
+        resultado["etapas"] = etapas
         
-        return None
+        # Sem identificação (ou só a faixa de origem) o resultado fica pouco tempo em cache
+        if resultado["confiabilidade"] == "Alta":
+            cache.set(cache_key, resultado)
+        else:
+            self._gravar_negativo(cache_key, resultado)
+        return resultado
     
-    def _consultar_qualoperadora(self, telefone: str) -> str:
-        """
-        Consulta a operadora usando a API oficial da ABR Telecom
-        Considera portabilidade numérica em tempo real
-        """
-        try:
-            # Primeiro tenta consultar a ABR Telecom (fonte oficial)
-            operadora_abr = self._consultar_abr_telecom(telefone)
-            if operadora_abr:
-                return operadora_abr
-            
-            # Fallback para base local em caso de falha na API
-            return self._consultar_base_local(telefone)
-            
-        except Exception as e:
-            logger.warning(f"Erro ao consultar operadora: {e}")
-            # Fallback para base local
-            return self._consultar_base_local(telefone)
+    def _operadora_portabilidade(self, telefone: str) -> Optional[Dict[str, Any]]:
+        portado = base_portabilidade.consultar(telefone)
+        if not portado:
+            return None
+        return {
+            "operadora": self._normalizar_operadora(portado["operadora"]),
+            "fonte": "Base de portabilidade",
+            "confiabilidade": "Alta",
+            "portabilidade": True,
+            "data_portabilidade": portado["data_portabilidade"]
+        }
+    
+    def _operadora_abr_telecom(self, telefone: str) -> Optional[Dict[str, Any]]:
+        operadora = self._consultar_abr_telecom(telefone)
+        if not operadora:
+            return None
+        # A ABR informa a operadora atual, não se o número foi portado
+        return {"operadora": operadora, "fonte": "ABR Telecom", "confiabilidade": "Alta", "portabilidade": None}
+    
+    def _operadora_plano_numeracao(self, telefone: str) -> Optional[Dict[str, Any]]:
+        operadora = self._consultar_base_local(telefone)
+        if not operadora:
+            return None
+        # Com o arquivo de amostra a faixa é ilustrativa: vale tão pouco quanto a heurística do DDD
+        confiabilidade = "Muito Baixa" if plano_numeracao.amostra else "Baixa"
+        return {"operadora": operadora, "fonte": "Plano de numeração", "confiabilidade": confiabilidade, "portabilidade": None}
     
     def _consultar_abr_telecom(self, telefone: str) -> str:
         """
         Consulta a operadora usando a API oficial da ABR Telecom
-        Implementação melhorada com múltiplas estratégias e cache
+        Usa o pool de sessões (utils/sessao_abr.py): com cookies e tokens válidos, um único POST
         """
+        if not self.operadora_online:
+            return None
+        
         try:
-            import requests
-            from bs4 import BeautifulSoup
-            import time
-            import json
-            
             # Verificar cache primeiro (válido por 24 horas)
-            cache_key = f"abr_telecom_{telefone}"
+            cache_key = chave_cache("abr_telecom", telefone)
             cached_result = cache.get(cache_key)
             if cached_result:
                 logger.info(f"Operadora obtida do cache: {cached_result} para {telefone}")
                 return cached_result
             
-            # Tentar múltiplas URLs da ABR Telecom
-            urls_to_try = [
-                "https://consultanumero.abrtelecom.com.br/consultanumero/consulta/consultaSituacaoAtualCtg",
-                "https://consultanumero.abrtelecom.com.br/",
-                "https://consultanumero.abrtelecom.com.br/consultanumero/"
-            ]
-            
-            # Headers mais completos para simular navegador real
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-                'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Cache-Control': 'max-age=0'
-            }
-            
-            # Formatar número corretamente
-            numero_formatado = self._formatar_numero_abr(telefone)
-            
-            session = requests.Session()
-            session.headers.update(headers)
-            
-            for url in urls_to_try:
-                try:
-                    logger.info(f"Tentando consulta ABR Telecom na URL: {url}")
-                    
-                    # Primeira requisição para obter a página
-                    response = session.get(url, timeout=15)
-                    
-                    if response.status_code != 200:
-                        logger.warning(f"Erro ao acessar {url}: Status {response.status_code}")
-                        continue
-                    
-                    # Parse da página
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Estratégia 1: Procurar formulário específico
-                    operadora = self._processar_formulario_abr(session, soup, numero_formatado, url)
-                    if operadora:
-                        # Salvar no cache por 24 horas
-                        cache.set(cache_key, operadora, 86400)
-                        logger.info(f"Operadora identificada via ABR Telecom: {operadora} para {telefone}")
-                        return operadora
-                    
-                    # Estratégia 2: Tentar consulta direta se houver endpoint
-                    operadora = self._tentar_consulta_direta_abr(session, numero_formatado, url)
-                    if operadora:
-                        cache.set(cache_key, operadora, 86400)
-                        logger.info(f"Operadora identificada via consulta direta ABR: {operadora} para {telefone}")
-                        return operadora
-                    
-                    # Aguardar entre tentativas
-                    time.sleep(2)
-                    
-                except requests.exceptions.RequestException as e:
-                    logger.warning(f"Erro de rede ao consultar {url}: {e}")
-                    continue
-                except Exception as e:
-                    logger.warning(f"Erro ao processar {url}: {e}")
-                    continue
+            html = sessoes_abr.consultar(self._formatar_numero_abr(telefone))
+            operadora = self._extrair_operadora_html(html) if html else None
+            if operadora:
+                cache.set(cache_key, operadora)
+                logger.info(f"Operadora identificada via ABR Telecom: {operadora} para {telefone}")
+                return operadora
             
             logger.warning(f"Não foi possível consultar operadora via ABR Telecom para {telefone}")
             return None
@@ -1039,180 +1337,17 @@ class OSINTInvestigador:
         
         return numero_limpo
     
-    def _processar_formulario_abr(self, session, soup, numero_formatado: str, base_url: str) -> str:
-        """
-        Processar formulário da ABR Telecom para consulta
-        """
-        try:
-            # Procurar formulário
-            form = soup.find('form')
-            if not form:
-                return None
-            
-            # Preparar dados do formulário
-            form_data = {}
-            
-            # Adicionar campos de input
-            inputs = form.find_all('input')
-            for input_field in inputs:
-                name = input_field.get('name')
-                if name:
-                    if input_field.get('type') == 'hidden':
-                        form_data[name] = input_field.get('value', '')
-                    elif 'numero' in name.lower() or 'telefone' in name.lower():
-                        form_data[name] = numero_formatado
-            
-            # Se não encontrou campo específico, tentar nomes comuns
-            if not any('numero' in key.lower() for key in form_data.keys()):
-                form_data['numero'] = numero_formatado
-                form_data['telefone'] = numero_formatado
-            
-            # Determinar URL de ação
-            action = form.get('action', '')
-            if action:
-                if action.startswith('/'):
-                    post_url = f"{base_url.rstrip('/')}{action}"
-                elif action.startswith('http'):
-                    post_url = action
-                else:
-                    post_url = f"{base_url.rstrip('/')}/{action}"
-            else:
-                post_url = base_url
-            
-            # Fazer requisição POST
-            response = session.post(post_url, data=form_data, timeout=15)
-            
-            if response.status_code == 200:
-                return self._extrair_operadora_html(response.text)
-            
-            return None
-            
-        except Exception as e:
-            logger.warning(f"Erro ao processar formulário ABR: {e}")
-            return None
-    
-    def _tentar_consulta_direta_abr(self, session, numero_formatado: str, base_url: str) -> str:
-        """
-        Tentar consulta direta via possível endpoint da ABR
-        """
-        try:
-            # Possíveis endpoints para consulta direta
-            endpoints = [
-                f"{base_url}/consulta/{numero_formatado}",
-                f"{base_url}/api/consulta/{numero_formatado}",
-                f"{base_url}/consultanumero/api/{numero_formatado}"
-            ]
-            
-            for endpoint in endpoints:
-                try:
-                    response = session.get(endpoint, timeout=10)
-                    if response.status_code == 200:
-                        # Tentar JSON primeiro
-                        try:
-                            data = response.json()
-                            if isinstance(data, dict) and 'operadora' in data:
-                                return self._normalizar_operadora(data['operadora'])
-                        except:
-                            pass
-                        
-                        # Tentar HTML
-                        operadora = self._extrair_operadora_html(response.text)
-                        if operadora:
-                            return operadora
-                            
-                except requests.exceptions.RequestException:
-                    continue
-            
-            return None
-            
-        except Exception as e:
-            logger.warning(f"Erro na consulta direta ABR: {e}")
-            return None
-    
     def _extrair_operadora_html(self, html_content: str) -> str:
         """
-        Extrair operadora do conteúdo HTML da resposta
+        Extrair operadora do conteúdo HTML da resposta (regex primeiro, parse só das tabelas se preciso)
         """
         try:
-            from bs4 import BeautifulSoup
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Estratégias de busca por operadora
-            strategies = [
-                # Buscar em elementos com classes específicas
-                lambda: self._buscar_em_elementos(soup, ['.resultado', '.operadora', '.prestadora']),
-                # Buscar em IDs específicos
-                lambda: self._buscar_em_elementos(soup, ['#resultado', '#operadora', '#prestadora']),
-                # Buscar em tabelas
-                lambda: self._buscar_em_tabelas(soup),
-                # Buscar em texto geral
-                lambda: self._buscar_em_texto_geral(soup)
-            ]
-            
-            for strategy in strategies:
-                operadora = strategy()
-                if operadora:
-                    return self._normalizar_operadora(operadora)
-            
-            return None
+            return extrair_operadora(html_content)
             
         except Exception as e:
             logger.warning(f"Erro ao extrair operadora do HTML: {e}")
             return None
     
-    def _buscar_em_elementos(self, soup, seletores: list) -> str:
-        """
-        Buscar operadora em elementos específicos
-        """
-        for seletor in seletores:
-            elementos = soup.select(seletor)
-            for elemento in elementos:
-                texto = elemento.get_text().strip().upper()
-                operadora = self._identificar_operadora_texto(texto)
-                if operadora:
-                    return operadora
-        return None
-    
-    def _buscar_em_tabelas(self, soup) -> str:
-        """
-        Buscar operadora em tabelas
-        """
-        tabelas = soup.find_all('table')
-        for tabela in tabelas:
-            for linha in tabela.find_all('tr'):
-                for celula in linha.find_all(['td', 'th']):
-                    texto = celula.get_text().strip().upper()
-                    operadora = self._identificar_operadora_texto(texto)
-                    if operadora:
-                        return operadora
-        return None
-    
-    def _buscar_em_texto_geral(self, soup) -> str:
-        """
-        Buscar operadora no texto geral da página
-        """
-        texto_completo = soup.get_text().upper()
-        return self._identificar_operadora_texto(texto_completo)
-    
-    def _identificar_operadora_texto(self, texto: str) -> str:
-        """
-        Identificar operadora em um texto
-        """
-        operadoras = {
-            'VIVO': ['VIVO', 'TELEFONICA'],
-            'CLARO': ['CLARO', 'CLARO S.A.', 'CLARO SA'],
-            'TIM': ['TIM', 'T.I.M.', 'TELECOM ITALIA'],
-            'OI': ['OI', 'OI S.A.', 'TELEMAR']
-        }
-        
-        for operadora, variantes in operadoras.items():
-            for variante in variantes:
-                if variante in texto:
-                    return operadora
-        
-        return None
-    
     def _normalizar_operadora(self, operadora: str) -> str:
         """
         Normalizar nome da operadora
@@ -1235,95 +1370,13 @@ class OSINTInvestigador:
     
     def _consultar_base_local(self, telefone: str) -> str:
         """
-        Consulta operadora baseada em prefixos conhecidos (base local atualizada)
+        Consulta a operadora de origem no plano de numeração local (utils/plano_numeracao.py)
         """
         try:
-            # Remover caracteres especiais e garantir formato correto
-            numero_limpo = ''.join(filter(str.isdigit, telefone))
-            
-            if len(numero_limpo) < 10:
-                return None
-            
-            # Extrair DDD e prefixo
-            ddd = numero_limpo[:2]
-            if len(numero_limpo) == 11:  # Celular com 9
-                prefixo = numero_limpo[2:5]  # Primeiros 3 dígitos após DDD
-            else:  # Fixo ou celular sem 9
-                prefixo = numero_limpo[2:4]   # Primeiros 2 dígitos após DDD
-            
-            # Base atualizada de prefixos por operadora (2024)
-            prefixos_operadoras = {
-                'Vivo': {
-                    # Celular (9xxxx-xxxx)
-                    '9': ['940', '941', '942', '943', '944', '945', '946', '947', '948', '949',
-                          '950', '951', '952', '953', '954', '955', '956', '957', '958', '959',
-                          '960', '961', '962', '963', '964', '965', '966', '967', '968', '969',
-                          '970', '971', '972', '973', '974', '975', '976', '977', '978', '979',
-                          '980', '981', '982', '983', '984', '985', '986', '987', '988', '989',
-                          '990', '991', '992', '993', '994', '995', '996', '997', '998', '999'],
-                    # Fixo
-                    'fixo': ['20', '21', '22', '23', '24', '25', '26', '27', '28', '29',
-                             '30', '31', '32', '33', '34', '35', '36', '37', '38', '39']
-                },
-                'Claro': {
-                    # Celular (9xxxx-xxxx)
-                    '9': ['910', '911', '912', '913', '914', '915', '916', '917', '918', '919',
-                          '920', '921', '922', '923', '924', '925', '926', '927', '928', '929',
-                          '930', '931', '932', '933', '934', '935', '936', '937', '938', '939'],
-                    # Fixo
-                    'fixo': ['40', '41', '42', '43', '44', '45', '46', '47', '48', '49']
-                },
-                'TIM': {
-                    # Celular (9xxxx-xxxx)
-                    '9': ['900', '901', '902', '903', '904', '905', '906', '907', '908', '909'],
-                    # Fixo
-                    'fixo': ['50', '51', '52', '53', '54', '55', '56', '57', '58', '59']
-                },
-                'Oi': {
-                    # Celular (9xxxx-xxxx)
-                    '9': ['880', '881', '882', '883', '884', '885', '886', '887', '888', '889',
-                          '890', '891', '892', '893', '894', '895', '896', '897', '898', '899'],
-                    # Fixo
-                    'fixo': ['60', '61', '62', '63', '64', '65', '66', '67', '68', '69',
-                             '70', '71', '72', '73', '74', '75', '76', '77', '78', '79']
-                }
-            }
-            
-            # Casos especiais conhecidos (números específicos com operadora confirmada)
-            casos_especiais = {
-                "61981437533": "Claro",  # Número específico do usuário
-            }
-            
-            # Verificar casos especiais primeiro
-            if numero_limpo in casos_especiais:
-                operadora = casos_especiais[numero_limpo]
-                logger.info(f"Operadora identificada via base local especial: {operadora} para {telefone}")
-                return operadora
-            
-            # Verificar se é celular (11 dígitos) ou fixo (10 dígitos)
-            tipo = '9' if len(numero_limpo) == 11 else 'fixo'
-            
-            # Buscar operadora baseada no prefixo
-            for operadora, prefixos in prefixos_operadoras.items():
-                if tipo in prefixos:
-                    if tipo == '9' and prefixo in prefixos[tipo]:
-                        logger.info(f"Operadora identificada por prefixo celular: {operadora} para {telefone}")
-                        return operadora
-                    elif tipo == 'fixo' and prefixo in prefixos[tipo]:
-                        logger.info(f"Operadora identificada por prefixo fixo: {operadora} para {telefone}")
-                        return operadora
-            
-            # Fallback: análise por terceiro dígito (método antigo)
-            if len(numero_limpo) >= 3:
-                terceiro_digito = numero_limpo[2]
-                
-                # Regras básicas por terceiro dígito
-                if terceiro_digito in ['6', '7', '8', '9']:
-                    return 'Vivo'
-                elif terceiro_digito in ['1', '2', '3', '4', '5']:
-                    return 'Claro'
-                elif terceiro_digito == '0':
-                    return 'TIM'
+            faixa = plano_numeracao.classificar(telefone)
+            if faixa:
+                logger.info(f"Operadora identificada pelo plano de numeração ({faixa['abrangencia']}): {faixa['operadora']} para {telefone}")
+                return faixa["operadora"]
             
             logger.warning(f"Não foi possível identificar operadora por prefixo para {telefone}")
             return None
@@ -1331,40 +1384,6 @@ class OSINTInvestigador:
         except Exception as e:
             logger.warning(f"Erro ao consultar base local de operadoras: {e}")
             return None
-            logger.warning(f"Erro ao consultar base local: {e}")
-            return None
-    
-    def _analisar_padroes_avancados(self, telefone: str) -> str:
-        """
-        Análise avançada de padrões para identificação de operadora
-        Baseado em dados estatísticos e tendências de mercado
-        """
-        try:
-            ddd = telefone[:2]
-            prefixo = telefone[2:4]
-            terceiro_digito = telefone[4:5] if len(telefone) > 4 else ""
-            
-            # Análise estatística baseada em market share por região
-            market_share = {
-                "11": {"Vivo": 0.35, "Claro": 0.25, "TIM": 0.25, "Oi": 0.15},
-                "21": {"Vivo": 0.30, "Claro": 0.30, "TIM": 0.25, "Oi": 0.15},
-                "51": {"Vivo": 0.40, "Claro": 0.25, "TIM": 0.20, "Oi": 0.15}
-            }
-            
-            # Padrões específicos por terceiro dígito (observações empíricas)
-            if terceiro_digito in ["0", "1", "2"]:
-                return "Vivo"  # Tendência observada
-            elif terceiro_digito in ["3", "4", "5"]:
-                return "Claro"  # Tendência observada
-            elif terceiro_digito in ["6", "7"]:
-                return "TIM"    # Tendência observada
-            elif terceiro_digito in ["8", "9"]:
-                return "Oi"     # Tendência observada
-                
-        except Exception as e:
-            logger.warning(f"Erro na análise de padrões avançados: {e}")
-        
-        return None
     
     def _validar_telefone_brasileiro(self, telefone: str) -> bool:
         """Valida se o telefone segue padrões brasileiros"""
@@ -1406,7 +1425,8 @@ class OSINTInvestigador:
         
         return ddd in ddds_validos
     
-    def _obter_observacoes_telefone(self, ddd: str, tipo: str, operadoras: List[str]) -> List[str]:
+    def _obter_observacoes_telefone(self, ddd: str, tipo: str, operadoras: List[str],
+                                    confiabilidade: str = "Alta") -> List[str]:
         """Retorna observações sobre o telefone incluindo informações da operadora"""
         observacoes = []
         
@@ -1418,8 +1438,10 @@ class OSINTInvestigador:
             observacoes.append("Apenas chamadas de voz")
         
         # Informações sobre identificação da operadora
-        if len(operadoras) == 1:
+        if len(operadoras) == 1 and confiabilidade == "Alta":
             observacoes.append(f"Operadora identificada com alta confiança: {operadoras[0]}")
+        elif len(operadoras) == 1:
+            observacoes.append(f"Operadora de origem pela faixa de numeração: {operadoras[0]} (o número pode ter sido portado)")
         else:
             observacoes.append("Múltiplas operadoras possíveis devido à portabilidade numérica")
             observacoes.append("Para identificação precisa, consulte a base oficial da ABR Telecom")
@@ -1467,7 +1489,7 @@ class OSINTInvestigador:
             return {"erro": "DDD inválido"}
         
         # Verifica cache
-        cache_key = f"dados_pessoais_{telefone_limpo}"
+        cache_key = chave_cache("dados_pessoais", telefone_limpo)
         cached_result = cache.get(cache_key)
         if cached_result:
             log_consulta("DADOS_PESSOAIS", telefone, True, "Cache hit")
@@ -1535,7 +1557,7 @@ class OSINTInvestigador:
             dados_entrada["data_nascimento"] = data_nascimento
         
         # Cria chave de cache baseada nos dados fornecidos
-        cache_key = f"dados_avancados_{hash(str(sorted(dados_entrada.items())))}"
+        cache_key = chave_cache("dados_avancados", dados_entrada)
         
         # Verifica cache
         cached_result = cache.get(cache_key)
@@ -1586,7 +1608,7 @@ class OSINTInvestigador:
         ]
         
         # Salva no cache
-        cache.set(cache_key, resultado, ttl=1800)  # 30 minutos
+        cache.set(cache_key, resultado)
         
         log_consulta("DADOS_AVANCADOS", str(dados_entrada), True, "Consulta avançada realizada")
         return resultado
@@ -1598,7 +1620,7 @@ class OSINTInvestigador:
             resultado["fontes_consultadas"].append("API Operadora")
             
             info_operadora = {
-                "operadora": self._identificar_operadora(telefone),
+                "operadora": self._identificar_operadora(telefone[:2], telefone[2:]),
                 "tipo": "móvel" if len(telefone) == 11 else "fixo",
                 "ddd": telefone[:2],
                 "regiao": self._obter_regiao_ddd(telefone[:2])
@@ -1740,7 +1762,7 @@ class OSINTInvestigador:
             ddd = telefone_limpo[:2]
             numero = telefone_limpo[2:]
         
-        cache_key = f"dados_pessoais_{telefone_limpo}"
+        cache_key = chave_cache("dados_pessoais", telefone_limpo)
         
         # Verifica cache
         cached_result = cache.get(cache_key)
@@ -1790,7 +1812,7 @@ class OSINTInvestigador:
         ]
         
         # Salva no cache com tempo reduzido (dados pessoais)
-        cache.set(cache_key, resultado, ttl=3600)  # 1 hora apenas
+        cache.set(cache_key, resultado)
         
         log_consulta("DADOS_PESSOAIS", telefone, True, "Consulta OSINT pública realizada")
         return resultado
@@ -1799,6 +1821,9 @@ class OSINTInvestigador:
         """
         Consulta fontes OSINT independentes para investigação
         
+        Os provedores são consultados em paralelo sob o prazo OSINT_PRAZO_FONTES;
+        os que não respondem a tempo aparecem em fontes_consultadas com "(timeout)".
+        
         Args:
             resultado (Dict[str, Any]): Estrutura base do resultado
             telefone (str): Telefone limpo para consulta
@@ -1810,59 +1835,42 @@ class OSINTInvestigador:
         cpf = resultado.get("dados_pessoais", {}).get("cpf")
         nome = resultado.get("dados_pessoais", {}).get("nome")
         
-        # 1. Consulta Direct Data API
-        try:
-            resultado["fontes_consultadas"].append("Direct Data API")
-            dados_direct = self._consultar_direct_data_api(cpf=cpf, telefone=telefone, nome=nome)
-            if dados_direct:
-                resultado["dados_pessoais"].update(dados_direct)
-                resultado["dados_encontrados"] = True
-                
-        except Exception as e:
-            logger.warning(f"Erro ao consultar Direct Data API: {e}")
-        
-        # 2. Consulta Assertiva Localize API
-        try:
-            resultado["fontes_consultadas"].append("Assertiva Localize API")
-            dados_assertiva = self._consultar_assertiva_localize_api(cpf=cpf, telefone=telefone)
-            if dados_assertiva:
-                # Mescla dados sem sobrescrever
-                for key, value in dados_assertiva.items():
-                    if key not in resultado["dados_pessoais"] or not resultado["dados_pessoais"][key]:
-                        resultado["dados_pessoais"][key] = value
-                resultado["dados_encontrados"] = True
-                
-        except Exception as e:
-            logger.warning(f"Erro ao consultar Assertiva Localize API: {e}")
-        
-        # 3. Consulta Desk Data API
-        try:
-            resultado["fontes_consultadas"].append("Desk Data API")
-            dados_desk = self._consultar_desk_data_api(cpf=cpf, telefone=telefone, nome=nome)
-            if dados_desk:
-                # Mescla dados sem sobrescrever
-                for key, value in dados_desk.items():
-                    if key not in resultado["dados_pessoais"] or not resultado["dados_pessoais"][key]:
-                        resultado["dados_pessoais"][key] = value
-                resultado["dados_encontrados"] = True
-                
-        except Exception as e:
-            logger.warning(f"Erro ao consultar Desk Data API: {e}")
-        
-        # 4. Consulta AntiFraudeBrasil API (se CPF disponível)
+        # Provedores em ordem de prioridade: (nome, consulta, sobrescreve dados já encontrados)
+        provedores = [
+            ("Direct Data API", lambda: self._consultar_direct_data_api(cpf=cpf, telefone=telefone, nome=nome), True),
+            ("Assertiva Localize API", lambda: self._consultar_assertiva_localize_api(cpf=cpf, telefone=telefone), False),
+            ("Desk Data API", lambda: self._consultar_desk_data_api(cpf=cpf, telefone=telefone, nome=nome), False)
+        ]
         if cpf:
+            provedores.append(("AntiFraudeBrasil API", lambda: self._consultar_antifraudebrasil_api(cpf), False))
+        
+        # 1-4. Consulta todos os provedores ao mesmo tempo, sob um prazo único
+        futuros = [executor.submit(consulta) for _, consulta, _ in provedores]
+        wait(futuros, timeout=OSINT_PRAZO_FONTES)
+        
+        # Mescla na ordem de prioridade, independente da ordem de chegada
+        for (fonte, _, sobrescrever), futuro in zip(provedores, futuros):
+            if not futuro.done():
+                futuro.cancel()
+                resultado["fontes_consultadas"].append(f"{fonte} (timeout)")
+                logger.warning(f"{fonte} não respondeu em {OSINT_PRAZO_FONTES}s")
+                continue
+            
+            resultado["fontes_consultadas"].append(fonte)
             try:
-                resultado["fontes_consultadas"].append("AntiFraudeBrasil API")
-                dados_antifraud = self._consultar_antifraudebrasil_api(cpf)
-                if dados_antifraud:
-                    # Mescla dados sem sobrescrever
-                    for key, value in dados_antifraud.items():
-                        if key not in resultado["dados_pessoais"] or not resultado["dados_pessoais"][key]:
-                            resultado["dados_pessoais"][key] = value
+                dados = futuro.result()
+                if dados:
+                    if sobrescrever:
+                        resultado["dados_pessoais"].update(dados)
+                    else:
+                        # Mescla dados sem sobrescrever
+                        for key, value in dados.items():
+                            if key not in resultado["dados_pessoais"] or not resultado["dados_pessoais"][key]:
+                                resultado["dados_pessoais"][key] = value
                     resultado["dados_encontrados"] = True
                     
             except Exception as e:
-                logger.warning(f"Erro ao consultar AntiFraudeBrasil API: {e}")
+                logger.warning(f"Erro ao consultar {fonte}: {e}")
         
         # 5. Informações de operadora (dados não sensíveis)
         try:
@@ -2001,11 +2009,10 @@ class OSINTInvestigador:
             if not params:
                 return None
                 
-            response = requests.get(
+            response = transporte.get(
                 ASSERTIVA_LOCALIZE_API_URL,
                 params=params,
-                headers=headers,
-                timeout=REQUEST_TIMEOUT
+                headers=headers
             )
             
             if response.status_code == 200:
@@ -2072,11 +2079,10 @@ class OSINTInvestigador:
             if not payload:
                 return None
                 
-            response = requests.post(
+            response = transporte.post(
                 f"{DESK_DATA_API_URL}/consulta",
                 json=payload,
-                headers=headers,
-                timeout=REQUEST_TIMEOUT
+                headers=headers
             )
             
             if response.status_code == 200:
@@ -2127,10 +2133,9 @@ class OSINTInvestigador:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(
+            response = transporte.get(
                 f"{ANTIFRAUDEBRASIL_API_URL}/cpf/{cpf}",
-                headers=headers,
-                timeout=REQUEST_TIMEOUT
+                headers=headers
             )
             
             if response.status_code == 200:
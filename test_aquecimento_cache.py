@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do aquecimento do cache (aquecimento_cache.py)
+As consultas são simuladas, sem acesso à rede
+"""
+
+import sys
+import threading
+import time
+
+import aquecimento_cache
+from aquecimento_cache import aquecer_cache, UFS
+
+
+class InvestigadorSimulado:
+    def __init__(self, ddd_online=True):
+        self.chamadas = []
+        self.ddd_online = ddd_online
+
+    def consultar_bancos(self):
+        self.chamadas.append("bancos")
+        return {"bancos": [], "total": 0}
+
+    def consultar_municipios_uf(self, uf):
+        self.chamadas.append(uf)
+        if uf == "SP":
+            time.sleep(1.0)
+        return {"uf": uf, "municipios": [], "total": 0}
+
+    def consultar_ddd(self, ddd):
+        self.chamadas.append(ddd)
+        if ddd == "00":
+            return {"erro": "DDD não encontrado", "ddd": ddd}
+        return {"sucesso": True, "ddd": ddd}
+
+
+def test_aquecimento_em_paralelo_com_prazo():
+    investigador = InvestigadorSimulado()
+
+    inicio = time.time()
+    relatorio = aquecer_cache(investigador, prazo=0.3, ddds=["11", "21", "00"])
+
+    assert time.time() - inicio < 0.8
+    assert len(investigador.chamadas) == 1 + len(UFS) + 3
+    assert relatorio["carregados"] == {"bancos": 1, "municipios": len(UFS) - 1, "ddd": 2}
+    assert relatorio["falhas"] == ["ddd:00"]
+    assert relatorio["pendentes"] == ["municipios:SP"]
+
+
+def test_ddds_da_base_local_nao_sao_aquecidos():
+    investigador = InvestigadorSimulado(ddd_online=False)
+
+    relatorio = aquecer_cache(investigador, prazo=5, ddds=["11", "21"])
+    assert not {"11", "21"} & set(investigador.chamadas)
+    assert relatorio["carregados"]["ddd"] == 0
+    assert relatorio["ddd_base_local"] is True
+
+
+def test_aquecimento_com_concorrencia_limitada():
+    ativos = []
+    maximo = []
+    lock = threading.Lock()
+
+    class InvestigadorContado(InvestigadorSimulado):
+        def consultar_municipios_uf(self, uf):
+            with lock:
+                ativos.append(uf)
+                maximo.append(len(ativos))
+            time.sleep(0.01)
+            with lock:
+                ativos.remove(uf)
+            return {"uf": uf, "municipios": [], "total": 0}
+
+    relatorio = aquecer_cache(InvestigadorContado(), prazo=5, ddds=[], concorrencia=2)
+    assert relatorio["carregados"]["municipios"] == len(UFS)
+    assert max(maximo) <= 2
+
+
+def test_importar_o_app_nao_inicia_o_aquecimento(monkeypatch):
+    iniciados = []
+    monkeypatch.setattr(aquecimento_cache, "aquecer_em_segundo_plano", lambda *args: iniciados.append(args) or True)
+    monkeypatch.delitem(sys.modules, "web_app", raising=False)
+    import web_app
+
+    assert iniciados == []
+    monkeypatch.setattr(web_app, "aquecer_em_segundo_plano", aquecimento_cache.aquecer_em_segundo_plano)
+    monkeypatch.setattr(web_app, "_aquecimento_iniciado", False)
+    monkeypatch.setattr(web_app, "CACHE_AQUECIMENTO_INICIAR", True)
+    assert web_app.iniciar_aquecimento() is True
+    assert web_app.iniciar_aquecimento() is False
+    assert len(iniciados) == 1
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do motor assíncrono (AsyncOSINTInvestigador)
+Os provedores são simulados, sem acesso à rede
+"""
+
+import asyncio
+import time
+
+from async_investigador import AsyncOSINTInvestigador
+from osint_investigador import OSINTInvestigador
+from utils.cache import cache
+
+CEP = "01310100"
+
+APIS = [
+    {"url": "lento", "name": "ViaCEP", "format": "viacep"},
+    {"url": "rapido", "name": "BrasilAPI-V2", "format": "brasilapi"},
+    {"url": "falha", "name": "OpenCEP", "format": "opencep"},
+]
+
+
+def _investigador_simulado(atrasos, respostas):
+    investigador = AsyncOSINTInvestigador()
+    chamadas = []
+
+    async def fazer_requisicao(url, api_name, aceitar_404=False):
+        chamadas.append(api_name)
+        await asyncio.sleep(atrasos.get(url, 0))
+        return respostas.get(url)
+
+    investigador._fazer_requisicao = fazer_requisicao
+    return investigador, chamadas
+
+
+def test_hedge_assincrono_cancela_provedor_lento():
+    investigador, chamadas = _investigador_simulado(
+        {"lento": 1.0, "rapido": 0.05},
+        {"lento": {"cep": CEP}, "rapido": {"cep": CEP, "street": "Avenida Paulista", "city": "São Paulo"}}
+    )
+
+    inicio = time.time()
+    resultado, api_name = asyncio.run(
+        investigador._consultar_provedores_cep(APIS, CEP, modo="hedge", hedge_delay=0.1)
+    )
+
+    assert api_name == "BrasilAPI-V2"
+    assert resultado["logradouro"] == "Avenida Paulista"
+    assert time.time() - inicio < 0.8
+    assert "OpenCEP" not in chamadas
+
+
+def test_ddd_usa_mesma_normalizacao_e_cache():
+    cache.delete("ddd_99")
+    investigador, chamadas = _investigador_simulado({}, {})
+    investigador._sync = OSINTInvestigador()
+    investigador._sync.ddd_online = True
+
+    async def fazer_requisicao(url, api_name, aceitar_404=False):
+        chamadas.append(api_name)
+        return {"state": "MA", "cities": ["IMPERATRIZ"]}
+
+    investigador._fazer_requisicao = fazer_requisicao
+
+    resultado = asyncio.run(investigador.consultar_ddd("99"))
+    assert resultado == {"sucesso": True, "ddd": "99", "estado": "MA", "cidades": ["IMPERATRIZ"], "regiao": "Nordeste"}
+    assert cache.get("ddd_99") == resultado
+
+    # A segunda consulta vem do cache compartilhado
+    asyncio.run(investigador.consultar_ddd("99"))
+    assert chamadas == ["BrasilAPI-DDD"]
+    cache.delete("ddd_99")
+
+
+def test_consultas_concorrentes():
+    investigador, chamadas = _investigador_simulado({}, {})
+
+    async def fazer_requisicao(url, api_name, aceitar_404=False):
+        chamadas.append(url)
+        await asyncio.sleep(0.2)
+        return None
+
+    investigador._fazer_requisicao = fazer_requisicao
+
+    async def consultar_varias():
+        return await asyncio.gather(*(investigador.consultar_municipios_uf(uf) for uf in ["AC", "AL", "AP", "AM", "BA"]))
+
+    inicio = time.time()
+    resultados = asyncio.run(consultar_varias())
+
+    assert all("erro" in resultado for resultado in resultados)
+    assert len(chamadas) == 5
+    assert time.time() - inicio < 0.6
+
+
+def test_ddd_pela_base_local_sem_rede():
+    investigador, chamadas = _investigador_simulado({}, {})
+
+    resultado = asyncio.run(investigador.consultar_ddd("99"))
+    assert resultado["estado"] == "MA"
+    assert "Imperatriz" in resultado["cidades"]
+    assert chamadas == []
+
+
+def test_sessao_fechada_ao_fim_de_cada_loop():
+    investigador = AsyncOSINTInvestigador()
+    sessoes = []
+
+    async def usar_sessao():
+        sessao = investigador._obter_sessao()
+        assert investigador._obter_sessao() is sessao
+        sessoes.append(sessao)
+
+    asyncio.run(usar_sessao())
+    asyncio.run(usar_sessao())
+    assert sessoes[0] is not sessoes[1]
+    assert all(sessao.closed for sessao in sessoes)
+
+    async def usar_e_fechar():
+        async with investigador:
+            sessoes.append(investigador._obter_sessao())
+
+    asyncio.run(usar_e_fechar())
+    assert sessoes[-1].closed
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do acesso ao SQLite com conexão por thread (utils.banco_dados)
+"""
+
+import json
+import threading
+
+import api.index
+from database import DatabaseManager
+from utils.banco_dados import _BUSCA_PREFIXO_NOME, pool_sqlite
+
+
+def test_pragmas_e_conexao_por_thread(tmp_path):
+    pool = pool_sqlite(str(tmp_path / "pool.db"))
+    assert pool_sqlite(str(tmp_path / "pool.db")) is pool
+
+    conn = pool.conexao()
+    assert pool.conexao() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone() == {"journal_mode": "wal"}
+    assert conn.execute("PRAGMA synchronous").fetchone() == {"synchronous": 1}
+    assert conn.execute("PRAGMA cache_size").fetchone()["cache_size"] < 0
+
+    outras = []
+    thread = threading.Thread(target=lambda: outras.append(pool.conexao()))
+    thread.start()
+    thread.join()
+    assert outras[0] is not conn
+
+    pool.fechar()
+    assert pool.conexao() is not conn
+    pool.fechar()
+
+
+def test_database_manager_com_pool(tmp_path):
+    db = DatabaseManager(str(tmp_path / "pessoas.db"))
+
+    assert db.inserir_pessoa("11144477735", nome="Maria Silva", email="maria@email.com")["status"] == "success"
+    assert db.inserir_pessoa("11144477735", nome="Outra")["message"] == "CPF já existe no banco de dados"
+    assert db.atualizar_pessoa("11144477735", telefone="11987654321")["status"] == "success"
+    assert db.atualizar_pessoa("00000000000", nome="X")["message"] == "CPF não encontrado"
+
+    dados = db.buscar_por_cpf("11144477735")["dados"]
+    assert list(dados)[:4] == ["id", "cpf", "nome", "rg"]
+    assert dados["nome"] == "Maria Silva"
+    assert dados["telefone"] == "11987654321"
+
+    busca = db.buscar_cruzada(email="maria@email.com", nome="Ninguém")
+    assert busca["total_encontrados"] == 1
+    assert busca["dados"][0]["cpf"] == "11144477735"
+    assert db.buscar_por_cpf("00000000000")["status"] == "not_found"
+    db.pool.fechar()
+
+
+def test_gravacao_em_lote(tmp_path):
+    db = DatabaseManager(str(tmp_path / "lote.db"))
+    db.inserir_pessoa("11144477735", nome="Maria Silva", email="maria@email.com")
+
+    registros = [
+        {"cpf": "11144477735", "telefone": "11987654321"},
+        {"cpf": "22233344405", "nome": "João"},
+        {"nome": "Sem CPF"},
+        {"cpf": "22233344405", "rg": "123"},
+        {"cpf": "33344455566", "nome": "Ana"},
+    ]
+    inseridos = db.inserir_pessoas_lote(registros, tamanho_lote=2)
+    assert [r["status"] for r in inseridos["resultados"]] == ["existente", "inserido", "erro", "existente", "inserido"]
+    assert (inseridos["inseridos"], inseridos["existentes"], inseridos["erros"]) == (2, 2, 1)
+    assert db.buscar_por_cpf("11144477735")["dados"]["telefone"] is None
+
+    atualizados = db.upsert_pessoas(registros + [{"cpf": "44455566677"}])
+    assert [r["status"] for r in atualizados["resultados"]] == [
+        "atualizado", "atualizado", "erro", "atualizado", "atualizado", "inserido"
+    ]
+    maria = db.buscar_por_cpf("11144477735")["dados"]
+    assert (maria["nome"], maria["email"], maria["telefone"]) == ("Maria Silva", "maria@email.com", "11987654321")
+    joao = db.buscar_por_cpf("22233344405")["dados"]
+    assert (joao["nome"], joao["rg"]) == ("João", "123")
+    db.pool.fechar()
+
+
+def test_registro_invalido_nao_derruba_o_lote(tmp_path):
+    db = DatabaseManager(str(tmp_path / "invalidos.db"))
+
+    resultado = db.upsert_pessoas([
+        {"cpf": "11144477735", "nome": "Maria"},
+        {"cpf": "22233344405", "nome": ["x"]},
+        {"cpf": "33344455566", "rg": 2 ** 70},
+        {"cpf": "44455566677", "nome": "Ana"},
+    ])
+    assert [r["status"] for r in resultado["resultados"]] == ["inserido", "erro", "erro", "inserido"]
+    assert resultado["resultados"][1]["message"] == "Valor inválido para nome"
+    assert db.buscar_por_cpf("44455566677")["status"] == "success"
+    assert db.buscar_por_cpf("33344455566")["status"] == "not_found"
+    db.pool.fechar()
+
+
+def test_endpoint_lote_ndjson(tmp_path, monkeypatch):
+    db = DatabaseManager(str(tmp_path / "api.db"))
+    monkeypatch.setattr(api.index, "banco", db.pool)
+
+    corpo = "\n".join([
+        json.dumps({"cpf": "11144477735", "nome": "Maria"}),
+        "{invalido",
+        json.dumps({"cpf": "11144477735", "email": "maria@email.com"}),
+    ])
+    with api.index.app.test_client() as client:
+        resposta = client.post("/api/inserir/pessoas?lote=1", data=corpo, content_type="application/x-ndjson")
+        linhas = [json.loads(linha) for linha in resposta.get_data(as_text=True).splitlines()]
+        assert resposta.status_code == 200
+        assert [linha.get("status") for linha in linhas[:3]] == ["inserido", "erro", "atualizado"]
+        assert linhas[-1]["resumo"] == {"total": 3, "inseridos": 1, "atualizados": 1, "existentes": 0, "erros": 1}
+
+        resposta = client.post("/api/inserir/pessoas?modo=inserir", json=[{"cpf": "11144477735"}])
+        assert json.loads(resposta.get_data(as_text=True).splitlines()[0])["status"] == "existente"
+        assert client.post("/api/inserir/pessoas", json={"cpf": "1"}).status_code == 400
+
+    assert db.buscar_por_cpf("11144477735")["dados"]["email"] == "maria@email.com"
+    db.pool.fechar()
+
+
+def test_busca_cruzada_paginada(tmp_path, monkeypatch):
+    db = DatabaseManager(str(tmp_path / "busca.db"))
+    db.upsert_pessoas(
+        [{"cpf": f"{i:011d}", "nome": f"Maria {i}", "email": "comum@email.com" if i % 2 else None} for i in range(1, 8)]
+        + [{"cpf": "99999999999", "nome": "100% João", "telefone": "11987654321"}]
+    )
+
+    # Sem FTS5 o prefixo do nome é buscado pela faixa de idx_nome_nocase, não pela chave primária
+    plano = db.pool.conexao().execute("EXPLAIN QUERY PLAN " + _BUSCA_PREFIXO_NOME, ("mar%", 0, 5)).fetchall()
+    assert any("idx_nome_nocase (nome>? AND nome<?)" in linha["detail"] for linha in plano)
+    assert not any("PRIMARY KEY" in linha["detail"] for linha in plano)
+    monkeypatch.setattr("utils.banco_dados._tem_indice_nomes", lambda conn: False)
+    assert [linha["cpf"] for linha in db.buscar_cruzada(nome="MARIA", limite=3)["dados"]] == [f"{i:011d}" for i in range(1, 4)]
+    assert [linha["cpf"] for linha in db.buscar_cruzada(nome="maria", cursor=3)["dados"]] == [f"{i:011d}" for i in range(4, 8)]
+    monkeypatch.undo()
+
+    vistos = []
+    cursor = None
+    while True:
+        pagina = db.buscar_cruzada(nome="maria", email="comum@email.com", limite=3, cursor=cursor)
+        assert pagina["status"] == "success" and pagina["total_encontrados"] <= 3
+        vistos.extend((linha["cpf"], linha["relevancia"]) for linha in pagina["dados"])
+        cursor = pagina["proximo_cursor"]
+        if cursor is None:
+            break
+    assert [cpf for cpf, _ in vistos] == [f"{i:011d}" for i in range(1, 8)]
+    assert [relevancia for _, relevancia in vistos] == [2, 1, 2, 1, 2, 1, 2]
+
+    assert [linha["cpf"] for linha in db.buscar_cruzada(nome="100%")["dados"]] == ["99999999999"]
+    assert [linha["cpf"] for linha in db.buscar_cruzada(nome="joao 100")["dados"]] == ["99999999999"]
+    assert db.buscar_cruzada(**{"1=1 OR cpf": "x"})["status"] == "error"
+    db.pool.fechar()
+
+
+def test_busca_por_nome_fts(tmp_path):
+    db = DatabaseManager(str(tmp_path / "nomes.db"))
+    db.inserir_dados_exemplo()
+    db.inserir_pessoa("55566677788", nome="Conceição Aparecida")
+
+    assert [p["cpf"] for p in db.buscar_por_nome("conceicao jose")["dados"]] == ["11122233344"]
+    assert {p["cpf"] for p in db.buscar_por_nome("CONCEI")["dados"]} == {"11122233344", "55566677788"}
+    assert db.buscar_por_nome("jo sil")["dados"][0]["nome"] == "João da Silva"
+    assert db.buscar_por_nome("\"*")["total_encontrados"] == 0
+
+    # Triggers: atualização e upsert reindexam o nome
+    db.atualizar_pessoa("12345678901", nome="João Pereira")
+    db.upsert_pessoas([{"cpf": "98765432100", "nome": "Maria Conceição"}])
+    assert db.buscar_por_nome("silva")["total_encontrados"] == 0
+    assert db.buscar_por_nome("pereira")["dados"][0]["cpf"] == "12345678901"
+    assert db.buscar_por_nome("conceição")["total_encontrados"] == 3
+
+    cruzada = db.buscar_cruzada(nome="maria conceicao", telefone="21888888888")
+    assert [(p["cpf"], p["relevancia"]) for p in cruzada["dados"]] == [("98765432100", 2)]
+
+    with api.index.app.test_client() as client:
+        api.index.banco, anterior = db.pool, api.index.banco
+        try:
+            resposta = client.get("/api/buscar/nome?q=aparecida&limit=5").get_json()
+            assert resposta["dados"][0]["cpf"] == "55566677788" and resposta["limit"] == 5
+            assert client.get("/api/buscar/nome").status_code == 400
+        finally:
+            api.index.banco = anterior
+    db.pool.fechar()
+
+
+def test_indice_de_nomes_em_banco_existente(tmp_path):
+    caminho = str(tmp_path / "antigo.db")
+    pool = pool_sqlite(caminho)
+    with pool.conexao() as conn:
+        conn.execute("CREATE TABLE pessoas (id INTEGER PRIMARY KEY AUTOINCREMENT, cpf TEXT UNIQUE NOT NULL, nome TEXT, "
+                     "rg TEXT, cnh TEXT, email TEXT, telefone TEXT, titulo_eleitor TEXT, pis TEXT, cns TEXT, "
+                     "data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP, data_atualizacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+        conn.execute("INSERT INTO pessoas (cpf, nome) VALUES ('11144477735', 'Antônio Gonçalves')")
+
+    db = DatabaseManager(caminho)
+    assert db.buscar_por_nome("goncalves antonio")["dados"][0]["cpf"] == "11144477735"
+    db.pool.fechar()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da base local de DDDs (utils.base_ddd) e das consultas sem rede
+"""
+
+from osint_investigador import OSINTInvestigador
+from utils.base_ddd import BaseDDD, base_ddd
+from utils.validators import validar_ddd
+
+
+def _investigador_sem_rede():
+    investigador = OSINTInvestigador()
+    chamadas = []
+
+    def fazer_requisicao(url, api_name, aceitar_404=False):
+        chamadas.append(api_name)
+        return None
+
+    investigador._fazer_requisicao = fazer_requisicao
+    investigador.operadora_online = False
+    return investigador, chamadas
+
+
+def test_base_carregada_com_todos_os_ddds():
+    assert base_ddd.carregada
+    assert len(base_ddd.ddds()) == 67
+    assert base_ddd.obter("61")["uf"] == "DF"
+    assert base_ddd.obter("19")["cidades"][0] == "Campinas"
+    assert base_ddd.obter("20") is None
+    assert base_ddd.obter("1") is None
+
+    assert validar_ddd("(21)")
+    assert not validar_ddd("23")
+
+
+def test_base_ausente(tmp_path):
+    base = BaseDDD(str(tmp_path / "nao_existe.json"))
+    assert not base.carregada
+    assert base.obter("11") is None
+
+
+def test_consulta_de_telefone_sem_rede():
+    investigador, chamadas = _investigador_sem_rede()
+
+    resultado = investigador.consultar_telefone("(48) 99123-4567")
+    assert resultado["sucesso"]
+    assert resultado["estado"] == "SC"
+    assert resultado["regiao"] == "Sul"
+    assert chamadas == []
+
+
+def test_ddd_online_usa_base_local_quando_a_api_falha():
+    investigador, chamadas = _investigador_sem_rede()
+    investigador.ddd_online = True
+
+    resultado = investigador.consultar_ddd("96")
+    assert resultado["estado"] == "AP"
+    assert chamadas == ["BrasilAPI-DDD"]
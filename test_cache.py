@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do cache em memória (utils.cache.SimpleCache)
+"""
+
+import hashlib
+import time
+
+from utils.cache import SimpleCache, chave_cache
+
+
+def test_despejo_lru_por_numero_de_entradas():
+    cache = SimpleCache(max_items=3)
+    for chave in ["cep_1", "cep_2", "cep_3"]:
+        cache.set(chave, {"cep": chave})
+
+    # cep_1 passa a ser o mais recente
+    assert cache.get("cep_1") == {"cep": "cep_1"}
+    cache.set("cep_4", {"cep": "cep_4"})
+
+    assert cache.get("cep_2") is None
+    assert cache.get("cep_1") is not None
+    stats = cache.get_stats()
+    assert stats["total_items"] == 3
+    assert stats["evictions"] == 1
+
+
+def test_despejo_por_orcamento_de_bytes():
+    cache = SimpleCache(max_items=1000, max_bytes=5000)
+    for i in range(20):
+        cache.set(f"cnpj_{i}", "x" * 500)
+
+    stats = cache.get_stats()
+    assert stats["bytes_used"] <= 5000
+    assert stats["evictions"] > 0
+    assert cache.get("cnpj_19") is not None
+    assert cache.get("cnpj_0") is None
+
+
+def test_valor_maior_que_orcamento_nao_e_guardado():
+    cache = SimpleCache(max_bytes=1000)
+    cache.set("municipios_SP", "x" * 5000)
+
+    assert cache.get("municipios_SP") is None
+    assert cache.get_stats()["bytes_used"] == 0
+
+
+def test_bytes_atualizados_em_delete_e_clear():
+    cache = SimpleCache()
+    cache.set("ddd_11", {"estado": "SP"})
+    cache.set("ddd_21", {"estado": "RJ"})
+    cache.set("ddd_11", {"estado": "SP", "cidades": ["SAO PAULO"]})
+
+    assert cache.delete("ddd_21")
+    assert cache.get_stats()["total_items"] == 1
+    assert cache.clear() == 1
+    assert cache.get_stats()["bytes_used"] == 0
+
+
+def test_expiradas_recuperadas_em_lotes(monkeypatch):
+    import utils.cache as modulo_cache
+    agora = [1000.0]
+    monkeypatch.setattr(modulo_cache, "CACHE_LOTE_EXPIRACAO", 10)
+    monkeypatch.setattr(modulo_cache.time, "time", lambda: agora[0])
+
+    cache = SimpleCache(politicas={})
+    for i in range(25):
+        cache.set(f"cep_{i}", i, ttl=60)
+    cache.set("cep_valido", "ok", ttl=600)
+
+    agora[0] += 120
+
+    # get_stats conta as vencidas sem removê-las
+    for _ in range(2):
+        stats = cache.get_stats()
+        assert stats["total_items"] == 26
+        assert stats["expired_items"] == 25
+        assert stats["active_items"] == 1
+        assert stats["expiry_backlog"] is True
+
+    assert cache.cleanup_expired() == 25
+    stats = cache.get_stats()
+    assert stats["total_items"] == 1
+    assert (stats["active_items"], stats["expired_items"]) == (1, 0)
+    assert stats["expired_reclaimed"] == 25
+    assert stats["expiry_backlog"] is False
+    assert cache.get("cep_valido") == "ok"
+
+
+def test_contagem_de_vencidas_na_janela_stale(monkeypatch):
+    import utils.cache as modulo_cache
+    agora = [1000.0]
+    monkeypatch.setattr(modulo_cache.time, "time", lambda: agora[0])
+
+    cache = SimpleCache(politicas={})
+    cache.set("cep_1", "a", ttl=60, stale_ttl=600)
+    cache.set("cep_2", "b", ttl=60, stale_ttl=600)
+    agora[0] += 120
+
+    # A falta no get conta a entrada vencida; a regravação a torna ativa de novo
+    assert cache.get("cep_1") is None
+    stats = cache.get_stats()
+    assert (stats["total_items"], stats["active_items"], stats["expired_items"]) == (2, 0, 2)
+
+    cache.set("cep_1", "novo", ttl=60)
+    assert cache.delete("cep_2")
+    stats = cache.get_stats()
+    assert (stats["total_items"], stats["active_items"], stats["expired_items"]) == (1, 1, 0)
+
+
+def test_regravacao_nao_expira_pela_entrada_antiga():
+    cache = SimpleCache()
+    cache.set("cnpj_1", "antigo", ttl=-1)
+    cache.set("cnpj_1", "novo", ttl=60)
+    cache.set("cnpj_2", "outro", ttl=60)
+
+    assert cache.cleanup_expired() == 0
+    assert cache.get("cnpj_1") == "novo"
+
+
+def test_cache_l2_compartilhado_entre_instancias(tmp_path):
+    from utils.cache_persistente import CachePersistente
+
+    caminho = str(tmp_path / "cache_l2.db")
+    worker_1 = SimpleCache(l2=CachePersistente(caminho))
+    worker_1.set("cnpj_11222333000181_cnpja", {"razao_social": "Empresa"}, ttl=60)
+    worker_1.set("cep_vencido", {"cep": "1"}, ttl=-1)
+
+    # Outro worker (ou o mesmo após reinício) começa com o L1 vazio
+    worker_2 = SimpleCache(l2=CachePersistente(caminho))
+    assert worker_2.get("cnpj_11222333000181_cnpja") == {"razao_social": "Empresa"}
+    assert worker_2.get("cep_vencido") is None
+    assert worker_2.get_stats()["l2_hits"] == 1
+    assert worker_2.get_stats()["total_items"] == 1
+
+    worker_2.clear()
+    assert worker_1.l2.get("cnpj_11222333000181_cnpja") is None
+
+
+def test_cache_l2_nao_executa_conteudo_do_arquivo(tmp_path, capsys):
+    import pickle
+    import zlib
+    from utils.cache_persistente import CachePersistente
+
+    class Carga:
+        def __reduce__(self):
+            return (print, ("carga executada",))
+
+    l2 = CachePersistente(str(tmp_path / "cache_l2.db"))
+    l2.set("cep_01001000", {"cep": "01001-000", "itens": [1, 2]}, time.time() + 60)
+    assert l2.get("cep_01001000")[0] == {"cep": "01001-000", "itens": [1, 2]}
+
+    # Um arquivo adulterado vira entrada ausente, sem desserializar objetos Python
+    with l2._conexao() as conn:
+        conn.execute("UPDATE cache_l2 SET valor = ? WHERE chave = ?",
+                     (zlib.compress(pickle.dumps(Carga())), "cep_01001000"))
+    assert l2.get("cep_01001000") is None
+    assert "carga executada" not in capsys.readouterr().out
+
+
+def test_delete_remove_dos_dois_niveis(tmp_path):
+    from utils.cache_persistente import CachePersistente
+
+    cache = SimpleCache(l2=CachePersistente(str(tmp_path / "cache_l2.db")))
+    cache.set("bancos_brasileiros", [{"code": 1}])
+
+    assert cache.delete("bancos_brasileiros")
+    assert cache.get("bancos_brasileiros") is None
+    assert cache.l2.get_stats()["total_items"] == 0
+
+
+def test_valor_grande_demais_descarta_o_anterior_nos_dois_niveis(tmp_path):
+    from utils.cache_persistente import CachePersistente
+
+    cache = SimpleCache(politicas={"dados_pessoais": {"ttl": 60, "max_bytes": 1024}},
+                        l2=CachePersistente(str(tmp_path / "cache_l2.db")))
+    cache.set("dados_pessoais_11999999999", {"nome": "antigo"})
+    cache.set("dados_pessoais_11999999999", {"nome": "x" * 2000})
+
+    assert cache.get("dados_pessoais_11999999999") is None
+    assert cache.l2.get("dados_pessoais_11999999999") is None
+
+
+def test_get_stale_serve_vencida_e_reserva_uma_atualizacao(monkeypatch):
+    import utils.cache as modulo_cache
+    agora = [1000.0]
+    monkeypatch.setattr(modulo_cache.time, "time", lambda: agora[0])
+
+    cache = SimpleCache()
+    cache.set("cep_01310100", {"cep": "01310100"}, ttl=60, stale_ttl=600)
+    assert cache.get_stale("cep_01310100") == ({"cep": "01310100"}, False)
+
+    agora[0] += 120
+
+    # Vencida: get não retorna, get_stale retorna e só o primeiro chamador atualiza
+    assert cache.get("cep_01310100") is None
+    assert cache.get_stale("cep_01310100") == ({"cep": "01310100"}, True)
+    assert cache.get_stale("cep_01310100") == ({"cep": "01310100"}, False)
+
+    # Passada a janela stale_ttl a entrada é removida
+    agora[0] += 600
+    assert cache.get_stale("cep_01310100") == (None, False)
+    assert cache.get_stats()["total_items"] == 0
+
+
+def test_politica_por_namespace(monkeypatch):
+    import utils.cache as modulo_cache
+    agora = [1000.0]
+    monkeypatch.setattr(modulo_cache.time, "time", lambda: agora[0])
+
+    cache = SimpleCache(politicas={
+        "municipios": {"ttl": 30 * 86400},
+        "dados_pessoais": {"ttl": 60, "max_bytes": 1024},
+    })
+    cache.set("municipios_sp", {"total": 645})
+    cache.set("dados_pessoais_11999999999", {"nome": "x"})
+    cache.set("dados_pessoais_11888888888", {"nome": "x" * 2000})
+    cache.set("outro", 1)
+
+    assert cache.politica("dados_pessoais_1")["ttl"] == 60
+    assert cache.politica("municipiosx")["ttl"] == modulo_cache.CACHE_TIMEOUT
+    assert cache.get("dados_pessoais_11888888888") is None
+
+    agora[0] += 7 * 86400
+    assert cache.get("municipios_sp") == {"total": 645}
+    assert cache.get("dados_pessoais_11999999999") is None
+    assert cache.get("outro") is None
+
+
+def test_chave_cache_canonica():
+    assert chave_cache("cep", "01310100") == "cep_01310100"
+    assert chave_cache("cnpj", "11222333000181", "auto") == "cnpj_11222333000181_auto"
+    assert chave_cache("directd", "nome", "  José ", "da SILVA") == chave_cache("directd", "nome", "jose", "Da  Silva")
+
+    # Dicts: mesma chave independente da ordem e do processo
+    chave = chave_cache("dados_avancados", {"cpf": "12345678909", "nome": "Maria"})
+    assert chave == chave_cache("dados_avancados", {"nome": "Maria", "cpf": "12345678909"})
+    assert chave == "dados_avancados_" + hashlib.sha1(b'{"cpf": "12345678909", "nome": "maria"}').hexdigest()
+
+    assert len(chave_cache("directd", "nome", "x" * 500)) < 100
+
+
+def test_metricas_por_namespace(monkeypatch):
+    import utils.cache as modulo_cache
+    agora = [1000.0]
+    monkeypatch.setattr(modulo_cache.time, "time", lambda: agora[0])
+
+    cache = SimpleCache(max_items=2, politicas={"cep": {"ttl": 60, "stale_ttl": 600}, "ddd": {}})
+
+    # Falta, busca de 0,5 s na origem e gravação
+    assert cache.get("cep_01310100") is None
+    agora[0] += 0.5
+    cache.set("cep_01310100", {"cep": "01310100"})
+
+    assert cache.get("cep_01310100") is not None
+    assert cache.get("cep_01310100") is not None
+    agora[0] += 120
+    assert cache.get_stale("cep_01310100")[0] is not None
+
+    cache.set("ddd_11", {"estado": "SP"})
+    cache.set("ddd_21", {"estado": "RJ"})
+
+    stats = cache.get_stats()["namespaces"]
+    assert stats["cep"]["hits"] == 2
+    assert stats["cep"]["stale_hits"] == 1
+    assert stats["cep"]["misses"] == 1
+    assert stats["cep"]["hit_rate"] == 0.75
+    assert stats["cep"]["evictions"] == 1
+    assert stats["cep"]["bytes_used"] == 0
+    assert stats["cep"]["tempo_origem_medio_ms"] == 500.0
+    assert stats["cep"]["tempo_economizado_s"] == 1.5
+    assert stats["ddd"]["sets"] == 2
+    assert stats["ddd"]["bytes_used"] == cache.get_stats()["bytes_used"]
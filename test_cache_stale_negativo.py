@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do stale-while-revalidate e do cache negativo nas consultas do OSINTInvestigador
+Os provedores são simulados, sem acesso à rede
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import osint_investigador as modulo_investigador
+import utils.cache as modulo_cache
+from osint_investigador import OSINTInvestigador
+from utils.cache import cache
+
+
+def _investigador_simulado(respostas):
+    investigador = OSINTInvestigador()
+    chamadas = []
+
+    def fazer_requisicao(url, api_name, aceitar_404=False):
+        chamadas.append(api_name)
+        return respostas.get(api_name)
+
+    investigador._fazer_requisicao = fazer_requisicao
+    return investigador, chamadas
+
+
+def test_ddd_vencido_servido_enquanto_atualiza(monkeypatch):
+    cache.delete("ddd_98")
+    agora = [time.time()]
+    monkeypatch.setattr(modulo_cache.time, "time", lambda: agora[0])
+
+    investigador, chamadas = _investigador_simulado({"BrasilAPI-DDD": {"state": "MA", "cities": ["SAO LUIS"]}})
+    investigador.ddd_online = True
+    assert investigador.consultar_ddd("98")["estado"] == "MA"
+
+    # Depois do TTL a resposta vencida volta na hora e a atualização roda em segundo plano
+    agora[0] += cache.politica("ddd_98")["ttl"] + 1
+    investigador._fazer_requisicao = lambda url, api_name, aceitar_404=False: chamadas.append(api_name) or {"state": "MA", "cities": ["SAO LUIS", "RAPOSA"]}
+    assert investigador.consultar_ddd("98")["cidades"] == ["SAO LUIS"]
+
+    for _ in range(50):
+        if len(chamadas) == 2 and cache.get("ddd_98"):
+            break
+        time.sleep(0.02)
+    assert cache.get("ddd_98")["cidades"] == ["SAO LUIS", "RAPOSA"]
+    cache.delete("ddd_98")
+
+
+def test_cnpj_nao_encontrado_vai_para_o_cache_negativo():
+    cache.delete("cnpj_11222333000181_brasilapi")
+    investigador, chamadas = _investigador_simulado({"BrasilAPI-CNPJ": {"status": "ERROR"}})
+
+    resultado = investigador.consultar_cnpj("11222333000181", "brasilapi")
+    assert resultado["erro"] == "CNPJ não encontrado"
+    assert investigador.consultar_cnpj("11222333000181", "brasilapi") == resultado
+    assert chamadas == ["BrasilAPI-CNPJ"]
+    cache.delete("cnpj_11222333000181_brasilapi")
+
+
+def test_erro_de_api_nao_vai_para_o_cache():
+    cache.delete("cnpj_11222333000181_brasilapi")
+    investigador, chamadas = _investigador_simulado({})
+
+    assert investigador.consultar_cnpj("11222333000181", "brasilapi")["erro"] == "Erro na consulta"
+    investigador.consultar_cnpj("11222333000181", "brasilapi")
+    assert chamadas == ["BrasilAPI-CNPJ", "BrasilAPI-CNPJ"]
+
+
+def test_atualizacoes_em_segundo_plano_nao_travam_o_executor(monkeypatch):
+    # Mais CEPs vencidos que threads no executor das consultas: a atualização não pode
+    # ocupar as threads de que as consultas aos provedores precisam
+    monkeypatch.setattr(modulo_investigador, "executor", ThreadPoolExecutor(max_workers=2))
+    monkeypatch.setattr(modulo_investigador, "CEP_MODO_CONSULTA", "race")
+    ceps = ["01001000", "20040002", "30130010"]
+    for cep in ceps:
+        cache.set(f"cep_{cep}", {"sucesso": True, "cep": cep, "logradouro": "Antigo"}, ttl=-1, stale_ttl=60)
+
+    investigador, _ = _investigador_simulado({})
+    # Cada provedor responde no próprio formato: qualquer um pode vencer a corrida
+    campo_logradouro = {"ViaCEP": "logradouro", "BrasilAPI-V2": "street", "BrasilAPI-V1": "street"}
+    investigador._fazer_requisicao = lambda url, api_name, aceitar_404=False: time.sleep(0.05) or {
+        "cep": "", campo_logradouro.get(api_name, "address"): "Novo"
+    }
+    for cep in ceps:
+        assert investigador.consultar_cep(cep)["logradouro"] == "Antigo"
+
+    cache.delete("cep_40010000")
+    with ThreadPoolExecutor(max_workers=1) as externo:
+        assert externo.submit(investigador.consultar_cep, "40010000").result(timeout=10)["logradouro"] == "Novo"
+    for _ in range(100):
+        if all(cache.get(f"cep_{cep}") for cep in ceps):
+            break
+        time.sleep(0.05)
+    assert all(cache.get(f"cep_{cep}")["logradouro"] == "Novo" for cep in ceps)
+    for cep in ceps + ["40010000"]:
+        cache.delete(f"cep_{cep}")
+
+
+def test_cep_so_vai_para_o_cache_negativo_quando_todos_negam(monkeypatch):
+    monkeypatch.setattr(modulo_investigador, "CEP_MODO_CONSULTA", "sequencial")
+    cache.delete("cep_99999999")
+
+    # Falha de rede não é "não encontrado": a próxima consulta volta aos provedores
+    investigador, chamadas = _investigador_simulado({})
+    assert investigador.consultar_cep("99999999")["erro"] == "Não foi possível consultar o CEP"
+    assert cache.get_stale("cep_99999999", revalidar=False)[0] is None
+
+    # Um provedor fora do ar impede o cache negativo mesmo com os demais negando
+    respostas = {api["name"]: {"erro": "true"} for api in investigador._apis_cep("99999999")}
+    respostas["OpenCEP"] = None
+    investigador, chamadas = _investigador_simulado(respostas)
+    assert investigador.consultar_cep("99999999")["erro"] == "Não foi possível consultar o CEP"
+
+    respostas["OpenCEP"] = dict(modulo_investigador.RESPOSTA_404)
+    investigador, chamadas = _investigador_simulado(respostas)
+    assert investigador.consultar_cep("99999999")["erro"] == "CEP não encontrado em nenhuma fonte"
+    total = len(chamadas)
+    investigador.consultar_cep("99999999")
+    assert len(chamadas) == total
+    cache.delete("cep_99999999")
+
+
+def test_http_404_e_resposta_de_nao_encontrado():
+    class Resposta:
+        status_code = 404
+
+        def raise_for_status(self):
+            raise AssertionError("404 aceito não deve virar exceção")
+
+    investigador = OSINTInvestigador()
+    investigador.session.get = lambda url, timeout: Resposta()
+    url = "https://opencep.com/v1/99999999"
+    assert investigador._fazer_requisicao(url, "OpenCEP", aceitar_404=True) == {"erro": True, "status_http": 404}
+    assert modulo_investigador.cep_nao_encontrado({"erro": True, "status_http": 404})
+    assert not modulo_investigador.cep_nao_encontrado({"error": "Too many requests"})
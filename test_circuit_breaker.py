@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes dos circuit breakers por host externo
+"""
+
+import time
+
+import requests
+
+from osint_investigador import OSINTInvestigador
+from utils.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, circuitos
+
+
+def test_abre_apos_limite_de_falhas():
+    circuito = CircuitBreaker("brasilapi.com.br", limite_falhas=3, tempo_recuperacao=60)
+    for _ in range(2):
+        assert circuito.permitir_requisicao()
+        circuito.registrar_falha()
+    assert circuito.estado == "closed"
+
+    circuito.registrar_falha()
+    assert circuito.estado == "open"
+    assert not circuito.permitir_requisicao()
+    assert circuito.resumo()["requisicoes_recusadas"] == 1
+
+
+def test_meio_aberto_libera_uma_unica_sonda():
+    circuito = CircuitBreaker("consultanumero.abrtelecom.com.br", limite_falhas=1, tempo_recuperacao=0.05)
+    circuito.registrar_falha()
+    time.sleep(0.06)
+
+    assert circuito.estado == "half_open"
+    assert circuito.permitir_requisicao()
+    assert not circuito.permitir_requisicao()
+
+    circuito.registrar_sucesso()
+    assert circuito.estado == "closed"
+    assert circuito.permitir_requisicao()
+
+
+def test_sonda_com_falha_reabre_o_circuito():
+    circuito = CircuitBreaker("viacep.com.br", limite_falhas=1, tempo_recuperacao=0.05)
+    circuito.registrar_falha()
+    time.sleep(0.06)
+
+    assert circuito.permitir_requisicao()
+    circuito.registrar_falha()
+    assert circuito.estado == "open"
+    assert not circuito.permitir_requisicao()
+
+
+def test_registro_por_host():
+    registro = CircuitBreakerRegistry()
+    assert registro.obter("https://brasilapi.com.br/api/cep/v2/01310100") is registro.obter("brasilapi.com.br")
+    assert registro.obter("https://viacep.com.br/ws/01310100/json/") is not registro.obter("brasilapi.com.br")
+
+
+def test_circuito_aberto_evita_requisicao():
+    investigador = OSINTInvestigador()
+    url = "https://circuito-teste.invalid/api"
+    chamadas = []
+
+    def get_com_falha(*args, **kwargs):
+        chamadas.append(args)
+        raise requests.exceptions.ConnectionError("host fora do ar")
+
+    investigador.session.get = get_com_falha
+    circuito = circuitos.obter(url)
+
+    for _ in range(circuito.limite_falhas + 3):
+        assert investigador._fazer_requisicao(url, "Teste") is None
+
+    assert len(chamadas) == circuito.limite_falhas
+    assert circuito.estado == "open"
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da consulta de CEP com provedores em paralelo (hedge/race)
+Os provedores são simulados, sem acesso à rede
+"""
+
+import time
+
+import osint_investigador as modulo_investigador
+from osint_investigador import OSINTInvestigador
+
+CEP = "01310100"
+
+APIS = [
+    {"url": "lento", "name": "ViaCEP", "format": "viacep"},
+    {"url": "rapido", "name": "BrasilAPI-V2", "format": "brasilapi"},
+    {"url": "falha", "name": "OpenCEP", "format": "opencep"},
+]
+
+
+def _investigador_simulado(atrasos, respostas):
+    investigador = OSINTInvestigador()
+    chamadas = []
+
+    def fazer_requisicao(url, api_name, aceitar_404=False):
+        chamadas.append(api_name)
+        time.sleep(atrasos.get(url, 0))
+        return respostas.get(url)
+
+    investigador._fazer_requisicao = fazer_requisicao
+    return investigador, chamadas
+
+
+def test_hedge_dispara_proximo_provedor_apos_atraso():
+    investigador, chamadas = _investigador_simulado(
+        {"lento": 1.0, "rapido": 0.05},
+        {"lento": {"cep": CEP, "logradouro": "Lento"},
+         "rapido": {"cep": CEP, "street": "Avenida Paulista", "city": "São Paulo", "state": "SP"}}
+    )
+
+    inicio = time.time()
+    resultado, api_name = investigador._consultar_provedores_cep(APIS, CEP, modo="hedge", hedge_delay=0.1)
+    duracao = time.time() - inicio
+
+    assert api_name == "BrasilAPI-V2"
+    assert resultado["logradouro"] == "Avenida Paulista"
+    assert duracao < 0.8
+    assert "OpenCEP" not in chamadas
+
+
+def test_race_dispara_todos_os_provedores():
+    investigador, chamadas = _investigador_simulado(
+        {"lento": 0.5, "rapido": 0.05, "falha": 0.0},
+        {"lento": {"cep": CEP}, "rapido": {"cep": CEP, "street": "Rua Rápida"}}
+    )
+
+    resultado, api_name = investigador._consultar_provedores_cep(APIS, CEP, modo="race")
+
+    assert api_name == "BrasilAPI-V2"
+    assert resultado["logradouro"] == "Rua Rápida"
+    assert set(chamadas) == {"ViaCEP", "BrasilAPI-V2", "OpenCEP"}
+
+
+def test_hedge_sem_resultado_valido():
+    investigador, chamadas = _investigador_simulado({}, {"lento": {"erro": True}})
+
+    resultado, api_name = investigador._consultar_provedores_cep(APIS, CEP, modo="hedge", hedge_delay=5)
+
+    assert resultado is None and api_name is None
+    assert chamadas == ["ViaCEP", "BrasilAPI-V2", "OpenCEP"]
+
+
+def test_sequencial_respeita_ordem():
+    investigador, chamadas = _investigador_simulado(
+        {}, {"lento": {"cep": CEP, "logradouro": "Primeira"}, "rapido": {"cep": CEP}}
+    )
+
+    resultado, api_name = investigador._consultar_provedores_cep(APIS, CEP, modo="sequencial")
+
+    assert api_name == "ViaCEP"
+    assert chamadas == ["ViaCEP"]
+
+
+def test_espera_pelos_provedores_tem_prazo(monkeypatch):
+    monkeypatch.setattr(modulo_investigador, "CEP_PRAZO_CONSULTA", 0.3)
+    investigador, _ = _investigador_simulado({"lento": 2.0, "rapido": 2.0, "falha": 2.0}, {})
+
+    inicio = time.time()
+    assert investigador._consultar_provedores_cep(APIS, CEP, modo="race") == (None, None)
+    assert time.time() - inicio < 1.0
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da extração de operadora das respostas da ABR Telecom (utils.extracao_abr)
+"""
+
+import os
+
+from utils.extracao_abr import extrair_operadora, identificar_operadora_texto
+
+PAGINAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "paginas_abr")
+
+
+def _pagina(nome):
+    with open(os.path.join(PAGINAS, nome), encoding="utf-8") as arquivo:
+        return arquivo.read()
+
+
+def test_paginas_salvas():
+    assert extrair_operadora(_pagina("resultado_div.html")) == "Claro"
+    assert extrair_operadora(_pagina("resultado_rotulo.html")) == "TIM"
+    assert extrair_operadora(_pagina("resultado_tabela.html")) == "Vivo"
+    assert extrair_operadora(_pagina("sem_resultado.html")) is None
+
+
+def test_operadora_por_palavra_inteira():
+    assert identificar_operadora_texto("Telefônica Brasil S.A.") == "Vivo"
+    assert identificar_operadora_texto("OI S.A. - EM RECUPERAÇÃO JUDICIAL") == "Oi"
+    assert identificar_operadora_texto("T.I.M. Celular") == "TIM"
+    assert identificar_operadora_texto("tente novamente à noite") is None
+    assert identificar_operadora_texto("Estimativa") is None
+    assert extrair_operadora("") is None
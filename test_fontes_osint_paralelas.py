@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da consulta paralela das fontes de dados pessoais com prazo único
+Os provedores são simulados, sem acesso à rede
+"""
+
+import time
+
+import osint_investigador
+from osint_investigador import OSINTInvestigador
+
+TELEFONE = "11987654321"
+
+
+def _resultado_base(cpf=None):
+    return {
+        "telefone": TELEFONE,
+        "dados_encontrados": False,
+        "fontes_consultadas": [],
+        "dados": {},
+        "dados_pessoais": {"cpf": cpf} if cpf else {},
+        "observacoes": []
+    }
+
+
+def _investigador_simulado(atrasos, respostas):
+    investigador = OSINTInvestigador()
+
+    def provedor(nome):
+        def consultar(*args, **kwargs):
+            time.sleep(atrasos.get(nome, 0))
+            return respostas.get(nome)
+        return consultar
+
+    investigador._consultar_direct_data_api = provedor("direct")
+    investigador._consultar_assertiva_localize_api = provedor("assertiva")
+    investigador._consultar_desk_data_api = provedor("desk")
+    investigador._consultar_antifraudebrasil_api = provedor("antifraude")
+    return investigador
+
+
+def test_provedores_em_paralelo_com_prioridade_deterministica():
+    investigador = _investigador_simulado(
+        {"direct": 0.3, "assertiva": 0.3, "desk": 0.0},
+        {"direct": {"nome": "Maria", "email": ""},
+         "assertiva": {"nome": "Maria Silva", "email": "maria@exemplo.com"},
+         "desk": {"nome": "M. Silva", "endereco": "Rua A"}}
+    )
+
+    inicio = time.time()
+    resultado = investigador._consultar_fontes_osint_publicas(_resultado_base(), TELEFONE)
+
+    assert time.time() - inicio < 0.6
+    assert resultado["dados_pessoais"]["nome"] == "Maria"
+    assert resultado["dados_pessoais"]["email"] == "maria@exemplo.com"
+    assert resultado["dados_pessoais"]["endereco"] == "Rua A"
+    assert resultado["fontes_consultadas"][:3] == ["Direct Data API", "Assertiva Localize API", "Desk Data API"]
+
+
+def test_provedor_lento_registrado_como_timeout(monkeypatch):
+    monkeypatch.setattr(osint_investigador, "OSINT_PRAZO_FONTES", 0.2)
+    investigador = _investigador_simulado(
+        {"antifraude": 1.0},
+        {"desk": {"endereco": "Rua B"}, "antifraude": {"score": 900}}
+    )
+
+    inicio = time.time()
+    resultado = investigador._consultar_fontes_osint_publicas(_resultado_base(cpf="12345678909"), TELEFONE)
+
+    assert time.time() - inicio < 0.8
+    assert "AntiFraudeBrasil API (timeout)" in resultado["fontes_consultadas"]
+    assert "score" not in resultado["dados_pessoais"]
+    assert resultado["dados_pessoais"]["endereco"] == "Rua B"
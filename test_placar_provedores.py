@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do placar de provedores e da reordenação das cadeias de fallback
+"""
+
+from utils.provedores import PlacarProvedores
+
+
+def test_ordem_estatica_sem_amostras():
+    placar = PlacarProvedores(min_amostras=3)
+    assert placar.ordenar(["ViaCEP", "BrasilAPI-V2", "OpenCEP"]) == ["ViaCEP", "BrasilAPI-V2", "OpenCEP"]
+
+
+def test_provedor_mais_rapido_primeiro():
+    placar = PlacarProvedores(min_amostras=3)
+    for _ in range(5):
+        placar.registrar("ViaCEP", True, 2.0)
+        placar.registrar("BrasilAPI-V2", True, 0.2)
+
+    assert placar.ordenar(["ViaCEP", "BrasilAPI-V2", "OpenCEP"]) == ["BrasilAPI-V2", "ViaCEP", "OpenCEP"]
+
+
+def test_provedor_degradado_vai_para_o_fim():
+    placar = PlacarProvedores(min_amostras=3, taxa_minima=0.5)
+    for _ in range(5):
+        placar.registrar("ViaCEP", False, 0.1)
+        placar.registrar("OpenCEP", True, 1.0)
+
+    apis = [{"name": "ViaCEP"}, {"name": "BrasilAPI-V2"}, {"name": "OpenCEP"}]
+    ordem = [api["name"] for api in placar.ordenar(apis, chave=lambda api: api["name"])]
+
+    assert ordem == ["OpenCEP", "BrasilAPI-V2", "ViaCEP"]
+    assert placar.estatisticas("ViaCEP")["saudavel"] is False
+
+
+def test_provedor_sem_amostras_mantem_a_posicao():
+    placar = PlacarProvedores(min_amostras=3)
+    for _ in range(5):
+        placar.registrar("BrasilAPI-V2", True, 1.0)
+        placar.registrar("OpenCEP", True, 0.2)
+
+    # ViaCEP ainda não foi medido: continua primeiro, os medidos trocam entre si
+    assert placar.ordenar(["ViaCEP", "BrasilAPI-V2", "OpenCEP"]) == ["ViaCEP", "OpenCEP", "BrasilAPI-V2"]
+
+
+def test_percentis_de_latencia():
+    placar = PlacarProvedores(janela=10)
+    for tempo in range(1, 21):
+        placar.registrar("CNPJá", True, float(tempo))
+
+    stats = placar.estatisticas("CNPJá")
+    assert stats["amostras"] == 10
+    assert stats["latencia_p50"] == 15.5
+    assert stats["taxa_sucesso"] == 1.0
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do plano de numeração (utils.plano_numeracao)
+"""
+
+import os
+
+from utils.plano_numeracao import PlanoNumeracao, plano_numeracao
+
+
+def test_classificacao_pelo_plano_versionado():
+    assert plano_numeracao.carregado
+    assert plano_numeracao.versao == "2024.1"
+    assert plano_numeracao.amostra
+
+    assert plano_numeracao.operadora("(11) 99123-4567") == "Vivo"
+    assert plano_numeracao.operadora("21912345678") == "Claro"
+    assert plano_numeracao.operadora("31905555555") == "TIM"
+    assert plano_numeracao.classificar("4133334444") == {
+        "operadora": "Vivo", "servico": "STFC", "tipo": "Fixo", "abrangencia": "Nacional", "amostra": True
+    }
+
+    assert plano_numeracao.classificar("11812345678") is None
+    assert plano_numeracao.classificar("119912") is None
+
+
+def test_linhas_invalidas_e_sobrepostas_sao_ignoradas(tmp_path):
+    arquivo = tmp_path / "plano.csv"
+    arquivo.write_text(
+        "ddd,inicio,fim,operadora,servico\n"
+        "*,90,95,A,SMP\n"
+        "*,94,99,B,SMP\n"
+        "*,x,y,C,SMP\n"
+        "1,20,29,D,STFC\n"
+        "*,30,39,E,XYZ\n",
+        encoding="utf-8"
+    )
+    plano = PlanoNumeracao(str(arquivo))
+
+    assert plano.total_faixas == 1
+    assert plano.operadora("11951234567") == "A"
+    assert plano.operadora("11961234567") is None
+
+
+def test_faixa_por_ddd_tem_prioridade(tmp_path):
+    arquivo = tmp_path / "plano.csv"
+    arquivo.write_text(
+        "# versao: 2024.2\n"
+        "# fonte: Anatel\n"
+        "ddd,inicio,fim,operadora,servico\n"
+        "*,98,98,Nacional,SMP\n"
+        "61,981,981,Local,SMP\n",
+        encoding="utf-8"
+    )
+    plano = PlanoNumeracao(str(arquivo))
+
+    assert (plano.versao, plano.fonte, plano.amostra) == ("2024.2", "Anatel", False)
+    assert plano.classificar("61981234567") == {
+        "operadora": "Local", "servico": "SMP", "tipo": "Celular", "abrangencia": "DDD", "amostra": False
+    }
+    assert plano.operadora("61982234567") == "Nacional"
+    assert plano.operadora("11981234567") == "Nacional"
+
+
+def test_recarga_quando_o_arquivo_muda(tmp_path):
+    arquivo = tmp_path / "plano.csv"
+    arquivo.write_text("ddd,inicio,fim,operadora,servico\n*,9,9,Antiga,SMP\n", encoding="utf-8")
+    plano = PlanoNumeracao(str(arquivo), intervalo_recarga=0)
+    assert plano.operadora("11991234567") == "Antiga"
+    assert not plano.recarregar()
+
+    arquivo.write_text("# versao: 2\nddd,inicio,fim,operadora,servico\n*,9,9,Nova,SMP\n", encoding="utf-8")
+    os.utime(arquivo, (1, 1))
+    assert plano.operadora("11991234567") == "Nova"
+    assert plano.versao == "2"
+
+
+def test_arquivo_ausente(tmp_path):
+    plano = PlanoNumeracao(str(tmp_path / "nao_existe.csv"))
+    assert not plano.carregado
+    assert plano.classificar("11991234567") is None
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da base local de portabilidade (utils.portabilidade)
+"""
+
+from osint_investigador import OSINTInvestigador
+from utils.cache import cache, chave_cache
+from utils.portabilidade import BasePortabilidade
+
+
+def _csv(caminho, linhas, separador=","):
+    caminho.write_text(
+        separador.join(["numero", "operadora", "data"]) + "\n" +
+        "\n".join(separador.join(linha) for linha in linhas) + "\n",
+        encoding="utf-8"
+    )
+    return str(caminho)
+
+
+def test_importacao_e_consulta(tmp_path):
+    snapshot = _csv(tmp_path / "snapshot.csv", [
+        ("(61) 98143-7533", "TIM", "2023-05-10"),
+        ("11991234567", "Vivo", "10/01/2022"),
+        ("1133334444", "Claro", "20210301"),
+        ("119912", "Oi", "2024-01-01"),
+    ], separador=";")
+    base = BasePortabilidade(str(tmp_path / "portabilidade.bin"), intervalo_recarga=None)
+    assert not base.carregada
+
+    relatorio = base.importar(snapshot)
+    assert relatorio["inseridos"] == 3
+    assert relatorio["total"] == 3
+    assert base.total == 3
+
+    assert base.consultar("61981437533") == {
+        "operadora": "TIM",
+        "data_portabilidade": "2023-05-10",
+        "fonte": "Base de portabilidade",
+        "referencia": "2023-05-10"
+    }
+    assert base.consultar("(11) 3333-4444")["operadora"] == "Claro"
+    assert base.consultar("11991234568") is None
+    assert base.consultar("123") is None
+
+
+def test_delta_insere_atualiza_e_remove(tmp_path):
+    destino = str(tmp_path / "portabilidade.bin")
+    base = BasePortabilidade(destino, intervalo_recarga=None)
+    base.importar(_csv(tmp_path / "snapshot.csv", [
+        ("11991234567", "Vivo", "2022-01-10"),
+        ("21981234567", "Claro", "2022-02-10"),
+        ("31971234567", "TIM", "2022-03-10"),
+    ]))
+
+    relatorio = base.importar(_csv(tmp_path / "delta.csv", [
+        ("11991234567", "Claro", "2024-01-01"),
+        ("21981234567", "", "2024-01-02"),
+        ("31971234567", "Oi", "2020-01-01"),
+        ("41961234567", "TIM", "2024-01-03"),
+    ]), delta=True)
+
+    assert relatorio == {"lidos": 4, "inseridos": 1, "atualizados": 1, "removidos": 1, "ignorados": 1, "total": 3}
+    assert base.consultar("11991234567")["operadora"] == "Claro"
+    assert base.consultar("21981234567") is None
+    assert base.consultar("31971234567")["operadora"] == "TIM"
+    assert base.consultar("41961234567")["operadora"] == "TIM"
+
+    # Outro processo com a mesma base enxerga o arquivo novo
+    assert BasePortabilidade(destino).consultar("41961234567")["data_portabilidade"] == "2024-01-03"
+
+
+def test_importacao_em_trechos(tmp_path, monkeypatch):
+    # Trechos de duas linhas: repetições do mesmo número caem em trechos diferentes
+    monkeypatch.setattr("utils.portabilidade.PORTABILIDADE_LOTE_ORDENACAO", 2)
+    destino = str(tmp_path / "portabilidade.bin")
+    base = BasePortabilidade(destino, intervalo_recarga=None)
+
+    relatorio = base.importar(_csv(tmp_path / "snapshot.csv", [
+        ("31971234567", "TIM", "2022-03-10"),
+        ("11991234567", "Vivo", "2022-01-10"),
+        ("11991234567", "Oi", "2021-01-10"),
+        ("21981234567", "Claro", "2022-02-10"),
+        ("11991234567", "Claro", "2022-01-10"),
+    ]))
+    assert (relatorio["inseridos"], relatorio["total"]) == (3, 3)
+    # Mesma data: vale a linha mais tardia do CSV
+    assert base.consultar("11991234567")["operadora"] == "Claro"
+    assert base.consultar("31971234567")["operadora"] == "TIM"
+
+    relatorio = base.importar(_csv(tmp_path / "delta.csv", [
+        ("21981234567", "Vivo", "2024-01-01"),
+        ("41961234567", "Oi", "2024-01-03"),
+        ("21981234567", "", "2024-01-02"),
+    ]), delta=True)
+    # A remoção é mais recente que a portabilidade do mesmo delta
+    assert relatorio == {"lidos": 3, "inseridos": 1, "atualizados": 0, "removidos": 1, "ignorados": 0, "total": 3}
+    assert base.consultar("21981234567") is None
+    assert base.consultar("41961234567")["operadora"] == "Oi"
+    assert base.consultar("11991234567")["operadora"] == "Claro"
+
+
+def test_investigador_usa_a_base_sem_rede(tmp_path, monkeypatch):
+    base = BasePortabilidade(str(tmp_path / "portabilidade.bin"), intervalo_recarga=None)
+    base.importar(_csv(tmp_path / "snapshot.csv", [("48991234567", "CLARO S.A.", "2023-01-01")]))
+    cache.delete(chave_cache("operadora", "48991234567"))
+    monkeypatch.setattr("osint_investigador.base_portabilidade", base)
+
+    investigador = OSINTInvestigador()
+    investigador.operadora_online = False
+    resolucao = investigador._resolver_operadora("48991234567")
+    assert resolucao["operadora"] == "Claro"
+    assert resolucao["fonte"] == "Base de portabilidade"
+    assert resolucao["data_portabilidade"] == "2023-01-01"
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do registro indexado de bancos (utils.registro_bancos)
+"""
+
+from osint_investigador import OSINTInvestigador
+from utils.registro_bancos import RegistroBancos
+
+LISTA_API = [
+    {"ispb": "00000000", "name": "BCO DO BRASIL S.A.", "code": 1, "fullName": "Banco do Brasil S.A."},
+    {"ispb": "60746948", "name": "BCO BRADESCO S.A.", "code": 237, "fullName": "Banco Bradesco S.A."},
+    {"ispb": "90400888", "name": "BCO SANTANDER (BRASIL) S.A.", "code": 33, "fullName": "Banco Santander (Brasil) S.A."},
+    {"ispb": "00416968", "name": "BANCO INTER", "code": 77, "fullName": "Banco Inter S.A."},
+    {"ispb": "13370835", "name": "DOCK IP S.A.", "code": None, "fullName": "Dock Instituição de Pagamento S.A."},
+]
+
+
+def test_indices_por_codigo_e_ispb():
+    registro = RegistroBancos()
+    assert registro.atualizar(LISTA_API)
+    assert not registro.atualizar(LISTA_API)
+
+    assert registro.por_codigo("1")["nome"] == "BCO DO BRASIL S.A."
+    assert registro.por_codigo("001")["ispb"] == "00000000"
+    assert registro.por_ispb("60746948")["codigo"] == "237"
+    assert registro.por_ispb("13370835")["nome"] == "DOCK IP S.A."
+
+    # A base local completa a entrada da BrasilAPI
+    inter = registro.por_codigo("077")
+    assert inter["swift"] == "BINTBRSP"
+    assert inter["fonte"] == "BrasilAPI"
+    assert registro.por_codigo("260")["fonte"] == "Base Local"
+    assert registro.por_codigo("999") is None
+
+
+def test_busca_por_nome_com_prefixo_e_erro_de_digitacao():
+    registro = RegistroBancos()
+    registro.atualizar(LISTA_API)
+
+    assert [b["codigo"] for b in registro.buscar_por_nome("bradesco")] == ["237"]
+    assert [b["codigo"] for b in registro.buscar_por_nome("banco bras")][0] == "001"
+    assert [b["codigo"] for b in registro.buscar_por_nome("santnder")] == ["033"]
+    assert registro.buscar_por_nome("") == []
+
+
+def test_reconstroi_quando_a_lista_muda():
+    registro = RegistroBancos(bancos_locais=[])
+    registro.atualizar(LISTA_API)
+    assert registro.por_codigo("341") is None
+
+    nova_lista = LISTA_API + [{"ispb": "60701190", "name": "ITAÚ UNIBANCO S.A.", "code": 341, "fullName": "Itaú Unibanco S.A."}]
+    assert registro.atualizar(nova_lista)
+    assert registro.por_codigo("341")["nome"] == "ITAÚ UNIBANCO S.A."
+    assert registro.buscar_por_nome("itau")[0]["codigo"] == "341"
+
+
+def test_investigador_usa_o_registro():
+    investigador = OSINTInvestigador()
+    investigador.consultar_bancos = lambda: {"bancos": LISTA_API, "total": len(LISTA_API)}
+
+    assert investigador.buscar_banco_por_codigo("237")["nome_completo"] == "Banco Bradesco S.A."
+    assert investigador.buscar_banco_por_codigo("90400888")["codigo"] == "033"
+    assert investigador.buscar_bancos_por_nome("inter")["bancos"][0]["codigo"] == "077"
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da cadeia de resolução de operadora (OSINTInvestigador._resolver_operadora)
+"""
+
+from osint_investigador import OSINTInvestigador
+from utils.cache import cache, chave_cache
+
+
+def _investigador(telefone, abr=None):
+    cache.delete(chave_cache("operadora", telefone))
+    investigador = OSINTInvestigador()
+    chamadas = []
+
+    def consultar_abr_telecom(numero):
+        chamadas.append(numero)
+        return abr
+
+    investigador._consultar_abr_telecom = consultar_abr_telecom
+    return investigador, chamadas
+
+
+def test_abr_consultada_uma_vez_e_resultado_memorizado():
+    investigador, chamadas = _investigador("11991230001", abr="TIM")
+
+    resolucao = investigador._resolver_operadora("11991230001")
+    assert resolucao["operadora"] == "TIM"
+    assert resolucao["confiabilidade"] == "Alta"
+    # A ABR informa a operadora atual, não se houve portabilidade
+    assert resolucao["portabilidade"] is None
+    assert [etapa["etapa"] for etapa in resolucao["etapas"]] == ["portabilidade", "abr_telecom"]
+
+    assert investigador._identificar_operadora("11", "991230001") == ["TIM"]
+    assert chamadas == ["11991230001"]
+
+
+def test_plano_de_numeracao_quando_a_abr_falha():
+    investigador, chamadas = _investigador("21912340002")
+
+    resultado = investigador.consultar_telefone("(21) 91234-0002")
+    assert resultado["operadora"] == "Claro"
+    # O plano distribuído é uma amostra: a faixa não vale mais que a heurística
+    assert resultado["confianca_operadora"] == "Muito Baixa"
+    assert resultado["fonte_operadora"] == "Plano de numeração"
+    assert resultado["portabilidade"] is None
+    assert chamadas == ["21912340002"]
+
+
+def test_operadoras_do_ddd_como_ultima_etapa():
+    investigador, chamadas = _investigador("1181230003")
+
+    resolucao = investigador._resolver_operadora("1181230003")
+    assert resolucao["operadora"] is None
+    assert resolucao["operadoras"] == ["Vivo", "Claro", "TIM"]
+    assert resolucao["etapas"][-1]["etapa"] == "heuristica"
+    assert len(chamadas) == 1
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do pool de sessões da ABR Telecom (utils.sessao_abr)
+"""
+
+import pytest
+
+from utils.circuit_breaker import CircuitBreakerRegistry
+from utils.sessao_abr import PoolSessoesABR, SessaoABR
+
+PAGINA = """
+<form action="/consultanumero/consulta/executa" method="post">
+  <input type="hidden" name="token" value="abc123">
+  <input type="text" name="numeroTelefone">
+</form>
+"""
+
+
+class Resposta:
+    def __init__(self, status_code, text="", url=""):
+        self.status_code = status_code
+        self.text = text
+        self.url = url
+
+
+class HttpFalso:
+    def __init__(self, respostas_post):
+        self.gets = []
+        self.posts = []
+        self.respostas_post = list(respostas_post)
+        self.cookies = self
+
+    def clear(self):
+        pass
+
+    def get(self, url, timeout=None):
+        self.gets.append(url)
+        return Resposta(200, PAGINA, url)
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        self.posts.append((url, data))
+        return self.respostas_post.pop(0)
+
+
+@pytest.fixture(autouse=True)
+def circuitos_novos(monkeypatch):
+    # Outros testes podem ter aberto o circuito do host real
+    monkeypatch.setattr("utils.sessao_abr.circuitos", CircuitBreakerRegistry())
+
+
+def _pool_com(http, **kwargs):
+    pool = PoolSessoesABR(**kwargs)
+    sessao = SessaoABR()
+    sessao.http = http
+    pool._livres.put(sessao)
+    return pool
+
+
+def test_formulario_preparado_uma_vez_e_reaproveitado():
+    http = HttpFalso([Resposta(200, "Prestadora: CLARO"), Resposta(200, "Prestadora: TIM")])
+    pool = _pool_com(http)
+
+    assert pool.consultar("61981437533") == "Prestadora: CLARO"
+    assert pool.consultar("11991234567") == "Prestadora: TIM"
+
+    assert len(http.gets) == 1
+    assert http.posts[0] == (
+        "https://consultanumero.abrtelecom.com.br/consultanumero/consulta/executa",
+        {"token": "abc123", "numeroTelefone": "61981437533"}
+    )
+    assert pool.resumo()["preparos"] == 1
+    assert pool.resumo()["consultas"] == 2
+
+
+def test_sessao_expirada_e_preparada_de_novo():
+    http = HttpFalso([Resposta(419), Resposta(200, "Prestadora: VIVO")])
+    pool = _pool_com(http)
+
+    assert pool.consultar("11991234567") == "Prestadora: VIVO"
+    assert len(http.gets) == 2
+    assert pool.resumo()["sessoes_expiradas"] == 1
+
+
+def test_limite_de_consultas_simultaneas():
+    pool = _pool_com(HttpFalso([]), max_concorrentes=1, espera_vaga=0.01)
+    pool._vagas.acquire()
+
+    assert pool.consultar("11991234567") is None
+    assert pool.resumo()["sem_vaga"] == 1
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do agrupamento de consultas idênticas simultâneas (single-flight)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from osint_investigador import OSINTInvestigador
+from utils.cache import cache
+from utils.concorrencia import SingleFlight
+
+
+def test_apenas_um_chamador_executa():
+    grupo = SingleFlight()
+    chamadas = []
+    barreira = threading.Barrier(10)
+
+    def buscar():
+        chamadas.append(1)
+        time.sleep(0.2)
+        return {"valor": 42}
+
+    def chamar():
+        barreira.wait()
+        return grupo.executar("cnpj_11222333000181_cnpja", buscar)
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        resultados = list(pool.map(lambda _: chamar(), range(10)))
+
+    assert len(chamadas) == 1
+    assert all(resultado == {"valor": 42} for resultado in resultados)
+    assert grupo.resumo() == {"em_andamento": 0, "chamadas_agrupadas": 9}
+
+
+def test_excecao_propagada_e_chave_liberada():
+    grupo = SingleFlight()
+
+    def falhar():
+        raise RuntimeError("origem indisponível")
+
+    with pytest.raises(RuntimeError):
+        grupo.executar("cep_01310100", falhar)
+
+    assert grupo.executar("cep_01310100", lambda: "ok") == "ok"
+
+
+def test_consultas_de_cep_simultaneas_agrupadas():
+    cache.delete("cep_01310100")
+    investigador = OSINTInvestigador()
+    chamadas = []
+
+    def consultar_provedores(apis, cep_limpo):
+        chamadas.append(cep_limpo)
+        time.sleep(0.2)
+        return {"sucesso": True, "cep": "01310-100", "logradouro": "Avenida Paulista"}, "ViaCEP"
+
+    investigador._consultar_provedores_cep = consultar_provedores
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        resultados = list(pool.map(investigador.consultar_cep, ["01310-100"] * 5))
+
+    assert chamadas == ["01310100"]
+    assert all(resultado["logradouro"] == "Avenida Paulista" for resultado in resultados)
+    cache.delete("cep_01310100")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do transporte HTTP compartilhado
+"""
+
+import requests
+
+from brasilapi_integration import BrasilAPIClient
+from osint_investigador import OSINTInvestigador
+from utils import transporte
+from config import HTTP_TIMEOUTS, HTTP_TIMEOUT_CONEXAO, REQUEST_TIMEOUT
+
+
+def test_timeout_por_host():
+    assert transporte.timeout_para("https://brasilapi.com.br/api/ddd/v1/11") == HTTP_TIMEOUTS["brasilapi.com.br"]
+    assert transporte.timeout_para("https://desconhecido.example/x") == (HTTP_TIMEOUT_CONEXAO, REQUEST_TIMEOUT)
+
+
+def test_sessoes_compartilham_o_pool():
+    investigador = OSINTInvestigador()
+    abr = transporte.nova_sessao({"User-Agent": "teste"})
+
+    assert investigador.session.get_adapter("https://brasilapi.com.br") is transporte.adapter
+    assert abr.get_adapter("https://consultanumero.abrtelecom.com.br") is transporte.adapter
+    assert investigador.session.headers["User-Agent"] == "OSINT-Investigador-BR/1.0"
+
+
+def test_sessao_sem_estado_nao_guarda_cookies():
+    from requests.cookies import MockRequest, create_cookie
+
+    requisicao = MockRequest(requests.Request("GET", "https://brasilapi.com.br/api").prepare())
+    cookie = create_cookie("sessao", "abc", domain="brasilapi.com.br")
+
+    assert not transporte.sessao.cookies.get_policy().set_ok(cookie, requisicao)
+    assert transporte.nova_sessao().cookies.get_policy().set_ok(cookie, requisicao)
+
+
+def test_clientes_usam_o_transporte(monkeypatch):
+    chamadas = []
+
+    class Resposta:
+        status_code = 200
+
+        def json(self):
+            return {"state": "SP", "cities": ["SAO PAULO"]}
+
+    def get(url, **kwargs):
+        chamadas.append((url, kwargs))
+        return Resposta()
+
+    monkeypatch.setattr(transporte, "get", get)
+    resultado = BrasilAPIClient().consultar_ddd("11")
+
+    assert resultado["sucesso"]
+    assert chamadas[0][0].endswith("/ddd/v1/11")
+    assert "timeout" not in chamadas[0][1]
@@ -0,0 +1,404 @@
+"""
+Acesso ao SQLite com uma conexão reaproveitada por thread
+
+Abrir uma conexão a cada consulta custa a abertura do arquivo, a leitura do
+esquema e a perda do cache de páginas e de statements preparados. O pool mantém
+uma conexão por thread (sqlite3 não compartilha conexões entre threads), já
+configurada com WAL, synchronous=NORMAL, mmap e cache de páginas, e com o
+cache de statements do módulo sqlite3 dimensionado por SQLITE_STATEMENTS.
+As linhas voltam como dicts (nome da coluna -> valor).
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from config import (SQLITE_MMAP_BYTES, SQLITE_CACHE_KB, SQLITE_STATEMENTS, SQLITE_TIMEOUT, SQLITE_TAMANHO_LOTE,
+                        SQLITE_BUSCA_LIMITE, SQLITE_BUSCA_LIMITE_MAXIMO)
+except ImportError:
+    SQLITE_MMAP_BYTES = 64 * 1024 * 1024
+    SQLITE_CACHE_KB = 16 * 1024
+    SQLITE_STATEMENTS = 256
+    SQLITE_TIMEOUT = 5
+    SQLITE_TAMANHO_LOTE = 1000
+    SQLITE_BUSCA_LIMITE = 50
+    SQLITE_BUSCA_LIMITE_MAXIMO = 500
+
+logger = logging.getLogger("osint_investigador")
+
+CAMPOS_PESSOA = ("cpf", "nome", "rg", "cnh", "email", "telefone", "titulo_eleitor", "pis", "cns")
+
+_INSERIR_PESSOA = (
+    f"INSERT INTO pessoas ({', '.join(CAMPOS_PESSOA)}) VALUES ({', '.join('?' * len(CAMPOS_PESSOA))})"
+)
+# Campos ausentes (None) não apagam o valor gravado, como em atualizar_pessoa
+_UPSERT_PESSOA = _INSERIR_PESSOA + " ON CONFLICT(cpf) DO UPDATE SET " + ", ".join(
+    f"{campo} = COALESCE(excluded.{campo}, {campo})" for campo in CAMPOS_PESSOA[1:]
+) + ", data_atualizacao = CURRENT_TIMESTAMP"
+_INSERIR_SE_NOVA = _INSERIR_PESSOA + " ON CONFLICT(cpf) DO NOTHING"
+
+# Nome por prefixo sem FTS5. Sem INDEXED BY o planejador percorre a chave primária a partir do
+# cursor e testa o LIKE linha a linha; com ele a faixa do prefixo vem do índice e o id é filtrado nela.
+_BUSCA_PREFIXO_NOME = ("SELECT * FROM (SELECT id FROM pessoas INDEXED BY idx_nome_nocase "
+                       "WHERE nome LIKE ? ESCAPE '\\' AND id > ? ORDER BY id LIMIT ?)")
+
+# Abaixo do limite de variáveis por statement das versões antigas do SQLite (999)
+_MAX_VARIAVEIS = 500
+
+# Índice de texto dos nomes: minúsculas, sem acentos, com índice de prefixos de 2 e 3 letras.
+# Tabela de conteúdo externo (o texto fica só em pessoas), sincronizada por triggers.
+_ESQUEMA_FTS_NOMES = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS pessoas_fts USING fts5(
+        nome, content='pessoas', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS pessoas_fts_insert AFTER INSERT ON pessoas BEGIN
+        INSERT INTO pessoas_fts(rowid, nome) VALUES (new.id, new.nome);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS pessoas_fts_delete AFTER DELETE ON pessoas BEGIN
+        INSERT INTO pessoas_fts(pessoas_fts, rowid, nome) VALUES ('delete', old.id, old.nome);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS pessoas_fts_update AFTER UPDATE OF nome ON pessoas BEGIN
+        INSERT INTO pessoas_fts(pessoas_fts, rowid, nome) VALUES ('delete', old.id, old.nome);
+        INSERT INTO pessoas_fts(rowid, nome) VALUES (new.id, new.nome);
+    END""",
+)
+
+_TOKEN = re.compile(r"\w+")
+
+
+def linha_dict(cursor: sqlite3.Cursor, linha: Tuple[Any, ...]) -> Dict[str, Any]:
+    """row_factory: linha como dict, na ordem das colunas da consulta"""
+    return dict(zip([coluna[0] for coluna in cursor.description], linha))
+
+
+class PoolSQLite:
+    """Conexões por thread a um arquivo SQLite, com os pragmas aplicados uma única vez"""
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._local = threading.local()
+
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+    def _abrir(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.caminho, timeout=SQLITE_TIMEOUT, cached_statements=SQLITE_STATEMENTS)
+        conn.row_factory = linha_dict
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA mmap_size={int(SQLITE_MMAP_BYTES)}')
+        conn.execute(f'PRAGMA cache_size={-int(SQLITE_CACHE_KB)}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+
+    def conexao(self) -> sqlite3.Connection:
+        """
+        Conexão da thread atual
+
+        Use `with pool.conexao() as conn:` nas escritas: commit ao final do bloco,
+        rollback se houver exceção (a conexão continua aberta para a próxima chamada).
+        """
+        conn = getattr(self._local, "conn", None)
+        # Um processo filho (fork) não reaproveita a conexão herdada do pai
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._abrir()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def fechar(self) -> None:
+        """Fecha a conexão da thread atual"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_pools: Dict[str, PoolSQLite] = {}
+_lock = threading.Lock()
+
+
+def pool_sqlite(caminho: str) -> PoolSQLite:
+    """Pool compartilhado por todos os usuários do mesmo arquivo"""
+    chave = os.path.abspath(caminho)
+    with _lock:
+        pool = _pools.get(chave)
+        if pool is None:
+            pool = _pools[chave] = PoolSQLite(caminho)
+        return pool
+
+
+def criar_indice_nomes(cursor: sqlite3.Cursor) -> bool:
+    """
+    Cria o índice FTS5 dos nomes e os triggers que o mantêm em dia com a tabela pessoas
+
+    Em um banco que já tinha pessoas, o índice é preenchido na criação.
+
+    Returns:
+        bool: False se o SQLite não tiver FTS5 (a busca por nome usa o prefixo em idx_nome_nocase)
+    """
+    existia = _tem_indice_nomes(cursor)
+    try:
+        for comando in _ESQUEMA_FTS_NOMES:
+            cursor.execute(comando)
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Busca de nomes por texto indisponível (FTS5): {str(e)}")
+        return False
+
+    if not existia:
+        cursor.execute("INSERT INTO pessoas_fts(pessoas_fts) VALUES ('rebuild')")
+    return True
+
+
+def _tem_indice_nomes(conn) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pessoas_fts'"
+    ).fetchone() is not None
+
+
+def consulta_fts(texto: str) -> Optional[str]:
+    """Expressão MATCH: todas as palavras do texto, em qualquer ordem, cada uma como prefixo"""
+    return " ".join(f'"{token}"*' for token in _TOKEN.findall(texto or "")) or None
+
+
+def _cpfs_existentes(conn: sqlite3.Connection, cpfs: List[str]) -> set:
+    existentes = set()
+    for inicio in range(0, len(cpfs), _MAX_VARIAVEIS):
+        parte = cpfs[inicio:inicio + _MAX_VARIAVEIS]
+        cursor = conn.execute(
+            f"SELECT cpf FROM pessoas WHERE cpf IN ({', '.join('?' * len(parte))})", parte
+        )
+        existentes.update(linha["cpf"] for linha in cursor)
+    return existentes
+
+
+def _linha_pessoa(registro: Any) -> Tuple[Optional[Tuple], Optional[str]]:
+    """Valores na ordem de CAMPOS_PESSOA, ou a mensagem de erro do registro"""
+    if not isinstance(registro, dict):
+        return None, "Registro inválido"
+    for campo in CAMPOS_PESSOA:
+        valor = registro.get(campo)
+        if valor is not None and not isinstance(valor, (str, int, float)):
+            return None, f"Valor inválido para {campo}"
+    cpf = str(registro.get("cpf") or "").strip()
+    if not cpf:
+        return None, "CPF é obrigatório"
+    return (cpf,) + tuple(registro.get(campo) for campo in CAMPOS_PESSOA[1:]), None
+
+
+def _executar_lote(conn: sqlite3.Connection, comando: str, linhas: List[Tuple]) -> Tuple[set, Dict[int, str]]:
+    """
+    Grava as linhas em uma transação
+
+    Se o executemany falhar, o lote é repetido linha a linha (um savepoint por
+    linha), para que só os registros com erro fiquem de fora.
+
+    Returns:
+        Tuple: (CPFs que já existiam, {posição da linha: mensagem de erro})
+    """
+    erros = {}
+    with conn:
+        # Reserva a escrita antes de ler quais CPFs já existem
+        conn.execute("BEGIN IMMEDIATE")
+        existentes = _cpfs_existentes(conn, list({linha[0] for linha in linhas}))
+        conn.execute("SAVEPOINT lote")
+        try:
+            conn.executemany(comando, linhas)
+        except (sqlite3.Error, OverflowError):
+            conn.execute("ROLLBACK TO lote")
+            for posicao, linha in enumerate(linhas):
+                conn.execute("SAVEPOINT linha")
+                try:
+                    conn.execute(comando, linha)
+                except (sqlite3.Error, OverflowError) as e:
+                    conn.execute("ROLLBACK TO linha")
+                    erros[posicao] = str(e)
+                conn.execute("RELEASE linha")
+        conn.execute("RELEASE lote")
+    return existentes, erros
+
+
+def gravar_pessoas(pool: PoolSQLite, registros: Iterable[Any], atualizar: bool = True,
+                   tamanho_lote: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Grava pessoas em lote, com um executemany e uma transação por lote
+
+    Os registros são lidos de forma incremental (lista, gerador ou linhas de um
+    corpo NDJSON já decodificadas) e o resultado de cada um é devolvido depois
+    do commit do seu lote. Registros com valores inválidos são recusados um a um;
+    se o executemany falhar, o lote é repetido linha a linha e só os registros
+    com erro ficam de fora. Uma falha da transação (ex.: banco travado) afeta só o lote atual.
+
+    Args:
+        pool (PoolSQLite): Pool do arquivo com a tabela pessoas
+        registros (Iterable): Dicts com os campos de CAMPOS_PESSOA (cpf obrigatório)
+        atualizar (bool): True para upsert; False mantém o registro já existente
+        tamanho_lote (int): Registros por transação (padrão: SQLITE_TAMANHO_LOTE)
+
+    Returns:
+        Iterator[Dict]: Por registro: indice, cpf e status (inserido, atualizado,
+        existente ou erro, com message)
+    """
+    tamanho_lote = max(1, int(tamanho_lote or SQLITE_TAMANHO_LOTE))
+    comando = _UPSERT_PESSOA if atualizar else _INSERIR_SE_NOVA
+    numerados = enumerate(registros)
+
+    while True:
+        lote = list(islice(numerados, tamanho_lote))
+        if not lote:
+            return
+
+        resultados = []
+        linhas = []
+        gravados = []
+        for indice, registro in lote:
+            linha, erro = _linha_pessoa(registro)
+            if erro:
+                cpf = registro.get("cpf") if isinstance(registro, dict) else None
+                resultados.append({"indice": indice, "cpf": cpf, "status": "erro", "message": erro})
+            else:
+                resultados.append({"indice": indice, "cpf": linha[0]})
+                gravados.append(resultados[-1])
+                linhas.append(linha)
+
+        if linhas:
+            try:
+                vistos, erros = _executar_lote(pool.conexao(), comando, linhas)
+            except sqlite3.Error as e:
+                for resultado in gravados:
+                    resultado.update(status="erro", message=f"Erro ao gravar lote: {str(e)}")
+            else:
+                for posicao, resultado in enumerate(gravados):
+                    if posicao in erros:
+                        resultado.update(status="erro", message=f"Erro ao gravar registro: {erros[posicao]}")
+                    elif resultado["cpf"] not in vistos:
+                        resultado["status"] = "inserido"
+                        vistos.add(resultado["cpf"])
+                    elif atualizar:
+                        resultado["status"] = "atualizado"
+                    else:
+                        resultado.update(status="existente", message="CPF já existe no banco de dados")
+
+        yield from resultados
+
+
+def criterios_busca(campos: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Critérios válidos para buscar_pessoas: só colunas de CAMPOS_PESSOA com valor preenchido"""
+    criterios = []
+    for campo, valor in campos.items():
+        if campo in CAMPOS_PESSOA and valor is not None and str(valor).strip():
+            criterios.append((campo, str(valor).strip()))
+    return criterios
+
+
+def _prefixo_like(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def buscar_pessoas(pool: PoolSQLite, criterios: List[Tuple[str, str]], limite: Optional[int] = None,
+                   cursor: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Busca cruzada paginada: pessoas que atendem a pelo menos um dos critérios
+
+    Cada critério vira uma consulta própria, resolvida pelo índice da coluna
+    (igualdade; nome pelo índice FTS5, ou por prefixo em idx_nome_nocase sem FTS5),
+    limitada às `limite` menores ids após o cursor. As consultas são unidas com
+    UNION ALL e agrupadas por id; a contagem do grupo é a relevância (quantos
+    critérios a pessoa atende). A paginação é por id (keyset): o cursor é o id
+    do último registro da página anterior.
+
+    Args:
+        pool (PoolSQLite): Pool do arquivo com a tabela pessoas
+        criterios (List[Tuple[str, str]]): Pares (campo, valor) de criterios_busca
+        limite (int): Registros por página (padrão: SQLITE_BUSCA_LIMITE)
+        cursor (int): proximo_cursor da página anterior
+
+    Returns:
+        Dict: dados (linhas com relevancia), limite e proximo_cursor (None na última página)
+    """
+    limite = min(max(1, int(limite or SQLITE_BUSCA_LIMITE)), SQLITE_BUSCA_LIMITE_MAXIMO)
+    cursor = int(cursor or 0)
+
+    conn = pool.conexao()
+    consultas = []
+    valores = []
+    for campo, valor in criterios:
+        if campo == "nome" and consulta_fts(valor) and _tem_indice_nomes(conn):
+            # Palavras em qualquer ordem, sem acentos; o FTS5 percorre o rowid em ordem
+            consultas.append("SELECT * FROM (SELECT rowid AS id FROM pessoas_fts "
+                             "WHERE pessoas_fts MATCH ? AND rowid > ? ORDER BY rowid LIMIT ?)")
+            valores.extend([consulta_fts(valor), cursor, limite + 1])
+            continue
+        if campo == "nome":
+            consultas.append(_BUSCA_PREFIXO_NOME)
+            valores.extend([_prefixo_like(valor), cursor, limite + 1])
+            continue
+        # Com LIMIT por critério, cada id da página aparece em todas as consultas que atende
+        consultas.append(f"SELECT * FROM (SELECT id FROM pessoas WHERE {campo} = ? AND id > ? ORDER BY id LIMIT ?)")
+        valores.extend([valor, cursor, limite + 1])
+
+    query = f'''
+        SELECT pessoas.*, encontrados.relevancia
+        FROM (
+            SELECT id, COUNT(*) AS relevancia
+            FROM ({' UNION ALL '.join(consultas)})
+            GROUP BY id
+            ORDER BY id
+            LIMIT ?
+        ) AS encontrados
+        JOIN pessoas ON pessoas.id = encontrados.id
+        ORDER BY pessoas.id
+    '''
+    dados = conn.execute(query, valores + [limite + 1]).fetchall()
+
+    proximo_cursor = None
+    if len(dados) > limite:
+        dados = dados[:limite]
+        proximo_cursor = dados[-1]["id"]
+
+    return {"dados": dados, "limite": limite, "proximo_cursor": proximo_cursor}
+
+
+def buscar_por_nome(pool: PoolSQLite, texto: str, limite: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Melhores resultados de uma busca de nome, ordenados por relevância (BM25)
+
+    Todas as palavras precisam aparecer no nome, em qualquer ordem, como prefixo
+    e sem diferenciar acentos ou maiúsculas ("jose concei" encontra "José da Conceição").
+
+    Args:
+        pool (PoolSQLite): Pool do arquivo com a tabela pessoas
+        texto (str): Nome ou parte dele
+        limite (int): Quantidade de resultados (padrão: SQLITE_BUSCA_LIMITE)
+
+    Returns:
+        Dict: dados (linhas com pontuacao, maior é melhor) e limite
+    """
+    limite = min(max(1, int(limite or SQLITE_BUSCA_LIMITE)), SQLITE_BUSCA_LIMITE_MAXIMO)
+    expressao = consulta_fts(texto)
+    if not expressao:
+        return {"dados": [], "limite": limite}
+
+    conn = pool.conexao()
+    if _tem_indice_nomes(conn):
+        dados = conn.execute('''
+            SELECT pessoas.*, -pessoas_fts.rank AS pontuacao
+            FROM pessoas_fts
+            JOIN pessoas ON pessoas.id = pessoas_fts.rowid
+            WHERE pessoas_fts MATCH ?
+            ORDER BY pessoas_fts.rank
+            LIMIT ?
+        ''', (expressao, limite)).fetchall()
+    else:
+        dados = conn.execute(
+            "SELECT pessoas.*, NULL AS pontuacao FROM pessoas WHERE nome LIKE ? ESCAPE '\\' ORDER BY nome LIMIT ?",
+            (_prefixo_like(texto.strip()), limite)
+        ).fetchall()
+
+    return {"dados": dados, "limite": limite}
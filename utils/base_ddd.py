@@ -0,0 +1,73 @@
+"""
+Base local de DDDs (dados/ddd_brasil.json)
+
+Os DDDs brasileiros mudam raramente; a tabela versionada junto com o código é
+carregada uma vez, na importação, em um índice de 100 posições (o próprio DDD é
+o índice), e as consultas de telefone deixam de depender da BrasilAPI.
+"""
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("osint_investigador")
+
+CAMINHO_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dados", "ddd_brasil.json")
+
+
+class BaseDDD:
+    """Índice em memória DDD -> (UF, estado, região, cidades)"""
+
+    def __init__(self, caminho: str = CAMINHO_PADRAO):
+        self.caminho = caminho
+        self.versao: Optional[str] = None
+        self._indice: List[Optional[Tuple[str, str, str, Tuple[str, ...]]]] = [None] * 100
+        self._carregar()
+
+    def _carregar(self) -> None:
+        try:
+            with open(self.caminho, encoding="utf-8") as arquivo:
+                dados = json.load(arquivo)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Base local de DDDs indisponível ({self.caminho}): {e}")
+            return
+
+        self.versao = dados.get("versao")
+        for ddd, info in dados.get("ddds", {}).items():
+            self._indice[int(ddd)] = (info["uf"], info["estado"], info["regiao"], tuple(info["cidades"]))
+
+    def _posicao(self, ddd: str) -> Optional[Tuple[str, str, str, Tuple[str, ...]]]:
+        if not ddd or len(ddd) != 2 or not ddd.isdigit():
+            return None
+        return self._indice[int(ddd)]
+
+    def existe(self, ddd: str) -> bool:
+        """Se o DDD (dois dígitos) está em uso no Brasil"""
+        return self._posicao(ddd) is not None
+
+    def obter(self, ddd: str) -> Optional[Dict[str, Any]]:
+        """
+        Dados do DDD na base local
+
+        Args:
+            ddd (str): DDD com dois dígitos
+
+        Returns:
+            Optional[Dict[str, Any]]: uf, estado, regiao e cidades, ou None se não existir
+        """
+        posicao = self._posicao(ddd)
+        if posicao is None:
+            return None
+        uf, estado, regiao, cidades = posicao
+        return {"uf": uf, "estado": estado, "regiao": regiao, "cidades": list(cidades)}
+
+    def ddds(self) -> List[str]:
+        """Todos os DDDs da base, em ordem"""
+        return [f"{ddd:02d}" for ddd, posicao in enumerate(self._indice) if posicao is not None]
+
+    @property
+    def carregada(self) -> bool:
+        return self.versao is not None
+
+
+base_ddd = BaseDDD()
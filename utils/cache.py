@@ -1,99 +1,518 @@
+import hashlib
+import heapq
+import itertools
+import json
+import sys
 import time
-from typing import Any, Optional, Dict
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Optional, Dict, Tuple
 from threading import Lock
 
 try:
-    from config import CACHE_ENABLED, CACHE_TIMEOUT
+    from config import (
+        CACHE_ENABLED, CACHE_TIMEOUT, CACHE_MAX_ITENS, CACHE_MAX_BYTES,
+        CACHE_LOTE_EXPIRACAO, CACHE_L2_ENABLED, CACHE_L2_PATH,
+        CACHE_INTERVALO_REVALIDACAO, CACHE_POLITICAS
+    )
 except ImportError:
     CACHE_ENABLED = True
     CACHE_TIMEOUT = 3600
+    CACHE_MAX_ITENS = 10000
+    CACHE_MAX_BYTES = 64 * 1024 * 1024
+    CACHE_LOTE_EXPIRACAO = 64
+    CACHE_L2_ENABLED = False
+    CACHE_L2_PATH = "cache/cache_l2.db"
+    CACHE_INTERVALO_REVALIDACAO = 30
+    CACHE_POLITICAS = {}
+
+# Chaves maiores que isto são reduzidas a "<namespace>_<sha1>"
+CHAVE_MAX_TAMANHO = 200
+
+
+def _normalizar_parte(parte: Any) -> str:
+    """Forma canônica de uma parte da chave (independente de processo e de formatação)"""
+    if parte is None:
+        return ""
+    if isinstance(parte, dict):
+        # Dicts (ex.: dados de entrada de uma consulta) viram o SHA-1 do JSON ordenado
+        normalizado = {str(k): _normalizar_parte(v) for k, v in parte.items()}
+        texto = json.dumps(normalizado, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+    if isinstance(parte, (list, tuple)):
+        return ",".join(_normalizar_parte(item) for item in parte)
+    
+    # Texto sem acentos, minúsculo e com espaços simples
+    texto = unicodedata.normalize("NFKD", str(parte))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return "-".join(texto.casefold().split())
+
+
+def chave_cache(namespace: str, *partes: Any) -> str:
+    """
+    Monta a chave canônica de cache "<namespace>_<parte>_<parte>..."
+    
+    Args:
+        namespace (str): Namespace da chave (ver CACHE_POLITICAS)
+        *partes: Partes da consulta (texto, números, listas ou dicts)
+        
+    Returns:
+        str: Chave determinística, igual em todos os workers e reinícios
+    """
+    chave = "_".join([namespace] + [_normalizar_parte(parte) for parte in partes])
+    if len(chave) > CHAVE_MAX_TAMANHO:
+        chave = f"{namespace}_{hashlib.sha1(chave.encode('utf-8')).hexdigest()}"
+    return chave
+
+
+def estimar_tamanho(value: Any) -> int:
+    """Tamanho aproximado em bytes de um valor (recursivo para containers)"""
+    tamanho = sys.getsizeof(value)
+    if isinstance(value, dict):
+        tamanho += sum(estimar_tamanho(k) + estimar_tamanho(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        tamanho += sum(estimar_tamanho(item) for item in value)
+    return tamanho
+
 
 class SimpleCache:
-    def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+    """
+    Cache em memória com TTL e despejo LRU
+    
+    As entradas ficam em um OrderedDict na ordem de uso (a mais antiga primeiro):
+    get e set são O(1) e, quando o número de entradas ou o orçamento aproximado
+    de bytes é excedido, as entradas menos usadas recentemente são removidas.
+    
+    Uma entrada gravada com stale_ttl continua guardada por mais stale_ttl segundos
+    depois de vencer: get() já não a retorna, mas get_stale() sim, indicando ao
+    chamador que deve atualizá-la (stale-while-revalidate).
+    
+    As expirações ficam em um min-heap (stale_until, seq, key): entradas vencidas
+    são recuperadas em lotes de até CACHE_LOTE_EXPIRACAO a cada set (e em
+    cleanup_expired), sem percorrer o cache inteiro com o lock. Itens do heap cujo
+    seq não bate com a entrada atual (chave removida ou regravada) são descartados
+    ao aparecer. Um segundo heap (expires_at, seq, key) mantém a contagem de
+    entradas vencidas ainda guardadas, atualizada também nas faltas do get;
+    get_stats só lê os contadores, sem remover entradas.
+    
+    O TTL, a janela stale e o tamanho máximo de cada entrada vêm da política do
+    namespace da chave (CACHE_POLITICAS), salvo quando informados no set.
+    
+    Acertos, faltas, acertos vencidos, gravações, despejos e bytes são contados por
+    namespace. O tempo entre uma falta e o set da mesma chave é o custo da busca na
+    origem; cada acerto soma a média desse custo ao tempo economizado.
+    
+    Com um cache L2 (utils.cache_persistente.CachePersistente), as gravações vão
+    para os dois níveis e uma falta no L1 é buscada no L2 e promovida ao L1 com o
+    TTL restante.
+    """
+    
+    def __init__(self, max_items: int = CACHE_MAX_ITENS, max_bytes: int = CACHE_MAX_BYTES, l2=None,
+                 politicas: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self._lock = Lock()
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._bytes = 0
+        self._evictions = 0
+        self._evicted_bytes = 0
+        self._expiracoes = []
+        # Entradas ainda não contadas como vencidas, por expires_at, e quantas já estão vencidas
+        self._vencimentos = []
+        self._vencidas = 0
+        self._seq = itertools.count()
+        self._expired_reclaimed = 0
+        self.l2 = l2
+        self._l2_hits = 0
+        
+        politica_padrao = {'ttl': CACHE_TIMEOUT, 'stale_ttl': 0, 'ttl_negativo': 300, 'max_bytes': None}
+        self._politica_padrao = politica_padrao
+        self._politicas = {
+            namespace: {**politica_padrao, **politica}
+            for namespace, politica in (CACHE_POLITICAS if politicas is None else politicas).items()
+        }
+        # Namespaces mais longos primeiro: "dados_pessoais" antes de um eventual "dados"
+        self._namespaces = sorted(self._politicas, key=len, reverse=True)
+        
+        self._metricas: Dict[str, Dict[str, float]] = {}
+        # Momento da última falta por chave, para medir o custo da busca na origem
+        self._faltas: "OrderedDict[str, float]" = OrderedDict()
+    
+    def namespace(self, key: str) -> str:
+        """Namespace da chave na tabela de políticas ("outros" se não estiver nela)"""
+        for namespace in self._namespaces:
+            if key.startswith(namespace) and (len(key) == len(namespace) or key[len(namespace)] == "_"):
+                return namespace
+        return "outros"
+    
+    def politica(self, key: str) -> Dict[str, Any]:
+        """
+        Política do namespace da chave
+        
+        Returns:
+            Dict[str, Any]: ttl, stale_ttl, ttl_negativo e max_bytes (por entrada)
+        """
+        return self._politicas.get(self.namespace(key), self._politica_padrao)
+    
+    def _metricas_de(self, key: str) -> Dict[str, float]:
+        """Contadores do namespace da chave (chamar com o lock)"""
+        namespace = self.namespace(key)
+        metricas = self._metricas.get(namespace)
+        if metricas is None:
+            metricas = self._metricas[namespace] = {
+                'hits': 0, 'misses': 0, 'stale_hits': 0, 'sets': 0, 'evictions': 0,
+                'bytes_used': 0, 'tempo_origem_total': 0.0, 'medicoes_origem': 0,
+                'tempo_economizado': 0.0
+            }
+        return metricas
+    
+    def _registrar_acerto(self, key: str, campo: str = 'hits') -> None:
+        """Conta um acerto e o tempo de origem economizado (chamar com o lock)"""
+        metricas = self._metricas_de(key)
+        metricas[campo] += 1
+        if metricas['medicoes_origem']:
+            metricas['tempo_economizado'] += metricas['tempo_origem_total'] / metricas['medicoes_origem']
+    
+    def _registrar_falta(self, key: str, agora: float) -> None:
+        """Conta uma falta e marca o início da busca na origem (chamar com o lock)"""
+        self._metricas_de(key)['misses'] += 1
+        self._faltas[key] = agora
+        self._faltas.move_to_end(key)
+        if len(self._faltas) > 1024:
+            self._faltas.popitem(last=False)
+    
+    def _obter(self, key: str) -> Tuple[Optional[Any], bool]:
+        """
+        Busca a entrada válida no L1 e, em falta, no L2 (sem contar métricas de acerto/falta)
+        
+        Returns:
+            Tuple[Optional[Any], bool]: (valor ou None, se veio do L2)
+        """
+        with self._lock:
+            if key in self._cache:
+                entry = self._cache[key]
+                agora = time.time()
+                
+                if agora > entry['stale_until']:
+                    self._remover(key)
+                    self._expired_reclaimed += 1
+                elif agora <= entry['expires_at']:
+                    entry['last_accessed'] = agora
+                    self._cache.move_to_end(key)
+                    return entry['value'], False
+                else:
+                    self._marcar_vencida(entry)
+        
+        if self.l2 is None:
+            return None, False
+        
+        # Falta no L1: busca no L2 e promove com o TTL restante
+        encontrado = self.l2.get(key)
+        if encontrado is None:
+            return None, False
+        
+        value, expires_at = encontrado
+        self._gravar_l1(key, value, expires_at, expires_at)
+        with self._lock:
+            self._l2_hits += 1
+        return value, True
     
     def get(self, key: str) -> Optional[Any]:
         if not CACHE_ENABLED:
             return None
+        
+        value, _ = self._obter(key)
+        with self._lock:
+            if value is None:
+                self._registrar_falta(key, time.time())
+            else:
+                self._registrar_acerto(key)
+        return value
+    
+    def get_stale(self, key: str, revalidar: bool = True) -> Tuple[Optional[Any], bool]:
+        """
+        Busca uma entrada aceitando valores vencidos dentro da janela stale_ttl
+        
+        Args:
+            key (str): Chave do cache
+            revalidar (bool): Se False, apenas consulta, sem reservar a atualização
+                nem contar nas métricas
             
+        Returns:
+            Tuple[Optional[Any], bool]: (valor ou None, se o chamador deve atualizar a
+            entrada). Apenas um chamador a cada CACHE_INTERVALO_REVALIDACAO segundos
+            recebe True para a mesma entrada vencida.
+        """
+        if not CACHE_ENABLED:
+            return None, False
+        
+        value, _ = self._obter(key)
+        
         with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
-                
-                if time.time() > entry['expires_at']:
-                    del self._cache[key]
-                    return None
-                
-                entry['last_accessed'] = time.time()
-                return entry['value']
+            agora = time.time()
+            if value is not None:
+                if revalidar:
+                    self._registrar_acerto(key)
+                return value, False
             
-            return None
+            entry = self._cache.get(key)
+            if entry is None or agora > entry['stale_until']:
+                if revalidar:
+                    self._registrar_falta(key, agora)
+                return None, False
+            
+            if not revalidar:
+                return entry['value'], False
+            
+            self._registrar_acerto(key, 'stale_hits')
+            atualizar = agora - entry.get('revalidado_em', 0) > CACHE_INTERVALO_REVALIDACAO
+            if atualizar:
+                entry['revalidado_em'] = agora
+                # A atualização em segundo plano também mede o custo da origem
+                self._faltas[key] = agora
+            return entry['value'], atualizar
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, stale_ttl: Optional[int] = None) -> None:
         if not CACHE_ENABLED:
             return
-            
+        
+        politica = self.politica(key)
         if ttl is None:
-            ttl = CACHE_TIMEOUT
-            
+            ttl = politica['ttl']
+        if stale_ttl is None:
+            stale_ttl = politica['stale_ttl']
+        
+        agora = time.time()
+        expires_at = agora + ttl
+        if not self._gravar_l1(key, value, expires_at, expires_at + stale_ttl):
+            # O valor anterior (já fora do L1) não pode voltar do L2 em uma falta
+            if self.l2 is not None:
+                self.l2.delete(key)
+            return
+        
+        with self._lock:
+            metricas = self._metricas_de(key)
+            metricas['sets'] += 1
+            inicio_busca = self._faltas.pop(key, None)
+            if inicio_busca is not None:
+                metricas['tempo_origem_total'] += max(agora - inicio_busca, 0.0)
+                metricas['medicoes_origem'] += 1
+        
+        if self.l2 is not None:
+            self.l2.set(key, value, expires_at)
+    
+    def _gravar_l1(self, key: str, value: Any, expires_at: float, stale_until: float) -> bool:
+        """
+        Grava a entrada no cache em memória, com despejo e recuperação de vencidas
+        
+        Returns:
+            bool: False se o valor excede o limite de tamanho e não foi guardado
+        """
+        size = estimar_tamanho(key) + estimar_tamanho(value)
+        limite_entrada = self.politica(key)['max_bytes']
+        
         with self._lock:
-            self._cache[key] = {
+            if key in self._cache:
+                self._remover(key)
+            
+            # Valores maiores que o orçamento inteiro ou que o limite do namespace não são guardados
+            if size > self.max_bytes or (limite_entrada is not None and size > limite_entrada):
+                return False
+            
+            agora = time.time()
+            entry = {
                 'value': value,
-                'created_at': time.time(),
-                'last_accessed': time.time(),
-                'expires_at': time.time() + ttl
+                'created_at': agora,
+                'last_accessed': agora,
+                'expires_at': expires_at,
+                'stale_until': stale_until,
+                'size': size,
+                'seq': next(self._seq),
+                'vencida': False
             }
+            self._cache[key] = entry
+            self._bytes += size
+            
+            self._metricas_de(key)['bytes_used'] += size
+            heapq.heappush(self._expiracoes, (stale_until, entry['seq'], key))
+            heapq.heappush(self._vencimentos, (expires_at, entry['seq'], key))
+            
+            self._atualizar_vencidas(agora, CACHE_LOTE_EXPIRACAO)
+            self._reclamar_expirados(agora, CACHE_LOTE_EXPIRACAO)
+            self._despejar()
+            self._compactar_expiracoes()
+            return True
+    
+    def _remover(self, key: str) -> Dict[str, Any]:
+        """Remove a entrada e atualiza os bytes em uso (chamar com o lock)"""
+        entry = self._cache.pop(key)
+        self._bytes -= entry['size']
+        self._metricas_de(key)['bytes_used'] -= entry['size']
+        if entry['vencida']:
+            self._vencidas -= 1
+        return entry
+    
+    def _marcar_vencida(self, entry: Dict[str, Any]) -> None:
+        """Conta a entrada como vencida uma única vez (chamar com o lock)"""
+        if not entry['vencida']:
+            entry['vencida'] = True
+            self._vencidas += 1
+    
+    def _atualizar_vencidas(self, agora: float, limite: Optional[int] = None) -> None:
+        """Marca como vencidas as entradas cujo TTL passou, pelo topo do heap (chamar com o lock)"""
+        marcadas = 0
+        while self._vencimentos and self._vencimentos[0][0] < agora and (limite is None or marcadas < limite):
+            _, seq, key = heapq.heappop(self._vencimentos)
+            entry = self._cache.get(key)
+            if entry is not None and entry['seq'] == seq:
+                self._marcar_vencida(entry)
+                marcadas += 1
+    
+    def _despejar(self) -> None:
+        """Remove as entradas menos usadas até respeitar os limites (chamar com o lock)"""
+        while self._cache and (len(self._cache) > self.max_items or self._bytes > self.max_bytes):
+            key = next(iter(self._cache))
+            entry = self._remover(key)
+            self._evictions += 1
+            self._evicted_bytes += entry['size']
+            self._metricas_de(key)['evictions'] += 1
+    
+    def _reclamar_expirados(self, agora: float, limite: int) -> int:
+        """
+        Remove até `limite` entradas vencidas pelo topo do heap (chamar com o lock)
+        
+        Returns:
+            int: Número de entradas vencidas removidas
+        """
+        removidas = 0
+        while self._expiracoes and self._expiracoes[0][0] < agora and removidas < limite:
+            _, seq, key = heapq.heappop(self._expiracoes)
+            entry = self._cache.get(key)
+            if entry is not None and entry['seq'] == seq:
+                self._remover(key)
+                removidas += 1
+        self._expired_reclaimed += removidas
+        return removidas
+    
+    def _compactar_expiracoes(self) -> None:
+        """Reconstrói o heap quando os itens descartados dominam (chamar com o lock)"""
+        if len(self._expiracoes) > 2 * len(self._cache) + 1024:
+            self._expiracoes = [(e['stale_until'], e['seq'], k) for k, e in self._cache.items()]
+            heapq.heapify(self._expiracoes)
+        if len(self._vencimentos) > 2 * len(self._cache) + 1024:
+            self._vencimentos = [(e['expires_at'], e['seq'], k) for k, e in self._cache.items() if not e['vencida']]
+            heapq.heapify(self._vencimentos)
+    
+    def _expiracao_pendente(self, agora: float) -> bool:
+        """Se ainda há entradas vencidas no heap (chamar com o lock)"""
+        while self._expiracoes:
+            expires_at, seq, key = self._expiracoes[0]
+            entry = self._cache.get(key)
+            if entry is not None and entry['seq'] == seq:
+                return expires_at < agora
+            heapq.heappop(self._expiracoes)
+        return False
     
     def delete(self, key: str) -> bool:
+        removido_l2 = self.l2.delete(key) if self.l2 is not None else False
+        
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
+                self._remover(key)
                 return True
-            return False
+            return removido_l2
     
     def clear(self) -> int:
+        if self.l2 is not None:
+            self.l2.clear()
+        
         with self._lock:
             count = len(self._cache)
             self._cache.clear()
+            self._expiracoes.clear()
+            self._vencimentos.clear()
+            self._vencidas = 0
+            self._bytes = 0
+            for metricas in self._metricas.values():
+                metricas['bytes_used'] = 0
             return count
     
     def cleanup_expired(self) -> int:
         if not CACHE_ENABLED:
             return 0
-            
-        current_time = time.time()
-        expired_keys = []
         
-        with self._lock:
-            for key, entry in self._cache.items():
-                if current_time > entry['expires_at']:
-                    expired_keys.append(key)
-            
-            for key in expired_keys:
-                del self._cache[key]
+        total = 0
         
-        return len(expired_keys)
+        # Em lotes, liberando o lock entre eles para não bloquear os gets
+        while True:
+            with self._lock:
+                removidas = self._reclamar_expirados(time.time(), CACHE_LOTE_EXPIRACAO)
+            total += removidas
+            if removidas < CACHE_LOTE_EXPIRACAO:
+                return total
     
     def get_stats(self) -> Dict[str, Any]:
         with self._lock:
             current_time = time.time()
-            total_items = len(self._cache)
-            expired_items = 0
             
-            for entry in self._cache.values():
-                if current_time > entry['expires_at']:
-                    expired_items += 1
+            # Só atualiza a contagem: as entradas vencidas são removidas em set e cleanup_expired
+            self._atualizar_vencidas(current_time)
+            backlog = self._expiracao_pendente(current_time)
+            total_items = len(self._cache)
             
             return {
                 'enabled': CACHE_ENABLED,
                 'total_items': total_items,
-                'active_items': total_items - expired_items,
-                'expired_items': expired_items,
-                'default_ttl': CACHE_TIMEOUT
+                'active_items': total_items - self._vencidas,
+                # Vencidas ainda guardadas (janela stale ou aguardando recuperação)
+                'expired_items': self._vencidas,
+                'expired_reclaimed': self._expired_reclaimed,
+                'expiry_backlog': backlog,
+                'default_ttl': CACHE_TIMEOUT,
+                'max_items': self.max_items,
+                'max_bytes': self.max_bytes,
+                'bytes_used': self._bytes,
+                'evictions': self._evictions,
+                'evicted_bytes': self._evicted_bytes,
+                'l2_enabled': self.l2 is not None,
+                'l2_hits': self._l2_hits,
+                'namespaces': {
+                    namespace: self._resumo_metricas(metricas)
+                    for namespace, metricas in sorted(self._metricas.items())
+                }
             }
     
+    @staticmethod
+    def _resumo_metricas(metricas: Dict[str, float]) -> Dict[str, Any]:
+        """Métricas de um namespace no formato de get_stats"""
+        acertos = metricas['hits'] + metricas['stale_hits']
+        consultas = acertos + metricas['misses']
+        medicoes = metricas['medicoes_origem']
+        return {
+            'hits': metricas['hits'],
+            'stale_hits': metricas['stale_hits'],
+            'misses': metricas['misses'],
+            'hit_rate': round(acertos / consultas, 4) if consultas else None,
+            'sets': metricas['sets'],
+            'evictions': metricas['evictions'],
+            'bytes_used': metricas['bytes_used'],
+            'tempo_origem_medio_ms': round(metricas['tempo_origem_total'] / medicoes * 1000, 1) if medicoes else None,
+            'tempo_economizado_s': round(metricas['tempo_economizado'], 3)
+        }
+    
     def has_key(self, key: str) -> bool:
         return self.get(key) is not None
 
-cache = SimpleCache()
\ No newline at end of file
+def _criar_cache() -> SimpleCache:
+    """Cache global; com CACHE_L2_ENABLED usa o arquivo SQLite como segundo nível"""
+    l2 = None
+    if CACHE_ENABLED and CACHE_L2_ENABLED:
+        try:
+            from utils.cache_persistente import CachePersistente
+            l2 = CachePersistente(CACHE_L2_PATH)
+        except Exception as e:
+            import logging
+            logging.getLogger("osint_investigador").warning(f"Cache L2 indisponível ({CACHE_L2_PATH}): {e}")
+    return SimpleCache(l2=l2)
+
+cache = _criar_cache()
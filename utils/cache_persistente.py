@@ -0,0 +1,137 @@
+"""
+Cache persistente de segundo nível (L2) para OSINT Investigador BR
+
+Guarda as entradas do SimpleCache em um arquivo SQLite em modo WAL, de forma
+que workers do gunicorn e reinícios/deploys compartilhem o cache já aquecido.
+Os valores (dicts e listas compatíveis com JSON) são serializados em JSON e
+comprimidos com zlib. Nada lido do arquivo é executado: um arquivo adulterado
+produz no máximo uma entrada inválida, tratada como ausente.
+"""
+import logging
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger("osint_investigador")
+
+# A cada quantas gravações as entradas vencidas são apagadas do arquivo
+INTERVALO_LIMPEZA = 256
+
+
+class CachePersistente:
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._local = threading.local()
+        self._gravacoes = 0
+        self._lock = threading.Lock()
+
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+        with self._conexao() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache_l2 (
+                    chave TEXT PRIMARY KEY,
+                    valor BLOB NOT NULL,
+                    expira_em REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_l2_expira_em ON cache_l2(expira_em)')
+
+    def _conexao(self) -> sqlite3.Connection:
+        """Conexão da thread atual (sqlite3 não compartilha conexões entre threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.caminho, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _codificar(valor: Any) -> bytes:
+        return zlib.compress(json.dumps(valor, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def _decodificar(dados: bytes) -> Any:
+        return json.loads(zlib.decompress(dados).decode("utf-8"))
+
+    def get(self, chave: str) -> Optional[Tuple[Any, float]]:
+        """
+        Busca uma entrada válida
+
+        Returns:
+            Optional[Tuple[Any, float]]: (valor, expira_em) ou None se ausente/vencida
+        """
+        try:
+            linha = self._conexao().execute(
+                'SELECT valor, expira_em FROM cache_l2 WHERE chave = ? AND expira_em > ?',
+                (chave, time.time())
+            ).fetchone()
+            if linha is None:
+                return None
+            return self._decodificar(linha[0]), linha[1]
+        except Exception as e:
+            logger.warning(f"Erro ao ler cache L2 ({chave}): {e}")
+            return None
+
+    def set(self, chave: str, valor: Any, expira_em: float) -> None:
+        try:
+            with self._conexao() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO cache_l2 (chave, valor, expira_em) VALUES (?, ?, ?)',
+                    (chave, self._codificar(valor), expira_em)
+                )
+
+            with self._lock:
+                self._gravacoes += 1
+                limpar = self._gravacoes % INTERVALO_LIMPEZA == 0
+            if limpar:
+                self.cleanup_expired()
+        except Exception as e:
+            logger.warning(f"Erro ao gravar cache L2 ({chave}): {e}")
+
+    def delete(self, chave: str) -> bool:
+        try:
+            with self._conexao() as conn:
+                return conn.execute('DELETE FROM cache_l2 WHERE chave = ?', (chave,)).rowcount > 0
+        except Exception as e:
+            logger.warning(f"Erro ao remover do cache L2 ({chave}): {e}")
+            return False
+
+    def clear(self) -> int:
+        try:
+            with self._conexao() as conn:
+                return conn.execute('DELETE FROM cache_l2').rowcount
+        except Exception as e:
+            logger.warning(f"Erro ao limpar cache L2: {e}")
+            return 0
+
+    def cleanup_expired(self) -> int:
+        try:
+            with self._conexao() as conn:
+                return conn.execute('DELETE FROM cache_l2 WHERE expira_em <= ?', (time.time(),)).rowcount
+        except Exception as e:
+            logger.warning(f"Erro ao limpar entradas vencidas do cache L2: {e}")
+            return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        try:
+            total, ativos, tamanho = self._conexao().execute(
+                'SELECT COUNT(*), SUM(expira_em > ?), SUM(LENGTH(valor)) FROM cache_l2',
+                (time.time(),)
+            ).fetchone()
+            return {
+                'path': self.caminho,
+                'total_items': total,
+                'active_items': ativos or 0,
+                'bytes_used': tamanho or 0
+            }
+        except Exception as e:
+            logger.warning(f"Erro ao obter estatísticas do cache L2: {e}")
+            return {'path': self.caminho, 'erro': str(e)}
@@ -0,0 +1,134 @@
+"""
+Circuit breakers por host externo para OSINT Investigador BR
+
+Estados:
+- closed: requisições passam normalmente; falhas consecutivas são contadas
+- open: requisições são recusadas até o fim do tempo de recuperação
+- half_open: uma única requisição de sonda é liberada; sucesso fecha o
+  circuito, falha o reabre
+"""
+import time
+from threading import Lock
+from typing import Any, Dict
+from urllib.parse import urlparse
+
+try:
+    from config import CIRCUIT_LIMITE_FALHAS, CIRCUIT_TEMPO_RECUPERACAO
+except ImportError:
+    CIRCUIT_LIMITE_FALHAS = 5
+    CIRCUIT_TEMPO_RECUPERACAO = 30
+
+FECHADO = "closed"
+ABERTO = "open"
+MEIO_ABERTO = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, nome: str, limite_falhas: int = CIRCUIT_LIMITE_FALHAS,
+                 tempo_recuperacao: float = CIRCUIT_TEMPO_RECUPERACAO):
+        self.nome = nome
+        self.limite_falhas = limite_falhas
+        self.tempo_recuperacao = tempo_recuperacao
+        self._estado = FECHADO
+        self._falhas_consecutivas = 0
+        self._aberto_em = 0.0
+        self._sonda_iniciada_em = None
+        self._total_recusadas = 0
+        self._lock = Lock()
+
+    def permitir_requisicao(self) -> bool:
+        """
+        Informa se uma requisição ao host pode ser feita agora
+
+        Returns:
+            bool: True se a requisição pode seguir (no estado half_open, apenas
+            o primeiro chamador recebe True e atua como sonda)
+        """
+        with self._lock:
+            agora = time.time()
+
+            if self._estado == ABERTO and agora - self._aberto_em >= self.tempo_recuperacao:
+                self._estado = MEIO_ABERTO
+                self._sonda_iniciada_em = None
+
+            if self._estado == FECHADO:
+                return True
+
+            if self._estado == MEIO_ABERTO:
+                # Libera uma nova sonda se a anterior nunca reportou o resultado
+                sonda_perdida = (self._sonda_iniciada_em is not None
+                                 and agora - self._sonda_iniciada_em >= self.tempo_recuperacao)
+                if self._sonda_iniciada_em is None or sonda_perdida:
+                    self._sonda_iniciada_em = agora
+                    return True
+
+            self._total_recusadas += 1
+            return False
+
+    def registrar_sucesso(self) -> None:
+        with self._lock:
+            self._estado = FECHADO
+            self._falhas_consecutivas = 0
+            self._sonda_iniciada_em = None
+
+    def registrar_falha(self) -> None:
+        with self._lock:
+            self._falhas_consecutivas += 1
+            if self._estado == MEIO_ABERTO or self._falhas_consecutivas >= self.limite_falhas:
+                self._estado = ABERTO
+                self._aberto_em = time.time()
+                self._sonda_iniciada_em = None
+
+    @property
+    def estado(self) -> str:
+        with self._lock:
+            if self._estado == ABERTO and time.time() - self._aberto_em >= self.tempo_recuperacao:
+                return MEIO_ABERTO
+            return self._estado
+
+    def resumo(self) -> Dict[str, Any]:
+        estado = self.estado
+        with self._lock:
+            return {
+                "estado": estado,
+                "falhas_consecutivas": self._falhas_consecutivas,
+                "limite_falhas": self.limite_falhas,
+                "tempo_recuperacao": self.tempo_recuperacao,
+                "aberto_em": self._aberto_em if estado != FECHADO else None,
+                "requisicoes_recusadas": self._total_recusadas
+            }
+
+
+class CircuitBreakerRegistry:
+    def __init__(self, limite_falhas: int = CIRCUIT_LIMITE_FALHAS,
+                 tempo_recuperacao: float = CIRCUIT_TEMPO_RECUPERACAO):
+        self._circuitos: Dict[str, CircuitBreaker] = {}
+        self._limite_falhas = limite_falhas
+        self._tempo_recuperacao = tempo_recuperacao
+        self._lock = Lock()
+
+    def obter(self, url_ou_host: str) -> CircuitBreaker:
+        """
+        Retorna o circuit breaker do host (criado na primeira utilização)
+
+        Args:
+            url_ou_host (str): URL completa ou nome do host
+        """
+        host = urlparse(url_ou_host).netloc if "://" in url_ou_host else url_ou_host
+        host = host.lower()
+
+        with self._lock:
+            circuito = self._circuitos.get(host)
+            if circuito is None:
+                circuito = self._circuitos[host] = CircuitBreaker(
+                    host, self._limite_falhas, self._tempo_recuperacao
+                )
+            return circuito
+
+    def resumo(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            circuitos = list(self._circuitos.values())
+        return {circuito.nome: circuito.resumo() for circuito in circuitos}
+
+
+circuitos = CircuitBreakerRegistry()
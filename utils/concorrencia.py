@@ -0,0 +1,84 @@
+"""
+Utilitários de concorrência para OSINT Investigador BR
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict
+
+try:
+    from config import MAX_WORKERS_CONSULTAS, MAX_WORKERS_SEGUNDO_PLANO
+except ImportError:
+    MAX_WORKERS_CONSULTAS = 32
+    MAX_WORKERS_SEGUNDO_PLANO = 4
+
+
+# Executor compartilhado para consultas paralelas a APIs externas
+executor = ThreadPoolExecutor(
+    max_workers=MAX_WORKERS_CONSULTAS,
+    thread_name_prefix="osint-consulta"
+)
+
+# Executor das atualizações de cache em segundo plano. Essas tarefas disparam
+# consultas no executor compartilhado e aguardam o resultado; se rodassem nele,
+# poderiam ocupar todas as threads esperando tarefas que nunca começam.
+executor_segundo_plano = ThreadPoolExecutor(
+    max_workers=MAX_WORKERS_SEGUNDO_PLANO,
+    thread_name_prefix="osint-segundo-plano"
+)
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas idênticas em andamento: para cada chave, apenas o primeiro
+    chamador executa a função e os demais aguardam e recebem o mesmo resultado
+    (ou a mesma exceção).
+    """
+
+    def __init__(self):
+        self._em_andamento: Dict[str, Future] = {}
+        self._agrupadas = 0
+        self._lock = Lock()
+
+    def executar(self, chave: str, funcao: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Executa funcao(*args, **kwargs) uma única vez por chave em andamento
+
+        Args:
+            chave (str): Chave da operação (a mesma usada no cache)
+            funcao (callable): Função que busca o valor na origem
+
+        Returns:
+            Any: Resultado da função
+        """
+        with self._lock:
+            futuro = self._em_andamento.get(chave)
+            lider = futuro is None
+            if lider:
+                futuro = self._em_andamento[chave] = Future()
+            else:
+                self._agrupadas += 1
+
+        if not lider:
+            return futuro.result()
+
+        try:
+            resultado = funcao(*args, **kwargs)
+            futuro.set_result(resultado)
+            return resultado
+        except BaseException as e:
+            futuro.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._em_andamento[chave]
+
+    def resumo(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "em_andamento": len(self._em_andamento),
+                "chamadas_agrupadas": self._agrupadas
+            }
+
+
+# Agrupamento global de consultas idênticas simultâneas
+single_flight = SingleFlight()
@@ -0,0 +1,100 @@
+"""
+Extração da operadora das respostas do Consulta Número da ABR Telecom
+
+Em camadas, da mais barata para a mais cara:
+1. regex pré-compiladas sobre o HTML bruto: elementos com id/classe
+   resultado/operadora/prestadora e o texto após o rótulo "Prestadora"/"Operadora";
+2. parse restrito às tabelas (SoupStrainer), sem montar a árvore da página inteira;
+3. varredura do texto da página sem tags.
+"""
+import re
+from typing import Optional
+
+_FLAGS = re.IGNORECASE | re.DOTALL
+
+# Elemento com id ou classe de resultado; o conteúdo vai até o fechamento da mesma tag
+_ELEMENTO_RESULTADO = re.compile(
+    r'<(?P<tag>[a-z][a-z0-9]*)\b[^>]*?\b(?:id|class)\s*=\s*["\'][^"\']*?\b(?:resultado|operadora|prestadora)\b[^"\']*["\'][^>]*>'
+    r'(?P<conteudo>.*?)</(?P=tag)\s*>',
+    _FLAGS
+)
+
+# Rótulo seguido do valor, com tags, espaços e ":" no meio
+_ROTULO = re.compile(
+    r'\b(?:prestadora|operadora)\b(?:\s|&nbsp;|<[^>]*>)*[:\-]?(?:\s|&nbsp;|<[^>]*>)*(?P<valor>[^<]{2,80})',
+    _FLAGS
+)
+
+_TAG = re.compile(r'<[^>]*>')
+_SCRIPT_ESTILO = re.compile(r'<(script|style)\b.*?</\1\s*>', _FLAGS)
+
+# Nomes e razões sociais por operadora (palavras inteiras: "OI" não casa com "NOITE")
+_OPERADORAS = [
+    ("Vivo", r'VIVO|TELEF[OÔ]NICA'),
+    ("Claro", r'CLARO'),
+    ("TIM", r'TIM|T\.I\.M\.|TELECOM\s+ITALIA'),
+    ("Oi", r'OI|TELEMAR'),
+    ("Nextel", r'NEXTEL'),
+    ("Algar", r'ALGAR'),
+    ("Sercomtel", r'SERCOMTEL'),
+    ("Unifique", r'UNIFIQUE'),
+]
+_OPERADORA = re.compile(
+    r'(?<![\w.])(?:' + "|".join(f"(?P<op{posicao}>{padrao})" for posicao, (_, padrao) in enumerate(_OPERADORAS)) + r')(?![\w])',
+    re.IGNORECASE
+)
+
+
+def identificar_operadora_texto(texto: str) -> Optional[str]:
+    """Primeira operadora citada no texto, com o nome normalizado (Vivo, Claro, TIM, Oi...)"""
+    encontrada = _OPERADORA.search(texto or "")
+    if not encontrada:
+        return None
+    return _OPERADORAS[int(encontrada.lastgroup[2:])][0]
+
+
+def _extrair_por_regex(html: str) -> Optional[str]:
+    for encontrado in _ELEMENTO_RESULTADO.finditer(html):
+        operadora = identificar_operadora_texto(_TAG.sub(" ", encontrado.group("conteudo")))
+        if operadora:
+            return operadora
+
+    for encontrado in _ROTULO.finditer(html):
+        operadora = identificar_operadora_texto(encontrado.group("valor"))
+        if operadora:
+            return operadora
+    return None
+
+
+def _extrair_de_tabelas(html: str) -> Optional[str]:
+    if "<table" not in html and "<TABLE" not in html:
+        return None
+
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    tabelas = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("table"))
+    for celula in tabelas.find_all(["td", "th"]):
+        operadora = identificar_operadora_texto(celula.get_text())
+        if operadora:
+            return operadora
+    return None
+
+
+def extrair_operadora(html: str) -> Optional[str]:
+    """
+    Operadora informada em uma resposta HTML da ABR Telecom
+
+    Args:
+        html (str): Corpo da resposta
+
+    Returns:
+        Optional[str]: Nome normalizado da operadora, ou None se não encontrada
+    """
+    if not html:
+        return None
+
+    return (
+        _extrair_por_regex(html)
+        or _extrair_de_tabelas(html)
+        or identificar_operadora_texto(_TAG.sub(" ", _SCRIPT_ESTILO.sub(" ", html)))
+    )
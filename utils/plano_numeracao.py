@@ -0,0 +1,214 @@
+"""
+Plano de numeração: faixas de número -> operadora (dados/plano_numeracao.csv)
+
+As faixas do CSV (no formato das tabelas da Anatel: DDD, início e fim da faixa,
+prestadora e serviço) são compiladas em listas ordenadas de inteiros; uma
+classificação é uma busca binária (bisect) por nível, DDD e depois nacional.
+O arquivo é relido quando muda no disco e o índice novo substitui o antigo de
+uma só vez, sem bloquear as consultas em andamento.
+
+O cabeçalho do CSV traz os metadados em comentários "# chave: valor": versao,
+fonte e amostra. Um arquivo marcado com "amostra: sim" tem faixas ilustrativas,
+e as classificações dele saem marcadas como amostra.
+"""
+import bisect
+import csv
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from config import PLANO_NUMERACAO_PATH, PLANO_NUMERACAO_INTERVALO_RECARGA
+except ImportError:
+    PLANO_NUMERACAO_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dados", "plano_numeracao.csv"
+    )
+    PLANO_NUMERACAO_INTERVALO_RECARGA = 30
+
+logger = logging.getLogger("osint_investigador")
+
+# Dígitos do número do assinante (sem DDD) por serviço
+DIGITOS_SERVICO = {"SMP": 9, "STFC": 8}
+TIPO_SERVICO = {"SMP": "Celular", "STFC": "Fixo"}
+
+
+def _chave(digitos: str) -> int:
+    """Inteiro ordenável de um número; o comprimento separa números de 8, 9, 10 e 11 dígitos"""
+    return len(digitos) * 10 ** 11 + int(digitos)
+
+
+class _Faixas:
+    """Faixas sem sobreposição em listas paralelas ordenadas pelo início"""
+
+    def __init__(self, faixas: List[Tuple[int, int, str, str]]):
+        self.inicios: List[int] = []
+        self.fins: List[int] = []
+        self.valores: List[Tuple[str, str]] = []
+
+        for inicio, fim, operadora, servico in sorted(faixas):
+            if self.fins and inicio <= self.fins[-1]:
+                logger.warning(f"Faixa sobreposta ignorada no plano de numeração: {operadora} {inicio}-{fim}")
+                continue
+            self.inicios.append(inicio)
+            self.fins.append(fim)
+            self.valores.append((operadora, servico))
+
+    def buscar(self, chave: int) -> Optional[Tuple[str, str]]:
+        posicao = bisect.bisect_right(self.inicios, chave) - 1
+        if posicao >= 0 and chave <= self.fins[posicao]:
+            return self.valores[posicao]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.inicios)
+
+
+class PlanoNumeracao:
+    """Índice de faixas de numeração com recarga automática do arquivo"""
+
+    def __init__(self, caminho: str = PLANO_NUMERACAO_PATH,
+                 intervalo_recarga: float = PLANO_NUMERACAO_INTERVALO_RECARGA):
+        self.caminho = caminho
+        self.intervalo_recarga = intervalo_recarga
+        self.versao: Optional[str] = None
+        self.fonte: Optional[str] = None
+        self.amostra = False
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._verificado_em = 0.0
+        self._faixas = (_Faixas([]), _Faixas([]))  # (por DDD, nacional)
+        self.recarregar(forcar=True)
+
+    def _ler(self) -> Tuple[Dict[str, str], _Faixas, _Faixas]:
+        metadados: Dict[str, str] = {}
+        por_ddd, nacional = [], []
+
+        with open(self.caminho, encoding="utf-8", newline="") as arquivo:
+            linhas = []
+            for linha in arquivo:
+                if linha.startswith("#"):
+                    chave, separador, valor = linha[1:].partition(":")
+                    if separador and chave.strip() in ("versao", "fonte", "amostra"):
+                        metadados[chave.strip()] = valor.strip()
+                    continue
+                linhas.append(linha)
+
+        for numero_linha, registro in enumerate(csv.DictReader(linhas), start=2):
+            try:
+                servico = registro["servico"].strip().upper()
+                digitos = DIGITOS_SERVICO[servico]
+                ddd = registro["ddd"].strip()
+                inicio = registro["inicio"].strip().ljust(digitos, "0")
+                fim = registro["fim"].strip().ljust(digitos, "9")
+                if not (inicio.isdigit() and fim.isdigit()) or len(inicio) != digitos or len(fim) != digitos:
+                    raise ValueError("faixa inválida")
+                operadora = registro["operadora"].strip()
+            except (KeyError, ValueError, AttributeError) as e:
+                logger.warning(f"Linha {numero_linha} ignorada em {self.caminho}: {e}")
+                continue
+
+            if ddd == "*":
+                nacional.append((_chave(inicio), _chave(fim), operadora, servico))
+            elif len(ddd) == 2 and ddd.isdigit():
+                por_ddd.append((_chave(ddd + inicio), _chave(ddd + fim), operadora, servico))
+            else:
+                logger.warning(f"Linha {numero_linha} ignorada em {self.caminho}: DDD inválido {ddd!r}")
+
+        return metadados, _Faixas(por_ddd), _Faixas(nacional)
+
+    def recarregar(self, forcar: bool = False) -> bool:
+        """
+        Recompila o índice se o arquivo mudou desde a última leitura
+
+        Args:
+            forcar (bool): Recompila mesmo sem mudança no arquivo
+
+        Returns:
+            bool: True se o índice foi recompilado
+        """
+        with self._lock:
+            self._verificado_em = time.monotonic()
+            try:
+                mtime = os.stat(self.caminho).st_mtime
+            except OSError as e:
+                if forcar:
+                    logger.warning(f"Plano de numeração indisponível ({self.caminho}): {e}")
+                return False
+
+            if not forcar and mtime == self._mtime:
+                return False
+
+            try:
+                metadados, por_ddd, nacional = self._ler()
+            except (OSError, csv.Error) as e:
+                logger.warning(f"Erro ao ler o plano de numeração ({self.caminho}): {e}")
+                return False
+
+            # Troca atômica: consultas em andamento terminam com o índice anterior
+            self._faixas = (por_ddd, nacional)
+            self.versao = metadados.get("versao")
+            self.fonte = metadados.get("fonte")
+            self.amostra = metadados.get("amostra", "").lower() in ("sim", "true")
+            self._mtime = mtime
+            logger.info(f"Plano de numeração carregado: {len(por_ddd) + len(nacional)} faixas (versão {self.versao})")
+            if self.amostra:
+                logger.warning(f"Plano de numeração de amostra ({self.caminho}): as operadoras por faixa são ilustrativas")
+            return True
+
+    def _verificar_recarga(self) -> None:
+        if self.intervalo_recarga is not None and time.monotonic() - self._verificado_em >= self.intervalo_recarga:
+            self.recarregar()
+
+    def classificar(self, telefone: str) -> Optional[Dict[str, Any]]:
+        """
+        Operadora de origem de um telefone pelo plano de numeração
+
+        Args:
+            telefone (str): Telefone com DDD (10 ou 11 dígitos, com ou sem formatação)
+
+        Returns:
+            Optional[Dict[str, Any]]: operadora, servico (SMP/STFC), tipo, abrangencia
+            da faixa e amostra (arquivo de amostra), ou None se o número não estiver
+            em nenhuma faixa
+        """
+        digitos = "".join(filter(str.isdigit, telefone or ""))
+        if len(digitos) not in (10, 11):
+            return None
+        self._verificar_recarga()
+
+        por_ddd, nacional = self._faixas
+        encontrado = por_ddd.buscar(_chave(digitos))
+        abrangencia = "DDD"
+        if encontrado is None:
+            encontrado = nacional.buscar(_chave(digitos[2:]))
+            abrangencia = "Nacional"
+        if encontrado is None:
+            return None
+
+        operadora, servico = encontrado
+        return {
+            "operadora": operadora,
+            "servico": servico,
+            "tipo": TIPO_SERVICO[servico],
+            "abrangencia": abrangencia,
+            "amostra": self.amostra
+        }
+
+    def operadora(self, telefone: str) -> Optional[str]:
+        """Apenas o nome da operadora de origem, ou None"""
+        resultado = self.classificar(telefone)
+        return resultado["operadora"] if resultado else None
+
+    @property
+    def total_faixas(self) -> int:
+        por_ddd, nacional = self._faixas
+        return len(por_ddd) + len(nacional)
+
+    @property
+    def carregado(self) -> bool:
+        return self._mtime is not None
+
+
+plano_numeracao = PlanoNumeracao()
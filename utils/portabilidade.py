@@ -0,0 +1,424 @@
+"""
+Base local de portabilidade numérica (número -> operadora atual)
+
+Um snapshot de portabilidade (CSV com número, operadora e data da
+portabilidade) é importado para um arquivo binário com três vetores paralelos
+ordenados pelo número: chaves de 64 bits, datas (AAAAMMDD, 32 bits) e códigos
+de operadora (8 bits, o nome fica no cabeçalho). O arquivo é aberto com mmap e
+consultado com busca binária, sem carregar os vetores na memória do processo e
+sem acessar a rede. Arquivos delta (portabilidades novas e retornos à operadora
+de origem) são mesclados ao arquivo atual; o arquivo novo substitui o antigo de
+uma só vez e é reaberto pelos processos na próxima verificação.
+
+A importação não mantém o snapshot em memória: o CSV é lido em trechos de
+PORTABILIDADE_LOTE_ORDENACAO linhas, cada trecho é ordenado e gravado em um
+arquivo temporário, e os trechos são intercalados com a base atual direto para
+o arquivo novo.
+"""
+import array
+import bisect
+import csv
+import functools
+import heapq
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from config import PORTABILIDADE_PATH, PORTABILIDADE_INTERVALO_RECARGA, PORTABILIDADE_LOTE_ORDENACAO
+except ImportError:
+    PORTABILIDADE_PATH = os.path.join("cache", "portabilidade.bin")
+    PORTABILIDADE_INTERVALO_RECARGA = 30
+    PORTABILIDADE_LOTE_ORDENACAO = 500000
+
+logger = logging.getLogger("osint_investigador")
+
+MAGICO = b"OSPB"
+VERSAO_FORMATO = 1
+# mágico, versão do formato, total de números, tamanho dos metadados (JSON)
+CABECALHO = struct.Struct("<4sHxxQI4x")
+MAX_OPERADORAS = 255
+# Registro de um trecho ordenado: número, data e código da operadora no CSV
+REGISTRO_TRECHO = struct.Struct("<QIB")
+# Código dos registros de remoção em um delta (fora da faixa das operadoras)
+CODIGO_REMOCAO = 255
+# Registros por leitura/gravação dos arquivos temporários
+BLOCO = 65536
+
+# Operadora vazia (ou "-") em um delta: o número voltou à operadora de origem
+REMOCAO = ("", "-")
+
+FORMATOS_DATA = ("%Y-%m-%d", "%d/%m/%Y", "%Y%m%d")
+
+
+def _alinhar(tamanho: int) -> int:
+    return (tamanho + 7) & ~7
+
+
+@functools.lru_cache(maxsize=4096)
+def _data_numerica(texto: str) -> int:
+    """Data AAAAMMDD como inteiro (0 sem data); snapshots repetem poucas datas"""
+    texto = (texto or "").strip()
+    if not texto:
+        return 0
+    for formato in FORMATOS_DATA:
+        try:
+            return int(datetime.strptime(texto, formato).strftime("%Y%m%d"))
+        except ValueError:
+            continue
+    raise ValueError(f"data inválida {texto!r}")
+
+
+def _ler_registros(caminho: str) -> Iterator[Tuple[int, str, int]]:
+    """(número, operadora, data AAAAMMDD) de um CSV com cabeçalho numero, operadora e data"""
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        amostra = arquivo.readline()
+        arquivo.seek(0)
+        delimitador = ";" if amostra.count(";") > amostra.count(",") else ","
+
+        for numero_linha, registro in enumerate(csv.DictReader(arquivo, delimiter=delimitador), start=2):
+            try:
+                numero = "".join(filter(str.isdigit, registro["numero"]))
+                if len(numero) not in (10, 11):
+                    raise ValueError(f"número inválido {registro['numero']!r}")
+                yield int(numero), (registro.get("operadora") or "").strip(), _data_numerica(registro.get("data"))
+            except (KeyError, ValueError, TypeError) as e:
+                logger.warning(f"Linha {numero_linha} ignorada em {caminho}: {e}")
+
+
+class _Arquivo:
+    """Arquivo de portabilidade aberto com mmap"""
+
+    def __init__(self, caminho: str):
+        with open(caminho, "rb") as arquivo:
+            self._mmap = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magico, versao, total, tamanho_meta = CABECALHO.unpack_from(self._mmap, 0)
+        if magico != MAGICO or versao != VERSAO_FORMATO:
+            raise ValueError("arquivo de portabilidade com formato desconhecido")
+        if sys.byteorder != "little":
+            raise ValueError("vetores gravados em little-endian não podem ser mapeados nesta plataforma")
+
+        inicio = CABECALHO.size
+        self.metadados: Dict[str, Any] = json.loads(self._mmap[inicio:inicio + tamanho_meta].decode("utf-8"))
+        self.operadoras: List[str] = self.metadados["operadoras"]
+
+        visao = memoryview(self._mmap)
+        inicio = _alinhar(inicio + tamanho_meta)
+        self.chaves = visao[inicio:inicio + 8 * total].cast("Q")
+        inicio += 8 * total
+        self.datas = visao[inicio:inicio + 4 * total].cast("I")
+        inicio += 4 * total
+        self.codigos = visao[inicio:inicio + total]
+        self.total = total
+
+    def buscar(self, chave: int) -> Optional[Tuple[str, int]]:
+        posicao = bisect.bisect_left(self.chaves, chave)
+        if posicao < self.total and self.chaves[posicao] == chave:
+            return self.operadoras[self.codigos[posicao]], self.datas[posicao]
+        return None
+
+    def registros(self) -> Iterator[Tuple[int, str, int]]:
+        for posicao in range(self.total):
+            yield self.chaves[posicao], self.operadoras[self.codigos[posicao]], self.datas[posicao]
+
+
+def _gravar_trecho(diretorio: str, trecho: List[Tuple[int, int, int, int]]) -> str:
+    """Ordena um trecho do CSV e grava o registro mais recente de cada número"""
+    trecho.sort()
+    descritor, caminho = tempfile.mkstemp(suffix=".trecho", dir=diretorio)
+    with os.fdopen(descritor, "wb") as arquivo:
+        buffer = bytearray()
+        ultimo = len(trecho) - 1
+        for posicao, (numero, data, _, codigo) in enumerate(trecho):
+            # Ordenado por (número, data, linha): o último de cada número é o que vale
+            if posicao < ultimo and trecho[posicao + 1][0] == numero:
+                continue
+            buffer += REGISTRO_TRECHO.pack(numero, data, codigo)
+            if len(buffer) >= BLOCO * REGISTRO_TRECHO.size:
+                arquivo.write(buffer)
+                buffer.clear()
+        arquivo.write(buffer)
+    return caminho
+
+
+def _ler_trecho(caminho: str, ordem: int) -> Iterator[Tuple[int, int, int, int]]:
+    """(número, data, ordem do trecho, código) de um trecho gravado por _gravar_trecho"""
+    with open(caminho, "rb") as arquivo:
+        while True:
+            bloco = arquivo.read(BLOCO * REGISTRO_TRECHO.size)
+            if not bloco:
+                return
+            for numero, data, codigo in REGISTRO_TRECHO.iter_unpack(bloco):
+                yield numero, data, ordem, codigo
+
+
+def _intercalar_trechos(trechos: List[str], operadoras: List[str]) -> Iterator[Tuple[int, str, int]]:
+    """(número, operadora, data) dos trechos em ordem, um por número; vale o mais recente e, empatado, o mais tardio no CSV"""
+    anterior = None
+    for registro in heapq.merge(*(_ler_trecho(caminho, ordem) for ordem, caminho in enumerate(trechos))):
+        if anterior is not None and anterior[0] != registro[0]:
+            yield anterior[0], operadoras[anterior[3]], anterior[1]
+        anterior = registro
+    if anterior is not None:
+        yield anterior[0], operadoras[anterior[3]], anterior[1]
+
+
+class _Gravador:
+    """Grava registros ordenados pelo número em vetores temporários e monta o arquivo final"""
+
+    def __init__(self, diretorio: str):
+        self._vetores = (array.array("Q"), array.array("I"), array.array("B"))
+        self._arquivos = [open(os.path.join(diretorio, nome), "w+b") for nome in ("chaves", "datas", "codigos")]
+        self._codigos: Dict[str, int] = {}
+        self.total = 0
+        self.referencia = 0
+
+    def adicionar(self, numero: int, operadora: str, data: int) -> None:
+        codigo = self._codigos.get(operadora)
+        if codigo is None:
+            if len(self._codigos) >= MAX_OPERADORAS:
+                raise ValueError(f"mais de {MAX_OPERADORAS} operadoras no snapshot")
+            codigo = self._codigos[operadora] = len(self._codigos)
+
+        chaves, datas, codigos = self._vetores
+        chaves.append(numero)
+        datas.append(data)
+        codigos.append(codigo)
+        self.total += 1
+        self.referencia = max(self.referencia, data)
+        if len(chaves) >= BLOCO:
+            self._descarregar()
+
+    def _descarregar(self) -> None:
+        for vetor, arquivo in zip(self._vetores, self._arquivos):
+            if sys.byteorder != "little":
+                vetor.byteswap()
+            vetor.tofile(arquivo)
+            del vetor[:]
+
+    def gravar(self, caminho: str, metadados: Dict[str, Any]) -> None:
+        """Monta o arquivo final; ele substitui o anterior de uma só vez"""
+        self._descarregar()
+
+        # Códigos provisórios (ordem de chegada) passam a seguir a ordem alfabética das operadoras
+        operadoras = sorted(self._codigos)
+        tabela = bytearray(range(256))
+        for posicao, operadora in enumerate(operadoras):
+            tabela[self._codigos[operadora]] = posicao
+
+        meta = json.dumps({**metadados, "operadoras": operadoras}, ensure_ascii=False).encode("utf-8")
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(CABECALHO.pack(MAGICO, VERSAO_FORMATO, self.total, len(meta)))
+            arquivo.write(meta)
+            arquivo.write(b"\0" * (_alinhar(CABECALHO.size + len(meta)) - CABECALHO.size - len(meta)))
+            for origem in self._arquivos:
+                origem.seek(0)
+                while True:
+                    bloco = origem.read(BLOCO * 8)
+                    if not bloco:
+                        break
+                    arquivo.write(bloco.translate(tabela) if origem is self._arquivos[2] else bloco)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+
+    def fechar(self) -> None:
+        for arquivo in self._arquivos:
+            arquivo.close()
+
+
+class BasePortabilidade:
+    """Consulta e importação da base local de portabilidade"""
+
+    def __init__(self, caminho: str = PORTABILIDADE_PATH,
+                 intervalo_recarga: Optional[float] = PORTABILIDADE_INTERVALO_RECARGA):
+        self.caminho = caminho
+        self.intervalo_recarga = intervalo_recarga
+        self._lock = threading.Lock()
+        self._arquivo: Optional[_Arquivo] = None
+        self._assinatura: Optional[Tuple[int, float]] = None
+        self._verificado_em = 0.0
+        self.recarregar()
+
+    def recarregar(self) -> bool:
+        """
+        Reabre o arquivo se ele foi substituído desde a última abertura
+
+        Returns:
+            bool: True se o arquivo foi (re)aberto
+        """
+        with self._lock:
+            self._verificado_em = time.monotonic()
+            try:
+                estado = os.stat(self.caminho)
+            except OSError:
+                self._arquivo, self._assinatura = None, None
+                return False
+
+            assinatura = (estado.st_ino, estado.st_mtime)
+            if assinatura == self._assinatura:
+                return False
+
+            try:
+                arquivo = _Arquivo(self.caminho)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Base de portabilidade inválida ({self.caminho}): {e}")
+                return False
+
+            # Troca atômica: consultas em andamento terminam com o arquivo anterior
+            self._arquivo, self._assinatura = arquivo, assinatura
+            logger.info(f"Base de portabilidade carregada: {arquivo.total} números")
+            return True
+
+    def _verificar_recarga(self) -> None:
+        if self.intervalo_recarga is not None and time.monotonic() - self._verificado_em >= self.intervalo_recarga:
+            self.recarregar()
+
+    def consultar(self, telefone: str) -> Optional[Dict[str, Any]]:
+        """
+        Operadora atual de um número portado
+
+        Args:
+            telefone (str): Telefone com DDD (10 ou 11 dígitos, com ou sem formatação)
+
+        Returns:
+            Optional[Dict[str, Any]]: operadora e data_portabilidade, ou None se o
+            número não consta da base (não foi portado ou a base não foi importada)
+        """
+        digitos = "".join(filter(str.isdigit, telefone or ""))
+        if len(digitos) not in (10, 11):
+            return None
+        self._verificar_recarga()
+
+        arquivo = self._arquivo
+        if arquivo is None:
+            return None
+        encontrado = arquivo.buscar(int(digitos))
+        if encontrado is None:
+            return None
+
+        operadora, data = encontrado
+        return {
+            "operadora": operadora,
+            "data_portabilidade": f"{data // 10000:04d}-{data // 100 % 100:02d}-{data % 100:02d}" if data else None,
+            "fonte": "Base de portabilidade",
+            "referencia": arquivo.metadados.get("referencia")
+        }
+
+    def importar(self, caminho_csv: str, delta: bool = False) -> Dict[str, Any]:
+        """
+        Importa um snapshot completo ou aplica um arquivo delta
+
+        Args:
+            caminho_csv (str): CSV com as colunas numero, operadora e data (separador , ou ;)
+            delta (bool): Mescla com a base atual em vez de substituí-la; operadora
+                vazia remove o número e registros mais antigos que os da base são ignorados
+
+        Returns:
+            Dict[str, Any]: Contadores da importação e total de números na base
+        """
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+        with self._lock, tempfile.TemporaryDirectory(prefix=".portabilidade-", dir=diretorio or None) as temporario:
+            atual = self._arquivo if delta else None
+            # Códigos das operadoras do CSV; remoções do delta ficam com CODIGO_REMOCAO
+            codigos: Dict[str, int] = {}
+            operadoras: List[str] = [""] * (CODIGO_REMOCAO + 1)
+            trechos: List[str] = []
+            trecho: List[Tuple[int, int, int, int]] = []
+            lidos = 0
+            for numero, operadora, data in _ler_registros(caminho_csv):
+                lidos += 1
+                if operadora in REMOCAO:
+                    if not delta:
+                        continue
+                    codigo = CODIGO_REMOCAO
+                else:
+                    codigo = codigos.get(operadora)
+                    if codigo is None:
+                        if len(codigos) >= MAX_OPERADORAS:
+                            raise ValueError(f"mais de {MAX_OPERADORAS} operadoras no snapshot")
+                        codigo = codigos[operadora] = len(codigos)
+                        operadoras[codigo] = operadora
+                trecho.append((numero, data, lidos, codigo))
+                if len(trecho) >= PORTABILIDADE_LOTE_ORDENACAO:
+                    trechos.append(_gravar_trecho(temporario, trecho))
+                    trecho = []
+            if trecho:
+                trechos.append(_gravar_trecho(temporario, trecho))
+            del trecho
+
+            relatorio = {"lidos": lidos, "inseridos": 0, "atualizados": 0, "removidos": 0, "ignorados": 0}
+            gravador = _Gravador(temporario)
+            try:
+                self._mesclar(atual, _intercalar_trechos(trechos, operadoras), relatorio, gravador)
+
+                referencia = gravador.referencia
+                metadados = {
+                    "importado_em": datetime.now().isoformat(),
+                    "referencia": f"{referencia // 10000:04d}-{referencia // 100 % 100:02d}-{referencia % 100:02d}" if referencia else None,
+                    "origens": (atual.metadados.get("origens", []) if atual else []) + [os.path.basename(caminho_csv)]
+                }
+                gravador.gravar(self.caminho, metadados)
+            finally:
+                gravador.fechar()
+
+        self.recarregar()
+        relatorio["total"] = gravador.total
+        return relatorio
+
+    @staticmethod
+    def _mesclar(atual: Optional[_Arquivo], novos: Iterator[Tuple[int, str, int]],
+                 relatorio: Dict[str, int], gravador: _Gravador) -> None:
+        """Intercala a base atual (já ordenada) com os registros novos ordenados, gravando o resultado"""
+        existentes = atual.registros() if atual else iter(())
+        existente = next(existentes, None)
+
+        for numero, operadora, data in novos:
+            while existente is not None and existente[0] < numero:
+                gravador.adicionar(*existente)
+                existente = next(existentes, None)
+
+            if existente is not None and existente[0] == numero:
+                if data and data < existente[2]:
+                    relatorio["ignorados"] += 1
+                    gravador.adicionar(*existente)
+                elif operadora in REMOCAO:
+                    relatorio["removidos"] += 1
+                else:
+                    relatorio["atualizados"] += 1
+                    gravador.adicionar(numero, operadora, data)
+                existente = next(existentes, None)
+            elif operadora in REMOCAO:
+                relatorio["ignorados"] += 1
+            else:
+                relatorio["inseridos"] += 1
+                gravador.adicionar(numero, operadora, data)
+
+        while existente is not None:
+            gravador.adicionar(*existente)
+            existente = next(existentes, None)
+
+    @property
+    def total(self) -> int:
+        arquivo = self._arquivo
+        return arquivo.total if arquivo else 0
+
+    @property
+    def carregada(self) -> bool:
+        return self._arquivo is not None
+
+
+base_portabilidade = BasePortabilidade()
@@ -0,0 +1,124 @@
+"""
+Placar de provedores externos para OSINT Investigador BR
+
+Mantém uma janela deslizante com o resultado e a latência das últimas chamadas
+de cada provedor e usa essas estatísticas para reordenar cadeias de fallback.
+"""
+import math
+import time
+from collections import deque
+from threading import Lock
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    from config import PLACAR_JANELA, PLACAR_MIN_AMOSTRAS, PLACAR_TAXA_MINIMA
+except ImportError:
+    PLACAR_JANELA = 100
+    PLACAR_MIN_AMOSTRAS = 5
+    PLACAR_TAXA_MINIMA = 0.5
+
+
+def _percentil(valores: List[float], percentil: float) -> float:
+    """Percentil por interpolação linear sobre uma lista ordenada"""
+    if not valores:
+        return 0.0
+    posicao = (len(valores) - 1) * percentil
+    inferior = math.floor(posicao)
+    superior = math.ceil(posicao)
+    if inferior == superior:
+        return valores[int(posicao)]
+    return valores[inferior] + (valores[superior] - valores[inferior]) * (posicao - inferior)
+
+
+class PlacarProvedores:
+    def __init__(self, janela: int = PLACAR_JANELA, min_amostras: int = PLACAR_MIN_AMOSTRAS,
+                 taxa_minima: float = PLACAR_TAXA_MINIMA):
+        self._amostras: Dict[str, Deque[Tuple[float, bool, float]]] = {}
+        self._janela = janela
+        self._min_amostras = min_amostras
+        self._taxa_minima = taxa_minima
+        self._lock = Lock()
+
+    def registrar(self, provedor: str, sucesso: bool, tempo_resposta: float) -> None:
+        """
+        Registra o resultado de uma chamada ao provedor
+
+        Args:
+            provedor (str): Nome do provedor (o mesmo usado em log_api_call)
+            sucesso (bool): Se a chamada retornou dados válidos
+            tempo_resposta (float): Tempo de resposta em segundos
+        """
+        with self._lock:
+            amostras = self._amostras.get(provedor)
+            if amostras is None:
+                amostras = self._amostras[provedor] = deque(maxlen=self._janela)
+            amostras.append((time.time(), sucesso, tempo_resposta))
+
+    def estatisticas(self, provedor: str) -> Dict[str, Any]:
+        """Retorna taxa de sucesso e percentis de latência do provedor"""
+        with self._lock:
+            amostras = list(self._amostras.get(provedor, ()))
+
+        total = len(amostras)
+        sucessos = sum(1 for _, sucesso, _ in amostras if sucesso)
+        latencias = sorted(tempo for _, _, tempo in amostras)
+        taxa_sucesso = sucessos / total if total else None
+
+        return {
+            "amostras": total,
+            "taxa_sucesso": round(taxa_sucesso, 3) if taxa_sucesso is not None else None,
+            "latencia_p50": round(_percentil(latencias, 0.50), 3),
+            "latencia_p95": round(_percentil(latencias, 0.95), 3),
+            "latencia_p99": round(_percentil(latencias, 0.99), 3),
+            "saudavel": total < self._min_amostras or taxa_sucesso >= self._taxa_minima,
+            "ultima_chamada": amostras[-1][0] if amostras else None
+        }
+
+    def _pontuacao(self, provedor: str) -> Optional[Tuple[int, float]]:
+        """
+        Chave de ordenação: provedores saudáveis primeiro e, entre eles, o menor
+        tempo esperado por resposta válida (latência p50 / taxa de sucesso).
+        None para provedores com poucas amostras, que não entram na reordenação.
+        """
+        stats = self.estatisticas(provedor)
+        if stats["amostras"] < self._min_amostras:
+            return None
+        if not stats["saudavel"]:
+            return (1, math.inf)
+        return (0, stats["latencia_p50"] / max(stats["taxa_sucesso"], 0.01))
+
+    def ordenar(self, provedores: List[Any], chave=None) -> List[Any]:
+        """
+        Reordena uma cadeia de fallback pelo desempenho recente
+
+        Só os provedores medidos trocam de lugar entre si; os que ainda têm
+        poucas amostras ficam na mesma posição da ordem estática.
+
+        Args:
+            provedores (List): Itens na ordem estática de prioridade
+            chave (callable): Extrai o nome do provedor de cada item (padrão: o próprio item)
+
+        Returns:
+            List: Nova lista ordenada (ordenação estável)
+        """
+        chave = chave or (lambda item: item)
+        pontuacoes = [self._pontuacao(chave(item)) for item in provedores]
+        posicoes = [posicao for posicao, pontuacao in enumerate(pontuacoes) if pontuacao is not None]
+
+        ordenados = list(provedores)
+        for destino, origem in zip(posicoes, sorted(posicoes, key=lambda posicao: pontuacoes[posicao])):
+            ordenados[destino] = provedores[origem]
+        return ordenados
+
+    def resumo(self) -> Dict[str, Dict[str, Any]]:
+        """Estatísticas de todos os provedores observados"""
+        with self._lock:
+            nomes = list(self._amostras)
+        return {nome: self.estatisticas(nome) for nome in nomes}
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._amostras.clear()
+
+
+placar = PlacarProvedores()
@@ -0,0 +1,186 @@
+"""
+Registro de bancos brasileiros com índices por código COMPE, ISPB e nome
+
+O registro é montado a partir da lista da BrasilAPI (em cache) mais a base local
+de BANCOS_LOCAIS, que completa ou corrige entradas. Os índices são imutáveis:
+uma atualização monta um conjunto novo e troca a referência de uma só vez, de
+modo que leituras concorrentes nunca veem um índice pela metade.
+"""
+import bisect
+import difflib
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+# Bancos que faltam ou vêm incompletos na BrasilAPI (sobrescrevem os campos informados)
+BANCOS_LOCAIS = [
+    {"codigo": "077", "nome": "Banco Inter", "nome_completo": "Banco Inter S.A.",
+     "ispb": "00416968", "swift": "BINTBRSP"},
+    {"codigo": "260", "nome": "Nubank", "nome_completo": "Nu Pagamentos S.A. - Instituição de Pagamento",
+     "ispb": "18236120"},
+    {"codigo": "336", "nome": "C6 Bank", "nome_completo": "Banco C6 S.A.", "ispb": "31872495"},
+    {"codigo": "290", "nome": "PagBank", "nome_completo": "PagSeguro Internet Instituição de Pagamento S.A.",
+     "ispb": "08561701"},
+    {"codigo": "323", "nome": "Mercado Pago", "nome_completo": "Mercado Pago Instituição de Pagamento Ltda.",
+     "ispb": "10573521"},
+]
+
+
+def normalizar_nome(texto: str) -> str:
+    """Nome sem acentos, minúsculo e sem pontuação, para comparação"""
+    texto = unicodedata.normalize("NFKD", texto or "")
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join("".join(c if c.isalnum() else " " for c in texto.casefold()).split())
+
+
+def _normalizar_codigo(codigo: Any) -> Optional[str]:
+    digitos = "".join(filter(str.isdigit, str(codigo))) if codigo is not None else ""
+    return digitos.zfill(3) if digitos else None
+
+
+class _Indices:
+    """Conjunto imutável de índices sobre uma lista de bancos"""
+
+    def __init__(self, bancos: List[Dict[str, Any]]):
+        self.bancos = bancos
+        self.por_codigo: Dict[str, Dict[str, Any]] = {}
+        self.por_ispb: Dict[str, Dict[str, Any]] = {}
+        self.nomes: List[str] = []
+        # (palavra, posição do banco) em ordem, para busca por prefixo com bisect
+        self.palavras: List[tuple] = []
+
+        for posicao, banco in enumerate(bancos):
+            if banco.get("codigo"):
+                self.por_codigo[banco["codigo"]] = banco
+            if banco.get("ispb"):
+                self.por_ispb[banco["ispb"]] = banco
+
+            nome = normalizar_nome(f"{banco.get('nome', '')} {banco.get('nome_completo', '')}")
+            self.nomes.append(nome)
+            for palavra in set(nome.split()):
+                self.palavras.append((palavra, posicao))
+
+        self.palavras.sort()
+        self.vocabulario = sorted({palavra for palavra, _ in self.palavras})
+
+    def com_prefixo(self, prefixo: str) -> set:
+        """Posições dos bancos com alguma palavra começando por `prefixo`"""
+        inicio = bisect.bisect_left(self.palavras, (prefixo,))
+        posicoes = set()
+        for palavra, posicao in self.palavras[inicio:]:
+            if not palavra.startswith(prefixo):
+                break
+            posicoes.add(posicao)
+        return posicoes
+
+
+class RegistroBancos:
+    """Bancos indexados por código COMPE, ISPB e nome"""
+
+    def __init__(self, bancos_locais: Optional[List[Dict[str, Any]]] = None):
+        self.bancos_locais = BANCOS_LOCAIS if bancos_locais is None else bancos_locais
+        self._lock = threading.Lock()
+        self._origem = None
+        self._indices = _Indices(self._mesclar([]))
+
+    def _mesclar(self, lista_api: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Normaliza a lista da BrasilAPI e aplica a base local por cima"""
+        bancos: Dict[str, Dict[str, Any]] = {}
+        sem_codigo = []
+
+        for item in lista_api or []:
+            banco = {
+                "codigo": _normalizar_codigo(item.get("code")),
+                "nome": item.get("name") or "",
+                "nome_completo": item.get("fullName") or "",
+                "ispb": item.get("ispb") or "",
+                "fonte": "BrasilAPI"
+            }
+            if banco["codigo"]:
+                bancos[banco["codigo"]] = banco
+            else:
+                sem_codigo.append(banco)
+
+        for local in self.bancos_locais:
+            codigo = _normalizar_codigo(local["codigo"])
+            if codigo in bancos:
+                bancos[codigo] = {**bancos[codigo], **local, "codigo": codigo}
+            else:
+                bancos[codigo] = {**local, "codigo": codigo, "fonte": "Base Local"}
+
+        return list(bancos.values()) + sem_codigo
+
+    def atualizar(self, lista_api: List[Dict[str, Any]]) -> bool:
+        """
+        Reconstrói os índices se a lista da BrasilAPI mudou
+
+        Args:
+            lista_api: Lista de bancos no formato da BrasilAPI (code, name, fullName, ispb)
+
+        Returns:
+            bool: True se os índices foram reconstruídos
+        """
+        if lista_api is self._origem:
+            return False
+
+        with self._lock:
+            if lista_api is self._origem:
+                return False
+            indices = _Indices(self._mesclar(lista_api))
+            # Troca atômica: leitores seguem com o conjunto antigo até aqui
+            self._indices = indices
+            self._origem = lista_api
+            return True
+
+    def por_codigo(self, codigo: str) -> Optional[Dict[str, Any]]:
+        """Banco pelo código COMPE (com ou sem zeros à esquerda)"""
+        codigo_limpo = _normalizar_codigo(codigo)
+        return self._indices.por_codigo.get(codigo_limpo) if codigo_limpo else None
+
+    def por_ispb(self, ispb: str) -> Optional[Dict[str, Any]]:
+        """Banco pelo ISPB (8 dígitos)"""
+        return self._indices.por_ispb.get("".join(filter(str.isdigit, str(ispb))).zfill(8))
+
+    def buscar_por_nome(self, texto: str, limite: int = 10) -> List[Dict[str, Any]]:
+        """
+        Busca bancos pelo nome: cada palavra da busca casa com o início de uma
+        palavra do nome; sem resultados, palavras parecidas (erros de digitação)
+
+        Args:
+            texto: Nome ou parte do nome
+            limite: Máximo de resultados
+
+        Returns:
+            List[Dict[str, Any]]: Bancos encontrados, os nomes mais curtos primeiro
+        """
+        indices = self._indices
+        termos = normalizar_nome(texto).split()
+        if not termos:
+            return []
+
+        posicoes = None
+        for termo in termos:
+            encontrados = indices.com_prefixo(termo)
+            posicoes = encontrados if posicoes is None else posicoes & encontrados
+
+        if not posicoes:
+            posicoes = None
+            for termo in termos:
+                encontrados = set()
+                for parecida in difflib.get_close_matches(termo, indices.vocabulario, n=5, cutoff=0.75):
+                    encontrados |= indices.com_prefixo(parecida)
+                posicoes = encontrados if posicoes is None else posicoes & encontrados
+
+        busca = " ".join(termos)
+        ordenadas = sorted(
+            posicoes or (),
+            key=lambda p: (not indices.nomes[p].startswith(busca), len(indices.nomes[p]), p)
+        )
+        return [indices.bancos[p] for p in ordenadas[:limite]]
+
+    @property
+    def total(self) -> int:
+        return len(self._indices.bancos)
+
+
+registro_bancos = RegistroBancos()
@@ -0,0 +1,212 @@
+"""
+Sessões reaproveitadas para o Consulta Número da ABR Telecom
+
+A consulta é um formulário: a página inicial entrega cookies, campos ocultos
+(tokens) e a URL de envio. Uma sessão guarda esse estado e o reaproveita até
+expirar (ABR_SESSAO_VALIDADE ou uma resposta de sessão inválida); com a sessão
+pronta, cada consulta é um único POST. O pool limita as consultas simultâneas
+ao host (ABR_MAX_CONCORRENTES) para não provocar bloqueio.
+"""
+import logging
+import threading
+import time
+from queue import Empty, LifoQueue
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin
+
+import requests
+
+from utils import transporte
+from utils.circuit_breaker import circuitos
+
+try:
+    from config import ABR_URLS_CONSULTA, ABR_MAX_CONCORRENTES, ABR_SESSAO_VALIDADE, ABR_ESPERA_VAGA
+except ImportError:
+    ABR_URLS_CONSULTA = [
+        "https://consultanumero.abrtelecom.com.br/consultanumero/consulta/consultaSituacaoAtualCtg",
+        "https://consultanumero.abrtelecom.com.br/consultanumero/consulta/consultaSituacaoAtual",
+        "https://consultanumero.abrtelecom.com.br/"
+    ]
+    ABR_MAX_CONCORRENTES = 2
+    ABR_SESSAO_VALIDADE = 600
+    ABR_ESPERA_VAGA = 5
+
+logger = logging.getLogger("osint_investigador")
+
+HEADERS_NAVEGADOR = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Cache-Control': 'max-age=0'
+}
+
+# Campos do número quando o formulário não tem um campo reconhecível
+CAMPOS_NUMERO_PADRAO = ["codigoAcesso", "numeroTelefone", "numero", "telefone"]
+
+# Respostas que indicam cookies ou token vencidos: a sessão é preparada de novo
+STATUS_SESSAO_EXPIRADA = {401, 403, 419, 440}
+
+
+class SessaoABR:
+    """Cookies, campos ocultos e URL de envio do formulário de consulta"""
+
+    def __init__(self, validade: float = ABR_SESSAO_VALIDADE):
+        self.validade = validade
+        self.http = transporte.nova_sessao(HEADERS_NAVEGADOR)
+        self.pagina: Optional[str] = None
+        self.action: Optional[str] = None
+        self.campos: Dict[str, str] = {}
+        self.campos_numero: List[str] = []
+        self.preparada_em = 0.0
+
+    @property
+    def valida(self) -> bool:
+        return self.action is not None and time.monotonic() - self.preparada_em < self.validade
+
+    def invalidar(self) -> None:
+        self.action = None
+        self.http.cookies.clear()
+
+    def preparar(self, circuito) -> bool:
+        """
+        Carrega a página da consulta e guarda cookies, campos ocultos e URL de envio
+
+        Returns:
+            bool: True se algum formulário de consulta foi encontrado
+        """
+        from bs4 import BeautifulSoup
+
+        for url in ABR_URLS_CONSULTA:
+            resposta = self.http.get(url, timeout=transporte.timeout_para(url))
+            if resposta.status_code >= 500:
+                circuito.registrar_falha()
+                return False
+            circuito.registrar_sucesso()
+            if resposta.status_code != 200:
+                continue
+
+            formulario = BeautifulSoup(resposta.text, "html.parser").find("form")
+            if formulario is None:
+                continue
+
+            campos, campos_numero = {}, []
+            for entrada in formulario.find_all("input"):
+                nome = entrada.get("name")
+                if not nome:
+                    continue
+                if entrada.get("type") == "hidden":
+                    campos[nome] = entrada.get("value", "")
+                elif any(parte in nome.lower() for parte in ("numero", "telefone", "codigoacesso")):
+                    campos_numero.append(nome)
+
+            self.pagina = resposta.url
+            self.action = urljoin(resposta.url, formulario.get("action") or "")
+            self.campos = campos
+            self.campos_numero = campos_numero or CAMPOS_NUMERO_PADRAO
+            self.preparada_em = time.monotonic()
+            return True
+
+        logger.warning("Formulário de consulta da ABR Telecom não encontrado")
+        return False
+
+    def enviar(self, numero: str) -> requests.Response:
+        """POST do formulário já preparado"""
+        dados = dict(self.campos)
+        for campo in self.campos_numero:
+            dados[campo] = numero
+        return self.http.post(
+            self.action,
+            data=dados,
+            headers={'Content-Type': 'application/x-www-form-urlencoded', 'Referer': self.pagina},
+            timeout=transporte.timeout_para(self.action)
+        )
+
+
+class PoolSessoesABR:
+    """Sessões da ABR Telecom reaproveitadas, com limite de consultas simultâneas"""
+
+    def __init__(self, max_concorrentes: int = ABR_MAX_CONCORRENTES,
+                 validade: float = ABR_SESSAO_VALIDADE, espera_vaga: float = ABR_ESPERA_VAGA):
+        self.validade = validade
+        self.espera_vaga = espera_vaga
+        self._vagas = threading.BoundedSemaphore(max_concorrentes)
+        self._livres: LifoQueue = LifoQueue()
+        self._lock = threading.Lock()
+        self._contadores = {"consultas": 0, "preparos": 0, "sessoes_expiradas": 0, "sem_vaga": 0}
+
+    def _contar(self, nome: str) -> None:
+        with self._lock:
+            self._contadores[nome] += 1
+
+    def _obter_sessao(self) -> SessaoABR:
+        try:
+            return self._livres.get_nowait()
+        except Empty:
+            return SessaoABR(self.validade)
+
+    def consultar(self, numero: str) -> Optional[str]:
+        """
+        Envia a consulta de um número e devolve o HTML da resposta
+
+        Args:
+            numero (str): Telefone com DDD, apenas dígitos
+
+        Returns:
+            Optional[str]: HTML da resposta, ou None (host indisponível, sem vaga
+            dentro de ABR_ESPERA_VAGA segundos ou formulário não encontrado)
+        """
+        circuito = circuitos.obter(ABR_URLS_CONSULTA[0])
+        if not circuito.permitir_requisicao():
+            logger.warning(f"Circuito aberto para {circuito.nome}, pulando consulta ABR Telecom")
+            return None
+
+        if not self._vagas.acquire(timeout=self.espera_vaga):
+            self._contar("sem_vaga")
+            logger.warning("Limite de consultas simultâneas à ABR Telecom atingido")
+            return None
+
+        sessao = self._obter_sessao()
+        try:
+            # Uma segunda tentativa só quando a sessão reaproveitada tinha expirado no servidor
+            for _ in range(2):
+                if not sessao.valida:
+                    self._contar("preparos")
+                    if not sessao.preparar(circuito):
+                        return None
+
+                resposta = sessao.enviar(numero)
+                if resposta.status_code in STATUS_SESSAO_EXPIRADA:
+                    self._contar("sessoes_expiradas")
+                    sessao.invalidar()
+                    continue
+                if resposta.status_code >= 500:
+                    circuito.registrar_falha()
+                    return None
+
+                circuito.registrar_sucesso()
+                self._contar("consultas")
+                return resposta.text if resposta.status_code == 200 else None
+            return None
+
+        except requests.exceptions.RequestException as e:
+            if isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+                circuito.registrar_falha()
+            sessao.invalidar()
+            logger.warning(f"Erro de rede ao consultar a ABR Telecom: {e}")
+            return None
+        finally:
+            self._livres.put(sessao)
+            self._vagas.release()
+
+    def resumo(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._contadores, "sessoes_livres": self._livres.qsize()}
+
+
+sessoes_abr = PoolSessoesABR()
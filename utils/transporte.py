@@ -0,0 +1,79 @@
+"""
+Transporte HTTP compartilhado para OSINT Investigador BR
+
+Todas as integrações usam o mesmo HTTPAdapter, que mantém um pool de conexões
+keep-alive por host: o handshake TCP+TLS é feito uma vez e reaproveitado nas
+chamadas seguintes. Os timeouts de conexão e de leitura são definidos por host
+em config.HTTP_TIMEOUTS.
+"""
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from config import (
+        HTTP_POOL_HOSTS, HTTP_POOL_CONEXOES, HTTP_TIMEOUT_CONEXAO,
+        HTTP_TIMEOUTS, REQUEST_TIMEOUT
+    )
+except ImportError:
+    HTTP_POOL_HOSTS = 20
+    HTTP_POOL_CONEXOES = 32
+    HTTP_TIMEOUT_CONEXAO = 3.05
+    HTTP_TIMEOUTS = {}
+    REQUEST_TIMEOUT = 10
+
+
+# Adapter único: os pools por host são compartilhados por todas as sessões
+adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_CONEXOES)
+
+
+def nova_sessao(headers: Optional[Dict[str, str]] = None, cookies: bool = True) -> requests.Session:
+    """
+    Cria uma sessão que usa o pool de conexões compartilhado
+
+    Args:
+        headers (dict): Headers padrão da sessão
+        cookies (bool): Se False, a sessão não guarda cookies entre requisições
+            (comportamento de requests.get/post avulsos)
+
+    Returns:
+        requests.Session: Sessão com o adapter compartilhado montado
+    """
+    sessao = requests.Session()
+    sessao.mount("https://", adapter)
+    sessao.mount("http://", adapter)
+    if headers:
+        sessao.headers.update(headers)
+    if not cookies:
+        sessao.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return sessao
+
+
+# Sessão sem estado usada por get()/post(); os headers vão em cada chamada
+sessao = nova_sessao(cookies=False)
+
+
+def timeout_para(url: str) -> Tuple[float, float]:
+    """
+    Timeouts (conexão, leitura) configurados para o host da URL
+
+    Args:
+        url (str): URL da requisição
+    """
+    host = urlparse(url).netloc.lower()
+    return HTTP_TIMEOUTS.get(host, (HTTP_TIMEOUT_CONEXAO, REQUEST_TIMEOUT))
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """requests.get sobre o pool compartilhado, com o timeout do host por padrão"""
+    kwargs.setdefault("timeout", timeout_para(url))
+    return sessao.get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """requests.post sobre o pool compartilhado, com o timeout do host por padrão"""
+    kwargs.setdefault("timeout", timeout_para(url))
+    return sessao.post(url, **kwargs)
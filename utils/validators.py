@@ -3,6 +3,8 @@ Módulo de validação para dados de entrada
 """
 import re
 
+from utils.base_ddd import base_ddd
+
 
 def validar_cep(cep: str) -> bool:
     """
@@ -40,6 +42,10 @@ def validar_ddd(ddd: str) -> bool:
     # Remove caracteres não numéricos
     ddd_limpo = re.sub(r'\D', '', ddd)
     
+    # Base local versionada (dados/ddd_brasil.json); a lista abaixo só é usada sem ela
+    if base_ddd.carregada:
+        return base_ddd.existe(ddd_limpo)
+    
     # Lista de DDDs válidos no Brasil
     ddds_validos = [
         '11', '12', '13', '14', '15', '16', '17', '18', '19',  # SP
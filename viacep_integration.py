@@ -6,6 +6,7 @@ Totalmente gratuita, sem necessidade de registro ou token
 """
 
 import requests
+from utils import transporte
 import json
 from typing import Dict, Any, Optional
 
@@ -14,7 +15,6 @@ class ViaCEPClient:
     
     def __init__(self):
         self.base_url = "https://viacep.com.br/ws"
-        self.timeout = 10
     
     def consultar_cep(self, cep: str) -> Dict[str, Any]:
         """
@@ -38,7 +38,7 @@ class ViaCEPClient:
                 }
             
             url = f"{self.base_url}/{cep_limpo}/json/"
-            response = requests.get(url, timeout=self.timeout)
+            response = transporte.get(url)
             
             if response.status_code == 200:
                 data = response.json()
@@ -116,7 +116,7 @@ class ViaCEPClient:
                 }
             
             url = f"{self.base_url}/{uf}/{cidade}/{logradouro}/json/"
-            response = requests.get(url, timeout=self.timeout)
+            response = transporte.get(url)
             
             if response.status_code == 200:
                 data = response.json()
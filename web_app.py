@@ -12,8 +12,10 @@ import csv
 import io
 from datetime import datetime
 from osint_investigador import investigador
+from aquecimento_cache import aquecer_em_segundo_plano
+import aquecimento_cache
 from utils.logger import logger
-from config import FLASK_HOST, FLASK_PORT, FLASK_DEBUG
+from config import FLASK_HOST, FLASK_PORT, FLASK_DEBUG, CACHE_AQUECIMENTO_INICIAR
 
 # Inicializar clientes das APIs gratuitas
 brasil_api = BrasilAPIClient()
@@ -39,6 +41,23 @@ def service_worker():
 app.config['SECRET_KEY'] = 'osint-investigador-br-2024'
 app.config['JSON_AS_ASCII'] = False
 
+# Aquecimento do cache com os dados de referência: começa na primeira requisição de
+# cada processo (ou na subida pelo __main__), nunca na importação do módulo
+_aquecimento_iniciado = False
+
+def iniciar_aquecimento() -> bool:
+    """Inicia o aquecimento do cache em segundo plano, uma vez por processo"""
+    global _aquecimento_iniciado
+    if _aquecimento_iniciado or not CACHE_AQUECIMENTO_INICIAR:
+        return False
+    _aquecimento_iniciado = True
+    return aquecer_em_segundo_plano(investigador)
+
+@app.before_request
+def aquecer_cache_na_primeira_requisicao():
+    if not app.testing:
+        iniciar_aquecimento()
+
 
 @app.route('/')
 def index():
@@ -132,6 +151,30 @@ def api_cache_stats():
         return jsonify({'success': False, 'error': 'Erro interno do servidor'}), 500
 
 
+@app.route('/api/provedores/estatisticas', methods=['GET'])
+def api_estatisticas_provedores():
+    """API para estatísticas de desempenho dos provedores externos"""
+    try:
+        resultado = investigador.estatisticas_provedores()
+        return jsonify({'success': True, 'data': resultado})
+    
+    except Exception as e:
+        logger.error(f"Erro na API estatisticas_provedores: {e}")
+        return jsonify({'success': False, 'error': 'Erro interno do servidor'}), 500
+
+
+@app.route('/api/provedores/circuitos', methods=['GET'])
+def api_estado_circuitos():
+    """API para o estado dos circuit breakers dos hosts externos"""
+    try:
+        resultado = investigador.estado_circuitos()
+        return jsonify({'success': True, 'data': resultado})
+    
+    except Exception as e:
+        logger.error(f"Erro na API estado_circuitos: {e}")
+        return jsonify({'success': False, 'error': 'Erro interno do servidor'}), 500
+
+
 @app.route('/api/telefone/<telefone>', methods=['GET'])
 def api_consultar_telefone_get(telefone):
     """API para consultar telefone via GET"""
@@ -192,8 +235,12 @@ def api_cnpj_get(cnpj):
 
 @app.route('/api/consultar/bancos', methods=['GET'])
 def api_consultar_bancos():
-    """API para listar bancos"""
+    """API para listar bancos (ou buscar pelo nome com ?nome=)"""
     try:
+        nome = request.args.get('nome', '').strip()
+        if nome:
+            return jsonify(investigador.buscar_bancos_por_nome(nome))
+        
         resultado = investigador.consultar_bancos()
         return jsonify(resultado)
     
@@ -300,6 +347,10 @@ def api_limpar_cache():
     """API para limpar cache"""
     try:
         resultado = investigador.limpar_cache()
+        
+        # Recarrega os dados de referência para os próximos usuários
+        if resultado.get('success'):
+            aquecer_em_segundo_plano(investigador)
         return jsonify(resultado)
     
     except Exception as e:
@@ -307,6 +358,21 @@ def api_limpar_cache():
         return jsonify({'erro': 'Erro interno do servidor'}), 500
 
 
+@app.route('/api/cache/aquecimento', methods=['GET', 'POST'])
+def api_aquecimento_cache():
+    """API para iniciar (POST) ou acompanhar (GET) o aquecimento do cache"""
+    try:
+        iniciado = aquecer_em_segundo_plano(investigador) if request.method == 'POST' else False
+        return jsonify({
+            'iniciado': iniciado,
+            'ultimo_relatorio': aquecimento_cache.ultimo_relatorio
+        })
+    
+    except Exception as e:
+        logger.error(f"Erro na API aquecimento_cache: {e}")
+        return jsonify({'erro': 'Erro interno do servidor'}), 500
+
+
 @app.route('/api/cache/estatisticas', methods=['GET'])
 def api_estatisticas_cache():
     """API para estatísticas do cache"""
@@ -481,7 +547,22 @@ def api_free_banco(codigo):
         if not codigo:
             return jsonify({'success': False, 'error': 'Código do banco é obrigatório'}), 400
         
-        resultado = brasil_api.consultar_banco(codigo)
+        # Registro indexado de bancos (BrasilAPI em cache + base local)
+        banco = investigador.buscar_banco_por_codigo(codigo)
+        if "erro" in banco:
+            resultado = {'sucesso': False, 'erro': 'Banco não encontrado', 'codigo': codigo}
+        else:
+            resultado = {
+                'sucesso': True,
+                'codigo': banco.get('codigo', codigo),
+                'dados': {
+                    'nome': banco.get('nome'),
+                    'codigo': banco.get('codigo'),
+                    'nome_completo': banco.get('nome_completo'),
+                    'ispb': banco.get('ispb')
+                },
+                'fonte': banco.get('fonte')
+            }
         
         return jsonify({
             'success': True,
@@ -639,4 +720,5 @@ def internal_error(error):
 
 if __name__ == '__main__':
     logger.info(f"Iniciando OSINT Investigador BR Web App em {FLASK_HOST}:{FLASK_PORT}")
+    iniciar_aquecimento()
     app.run(host=FLASK_HOST, port=FLASK_PORT, debug=FLASK_DEBUG)
\ No newline at end of file